@@ -99,19 +99,45 @@ __all__ = [
     'errors',
     'types',
     'model',
+    'context',
+    'dictionaries',
+    'interning',
+    'lazy',
+    'records',
+    'patching',
+    'streaming',
+    'files',
+    'aio',
+    'messages',
+    'shm',
 
     # Classes
     'Datatype',
     'Object',
     'Type',
+    'Interner',
+    'Dictionary',
+    'Record',
+    'LazyObject',
+    'LazyArray',
+    'ArrayWriter',
+    'Decoder',
+    'RecordFile',
+    'MessageStream',
 
     # Functions
     'loads',
     'load',
+    'iterload',
+    'validate',
+    'patch',
     'dump',
     'dumps',
     'encode_schema',
     'decode_schema',
+    'train_dictionary',
+    'async_dump',
+    'async_load',
 
     # Versioning and copyrights
     "__author__",
@@ -120,8 +146,17 @@ __all__ = [
     "__version__"
 ]
 
-from . import errors, model, types
+from . import aio, context, dictionaries, errors, files, interning, lazy, messages, model, patching, records, shm, streaming, types
 from .__info__ import __author__, __copyright__, __license__, __version__
-from .cain import decode_schema, dump, dumps, encode_schema, load, loads, Type
+from .aio import async_dump, async_load
+from .cain import decode_schema, dump, dumps, encode_schema, load, loads, validate, Type
+from .dictionaries import Dictionary, train_dictionary
+from .files import RecordFile
+from .interning import Interner
+from .lazy import LazyArray, LazyObject
+from .messages import MessageStream
 from .model import Datatype
+from .patching import patch
+from .records import Record
+from .streaming import ArrayWriter, Decoder, iterload
 from .types import Object
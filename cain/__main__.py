@@ -12,6 +12,7 @@ import json
 import sys
 import contextlib
 import importlib.util
+import mmap
 
 import cain
 from cain.types.types import Type
@@ -59,6 +60,7 @@ def entry():
 
     encode_argparse = subparser.add_parser("encode", help="Encodes objects using the cain data format")
     decode_argparse = subparser.add_parser("decode", help="Decodes objects using the cain data format")
+    validate_argparse = subparser.add_parser("validate", help="Checks that some data is well-formed for a schema, without decoding it")
     schema_argparse = subparser.add_parser("schema", help="Manipulates cain schemas")
 
     # Encode
@@ -123,6 +125,25 @@ def entry():
     decode_argparse.add_argument("--output", "-o", action="store", required=False, default=None,
                                  help="The output destination for the decoded data (STDOUT if not specified)")
 
+    # Validate
+    validate_argparse.add_argument("input", action="store", help="The data (or the file containing the data) to check")
+    validate_argparse.add_argument("--schema", "-s", action="store", required=False,
+                                   help="The schema file or data to check the data with. "
+                                   "If omitted, it will be assumed that `input` has the necessary headers.")
+
+    validate_mutex_schema = validate_argparse.add_mutually_exclusive_group()
+    validate_mutex_schema.add_argument("--schema-header", action="store_true",
+                                       help="If provided, the `--schema` will be considered as a cain data input "
+                                       "and the schema will be read from its header")
+    validate_mutex_schema.add_argument("--schema-name", action="store", required=False,
+                                       help="If provided, the `--schema` file will be considered as a Python file and this name will be considered as "
+                                       "the variable name of the schema in the Python file." + TRUST_WARNING.format(entity="schemas"))
+    validate_mutex_schema.add_argument("--schema-eval", action="store_true",
+                                       help="If provided, the `--schema` will be treated as a Python expression and will be evaluated."
+                                       + TRUST_WARNING.format(entity="schemas"))
+    validate_argparse.add_argument("--auto-length", action="store_true",
+                                   help="If the lengths are encoded as variable length integers")
+
     # Schema
 
     def prepare_scheme_parser(parser: argparse.ArgumentParser):
@@ -234,6 +255,33 @@ def entry():
         else:
             print(data)
 
+    elif args.action == "validate":
+        # Getting the schema
+        schema = get_schema(args.schema, args)
+
+        # Checking the data
+        try:
+            if pathlib.Path(args.input).is_file():
+                with pathlib.Path(args.input).open("rb") as handler:
+                    try:
+                        # large files are memory-mapped instead of being read in memory
+                        data = mmap.mmap(handler.fileno(), 0, access=mmap.ACCESS_READ)
+                    except (OSError, ValueError):
+                        cain.validate(handler.read(), schema=schema, auto_length=args.auto_length)
+                    else:
+                        view = memoryview(data)
+                        try:
+                            cain.validate(view, schema=schema, auto_length=args.auto_length)
+                        finally:
+                            view.release()
+                            data.close()
+            else:
+                cain.validate(args.input.encode("utf-8"), schema=schema, auto_length=args.auto_length)
+        except cain.errors.ValidationError as err:
+            print(f"Invalid data: {err}", file=sys.stderr)
+            sys.exit(1)
+        print("The data is valid")
+
     elif args.action == "schema":
         # Getting the schema
         schema = get_schema(args.input, args)
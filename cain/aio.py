@@ -0,0 +1,166 @@
+"""
+aio.py
+
+Defines the asyncio API, to send and receive Cain formatted messages over `asyncio` streams.
+
+Each message is written as a frame: its size (as a variable length integer) followed by the encoded value,
+which lets the receiver read exactly one message at a time on a long-lived connection.
+
+Example
+-------
+>>> import asyncio
+>>> import cain
+>>> from cain.types import Object
+>>> class Ping(Object):
+...     id: int
+>>> async def handle(reader, writer):
+...     while True:
+...         try:
+...             ping = await cain.async_load(reader, Ping)
+...         except EOFError:
+...             break
+...         await cain.async_dump({"id": ping.id + 1}, writer, Ping)
+...     writer.close()
+...     await writer.wait_closed()
+>>> async def main():
+...     server = await asyncio.start_server(handle, "127.0.0.1", 0)
+...     reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+...     await cain.async_dump({"id": 1}, writer, Ping)
+...     pong = await cain.async_load(reader, Ping)
+...     writer.write_eof()
+...     await reader.read()  # waits for the server to close the connection
+...     writer.close()
+...     server.close()
+...     return pong.id
+>>> asyncio.run(main())
+2
+"""
+import asyncio
+import concurrent.futures
+import functools
+import typing
+
+import cain.cain
+from cain import errors
+from cain.interning import Interner
+from cain.types.numbers import UnsignedVarInt
+
+# The maximum size of the frame header (enough for any size up to 2^63)
+MAX_HEADER_SIZE = 9
+
+
+async def async_dump(obj: typing.Any,
+                     writer: asyncio.StreamWriter,
+                     schema: "cain.cain.Schema",
+                     include_header: bool = False,
+                     auto_length: bool = False,
+                     drain: bool = True) -> None:
+    """
+    Encodes `obj` following `schema` and writes it as a single frame to `writer`
+
+    Parameters
+    ----------
+    obj: Any
+        The object to encode
+    writer: asyncio.StreamWriter
+        The stream to write the frame to
+    schema: type[Datatype] | Datatype | type
+        The schema to use for the encoding
+    include_header: bool, default = False
+        This prepends a header containing the schema at the beginning of the content.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value should be encoded as
+        variable length integers, as if the `auto` argument was given to them.
+    drain: bool, default = True
+        If `writer.drain()` should be awaited after writing the frame, which waits
+        only when the write buffer of the transport is full (flow control).
+    """
+    data = cain.cain.dumps(obj, schema, include_header=include_header, auto_length=auto_length)
+    # `writelines` avoids concatenating the size and the data
+    writer.writelines((UnsignedVarInt._encode(len(data)), data))
+    if drain:
+        await writer.drain()
+
+
+async def _read_size(reader: asyncio.StreamReader) -> int:
+    """Reads the size of the next frame"""
+    header = bytearray()
+    while True:
+        byte = await reader.read(1)
+        if not byte:
+            if header:
+                raise errors.TruncatedDataError(UnsignedVarInt, "The stream ended in the middle of a frame size")
+            raise EOFError("The stream ended")
+        header += byte
+        if byte[0] < 0x80:
+            size, _ = UnsignedVarInt.read(header)
+            return size
+        if len(header) >= MAX_HEADER_SIZE:
+            raise errors.DecodingError(UnsignedVarInt, "The size of the frame is too large")
+
+
+async def async_load(reader: asyncio.StreamReader,
+                     schema: typing.Optional["cain.cain.Schema"] = None,
+                     intern: typing.Union[bool, Interner] = False,
+                     auto_length: bool = False,
+                     into: typing.Optional[typing.Any] = None,
+                     fields: typing.Optional[typing.Iterable[str]] = None,
+                     offload_size: typing.Optional[int] = None,
+                     executor: typing.Optional[concurrent.futures.Executor] = None,
+                     max_size: typing.Optional[int] = None) -> typing.Any:
+    """
+    Reads exactly one frame from `reader` and decodes it following `schema`
+
+    Parameters
+    ----------
+    reader: asyncio.StreamReader
+        The stream to read the frame from
+    schema: type[Datatype] | Datatype | type | None, default = None
+        The schema to use for the decoding.
+        When left empty, the frame should contain a header with the schema to decode it.
+    intern: bool | Interner, default = False
+        If the repeated immutable values should be shared. Refer to `cain.loads` for more information.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value are variable length integers.
+    into: type | None, default = None
+        If provided, the objects are decoded straight into this class. Refer to `cain.loads` for more information.
+    fields: Iterable[str] | None, default = None
+        The only fields to decode in the objects. Refer to `cain.loads` for more information.
+    offload_size: int | None, default = None
+        If given, the frames of at least `offload_size` bytes are decoded in `executor`
+        instead of blocking the event loop.
+    executor: concurrent.futures.Executor | None, default = None
+        The executor used to decode the large frames (the default executor of the loop if not given).
+        Note: The decoding being CPU-bound, a `ProcessPoolExecutor` avoids holding the GIL
+              (the schema and the decoded values then need to be picklable).
+    max_size: int | None, default = None
+        The maximum size of the frame, in bytes (`None` for no limit).
+
+    Returns
+    -------
+    Any
+        The decoded object
+
+    Raises
+    ------
+    EOFError
+        If the stream ended before the start of a frame
+    TruncatedDataError
+        If the stream ended in the middle of a frame
+    DecodingError
+        If the frame is larger than `max_size`
+    """
+    size = await _read_size(reader)
+    if max_size is not None and size > max_size:
+        raise errors.DecodingError(UnsignedVarInt, f"The frame ({size} bytes) is larger than the maximum size ({max_size} bytes)")
+    try:
+        data = await reader.readexactly(size)
+    except asyncio.IncompleteReadError as err:
+        raise errors.TruncatedDataError(UnsignedVarInt,
+                                        f"The stream ended in the middle of a frame ({len(err.partial)} bytes out of {size})") from err
+
+    decode = functools.partial(cain.cain.loads, data, schema,
+                               intern=intern, auto_length=auto_length, into=into, fields=fields)
+    if offload_size is not None and size >= offload_size:
+        return await asyncio.get_running_loop().run_in_executor(executor, decode)
+    return decode()
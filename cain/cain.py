@@ -4,21 +4,36 @@ cain
 A small yet powerful data format!
 """
 
+import contextlib
+import io
+import mmap
+import os
+import traceback
 import typing
+import zlib
 
+import cain.lazy
 import cain.types
+from cain import context, errors
+from cain.dictionaries import Dictionaries, Dictionary, find_dictionary
+from cain.interning import Interner
 from cain.model import Datatype
+from cain.records import Constructor, collect_targets
 from cain.types import retrieve_type
 from cain.types.types import Type
 
 # the Schema type
 T = typing.TypeVar("T")
 Schema = typing.Union[typing.Type[Datatype], Datatype, typing.Type[T]]
+# the callable receiving the streamed blobs
+Sink = typing.Callable[[int, typing.Iterator[memoryview]], typing.Any]
 
 
 def dumps(obj: typing.Any,
           schema: Schema,
-          include_header: typing.Union[bool, Type] = False) -> bytes:
+          include_header: typing.Union[bool, Type] = False,
+          dictionary: typing.Optional[Dictionary] = None,
+          auto_length: bool = False) -> bytes:
     """
     Encodes the given object `obj` as a Cain formatted data, following `schema`.
 
@@ -32,6 +47,13 @@ def dumps(obj: typing.Any,
         This prepends a header containing the schema at the beginning of the content.
         Warning: This will significantly increase the size of the result (especially for
         originally small content)
+    dictionary: Dictionary | None, default = None
+        If provided, the result is compressed using this preset dictionary (see `train_dictionary`)
+        and prefixed with the dictionary id.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value should be encoded as
+        variable length integers, as if the `auto` argument was given to them.
+        The same option needs to be given when decoding (even when using `include_header`).
 
     Returns
     -------
@@ -57,20 +79,28 @@ def dumps(obj: typing.Any,
     b'\\\x00'
     """
     encoder, type_args = retrieve_type(schema)
-    value = encoder.encode(obj, *type_args)
+    if auto_length:
+        with context.encoding(auto_length=True):
+            value = encoder.encode(obj, *type_args)
+    else:
+        value = encoder.encode(obj, *type_args)
     if include_header:
         header = encode_schema(schema)
         # I wondered if we should include some kind of version to the header
         # but I concluded that this should be up to the user choice to
         # increase the content size
         value = cain.types.Tuple[bytes, bytes].encode((header, value))
+    if dictionary is not None:
+        value = cain.types.UInt32._encode(dictionary.id) + dictionary.compress(value)
     return value
 
 
 def dump(obj: typing.Any,
          handler: typing.BinaryIO,
          schema: Schema,
-         include_header: bool = False) -> None:
+         include_header: bool = False,
+         dictionary: typing.Optional[Dictionary] = None,
+         auto_length: bool = False) -> None:
     """
     Encodes the given object `obj` as a Cain formatted data, following `schema`
     and writes it to the given file-like object `fp`.
@@ -87,6 +117,16 @@ def dump(obj: typing.Any,
         This prepends a header containing the schema at the beginning of the content.
         Warning: This will significantly increase the size of the result (especially for
         originally small content)
+    dictionary: Dictionary | None, default = None
+        If provided, the result is compressed using this preset dictionary (see `train_dictionary`)
+        and prefixed with the dictionary id.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value should be encoded as
+        variable length integers, as if the `auto` argument was given to them.
+        The same option needs to be given when decoding (even when using `include_header`).
+
+    Note: `Binary` values can be file-like objects or `(size, chunks)` tuples, which are written
+          to `handler` in chunks, without being read in memory.
 
     Examples
     --------
@@ -100,16 +140,45 @@ def dump(obj: typing.Any,
     ...     print(fp.read())
     ...
     b'\x00foo\x00\x00\x00baz\x00\x00\x00\x00\x80?\x00\x02'
+    >>> with open('test.cain', 'w+b') as fp, open('model.bin', 'rb') as model:
+    ...     cain.dump({"weights": model}, fp, Object[{"weights": bytes}])
     """
-    handler.write(dumps(obj, schema, include_header))
-
-
-def loads(obj: bytes, schema: typing.Optional[Schema[T]] = None) -> T:
+    with context.encoding(streaming=True, auto_length=auto_length) as encoding_context:
+        encoder, type_args = retrieve_type(schema)
+        value = encoder.encode(obj, *type_args)
+        if include_header:
+            # The header layout does not depend on the options
+            encoding_context.auto_length = False
+            if encoding_context.streams:
+                # The length of the content needs to account for the streamed data
+                value = (encoding_context.size(value), encoding_context.expand(value))
+            value = cain.types.Tuple[bytes, bytes].encode((encode_schema(schema), value))
+
+    if dictionary is None:
+        for chunk in encoding_context.expand(value):
+            handler.write(chunk)
+        return
+
+    compressor = dictionary.compressor()
+    handler.write(cain.types.UInt32._encode(dictionary.id))
+    for chunk in encoding_context.expand(value):
+        handler.write(compressor.compress(chunk))
+    handler.write(compressor.flush())
+
+
+def loads(obj: bytes,
+          schema: typing.Optional[Schema[T]] = None,
+          intern: typing.Union[bool, Interner] = False,
+          zero_copy: bool = False,
+          sink: typing.Optional[Sink] = None,
+          dictionary: typing.Optional[Dictionaries] = None,
+          auto_length: bool = False,
+          into: typing.Optional[typing.Any] = None,
+          lazy: bool = False,
+          fields: typing.Optional[typing.Iterable[str]] = None) -> T:
     """
     Decodes the given Cain formatted data `obj` following `schema`.
 
-    Note: 
-
     Parameters
     ----------
     obj: bytes
@@ -117,12 +186,52 @@ def loads(obj: bytes, schema: typing.Optional[Schema[T]] = None) -> T:
     schema: type[Datatype] | Datatype | type | None, default = None
         The schema to use for the decoding.
         When left empty, the given `obj` should contain a header with the schema to decode it.
+    intern: bool | Interner, default = False
+        If the repeated immutable values (strings, integers, decimals and small tuples)
+        should be shared instead of being decoded as separate objects.
+        An `Interner` can be given to tune the table size and read the memory it saved.
+    zero_copy: bool, default = False
+        If `Binary` values should be returned as `memoryview` slices of `obj` instead of copies.
+        `obj` can be any object supporting the buffer protocol (`bytes`, `bytearray`, `memoryview`, `mmap`...).
+        The returned views keep `obj` alive and reflect any later change made to it:
+        a `bytearray` can't be resized and a `mmap` can't be closed while a view on it exists.
+    sink: Callable[[int, Iterator[memoryview]], Any] | None, default = None
+        If provided, this is called with the size and an iterator over the chunks of every `Binary` blob,
+        and the value it returns is used instead of the blob.
+        The chunks are only valid during the call.
+    dictionary: Dictionary | Mapping[int, Dictionary] | Iterable[Dictionary] | None, default = None
+        If provided, `obj` is considered compressed using a preset dictionary.
+        The dictionary matching the id written in `obj` is used to decompress it.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value are variable length integers.
+        This should match the option given when encoding.
+    into: type | None, default = None
+        If provided, the objects are decoded straight into this class (dataclass, `typing.NamedTuple`,
+        `attrs` class or class using `__slots__`) instead of `Object` instances.
+        The nested objects are decoded into the classes found in its type hints (`members: list[Member]`).
+        When `schema` is a container (`list[MyObject]`), the class is used for the objects it contains.
+    lazy: bool, default = False
+        If `Object` and `Array` values should be returned as read-only views (`cain.lazy.LazyObject`
+        and `cain.lazy.LazyArray`), which decode their fields and elements when they are first accessed.
+        The views keep a reference to `obj`. `materialize()` decodes the whole value.
+        The objects are always returned as views, even the `RECORD` ones, which is why `lazy` can't be
+        used with `into`.
+    fields: Iterable[str] | None, default = None
+        If provided, only these fields of the objects are decoded, the other ones being skipped
+        without building their values. Nested fields are separated by dots (`["name", "owner.email"]`)
+        and the fields apply to every object of a container (`list[MyObject]`).
+        The decoded objects only contain the selected fields.
 
     Returns
     -------
     typing.Any
         The decoded object.
 
+    Raises
+    ------
+    ValueError
+        If both `lazy` and `into` are given.
+
     Examples
     --------
     >>> import cain
@@ -136,25 +245,184 @@ def loads(obj: bytes, schema: typing.Optional[Schema[T]] = None) -> T:
     ሴ
     >>> print(cain.loads(b'\\\x00', str))
     \
+    >>> data = cain.dumps(["Hello", "world", "Hello"], list[str])
+    >>> decoded = cain.loads(data, list[str], intern=True)
+    >>> decoded[0] is decoded[2]
+    True
     """
+    if lazy and into is not None:
+        raise ValueError("`into` can't be used with `lazy`, the objects are decoded as lazy views")
+
+    if dictionary is not None:
+        obj = _decompress(obj, dictionary)
+
+    if zero_copy or sink or lazy or fields is not None:
+        # slicing a memoryview does not copy the underlying data
+        obj = memoryview(obj).cast("B")
+
     if not schema:
-        schema, obj = cain.types.Tuple[bytes, bytes].decode(obj)
-        schema = Type.decode(schema)
+        schema, obj = _split_header(obj)
+
     encoder, type_args = retrieve_type(schema)
-    return encoder.decode(obj, *type_args)
+    targets = collect_targets(schema, into) if into is not None else None
+    projection = _fields_tree(fields) if fields is not None else None
+    with _decoding_context(intern=intern, zero_copy=zero_copy, sink=sink, auto_length=auto_length, targets=targets,
+                           fields=projection):
+        if lazy:
+            # the options are kept by the views, to be used when decoding their values
+            return cain.lazy.view(encoder, obj, *(*encoder.__args__, *type_args),
+                                  decoding_context=context.current_decoding())
+        return encoder.decode(obj, *type_args)
+
+
+def _decompress(obj: bytes, dictionaries: Dictionaries) -> bytes:
+    """
+    Decompresses `obj` using the dictionary whose id is written at its start
+    """
+    dictionary_id, obj = cain.types.UInt32._decode(obj)
+    dictionary = find_dictionary(dictionaries, dictionary_id)
+    if dictionary is None:
+        raise errors.DecodingError(Dictionary, f"The dictionary {dictionary_id} is not available")
+    try:
+        return dictionary.decompress(obj)
+    except zlib.error as err:
+        raise errors.DecodingError(Dictionary, f"The data could not be decompressed using the dictionary {dictionary_id}") from err
 
 
-def load(handler: typing.BinaryIO, schema: typing.Optional[Schema[T]] = None) -> T:
+def _split_header(obj: bytes) -> typing.Tuple[Schema, memoryview]:
+    """
+    Returns the schema contained in the header of `obj` and a view over the actual content
+    """
+    # The header is decoded in its own context to avoid copying the content
+    # and to keep the decoding options from applying to it
+    with context.decoding(zero_copy=True):
+        header, content = cain.types.Tuple[bytes, bytes].decode(memoryview(obj).cast("B"))
+    return Type.decode(header), content
+
+
+def _decoding_context(intern: typing.Union[bool, Interner] = False,
+                      zero_copy: bool = False,
+                      sink: typing.Optional[Sink] = None,
+                      auto_length: bool = False,
+                      targets: typing.Optional[typing.Dict[type, Constructor]] = None,
+                      fields: typing.Optional[typing.Dict[str, typing.Any]] = None) -> typing.ContextManager:
+    """
+    Returns the context manager setting the decoding options
+
+    Note: Nothing is set if no option is given, to keep the default decoding path as fast as possible.
+    """
+    if not intern and not zero_copy and not sink and not auto_length and not targets and fields is None:
+        return contextlib.nullcontext()
+    if intern is True:
+        intern = Interner()
+    return context.decoding(interner=intern or None, zero_copy=zero_copy, sink=sink,
+                            auto_length=auto_length, targets=targets, fields=fields)
+
+
+def _fields_tree(fields: typing.Iterable[str]) -> typing.Dict[str, typing.Any]:
+    """
+    Returns the tree of the selected fields, as used by `DecodingContext.fields`
+
+    Example
+    -------
+    >>> _fields_tree(["b", "e.h", "e.j"])
+    {'b': None, 'e': {'h': None, 'j': None}}
+    """
+    if isinstance(fields, str):
+        fields = [fields]
+    tree = {}
+    for field in fields:
+        node = tree
+        *parents, last = field.split(".")
+        for key in parents:
+            child = node.get(key, {})
+            if child is None:
+                # the whole parent is already selected
+                break
+            node = node.setdefault(key, child)
+        else:
+            node[last] = None
+    return tree
+
+
+def _map_handler(handler: typing.BinaryIO) -> typing.Optional[memoryview]:
+    """
+    Memory-maps the rest of the file opened by `handler`, moving it to the end of the file
+
+    Returns
+    -------
+    memoryview | None
+        A view over the rest of the file, `None` if it can't be memory-mapped
+        (not a regular file, empty file, etc.)
+    """
+    try:
+        position = handler.tell()
+        mapped = mmap.mmap(handler.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+    handler.seek(0, io.SEEK_END)
+    return memoryview(mapped)[position:]
+
+
+def _release(view: memoryview) -> None:
+    """
+    Releases the memory-mapped file behind `view`, unless some decoded values are still using it
+    """
+    mapped = view.obj
+    try:
+        view.release()
+        mapped.close()
+    except BufferError:
+        # Some zero-copy views are still referencing the map, it will be closed
+        # when they are garbage collected.
+        pass
+
+
+def load(handler: typing.Union[typing.BinaryIO, str, os.PathLike, int],
+         schema: typing.Optional[Schema[T]] = None,
+         intern: typing.Union[bool, Interner] = False,
+         zero_copy: bool = False,
+         sink: typing.Optional[Sink] = None,
+         dictionary: typing.Optional[Dictionaries] = None,
+         auto_length: bool = False,
+         into: typing.Optional[typing.Any] = None,
+         lazy: bool = False,
+         fields: typing.Optional[typing.Iterable[str]] = None,
+         mmap: bool = False) -> T:
     """
     Reads the Cain formatted data from `fp` and decodes it following `schema`.
 
     Parameters
     ----------
-    fp: typing.Any
-        The file-like object to read the Cain formatted data from.
+    fp: BinaryIO | str | PathLike | int
+        The file-like object to read the Cain formatted data from, or the path or file descriptor of the file.
     schema: type[Datatype] | Datatype | type | None, default = None
         The schema to use for the decoding.
         When left empty, the given file should contain a header with the schema to decode it.
+    intern: bool | Interner, default = False
+        If the repeated immutable values should be shared. Refer to `loads` for more information.
+    zero_copy: bool, default = False
+        If `Binary` values should be returned as `memoryview` slices of the read data instead of copies.
+    sink: Callable[[int, Iterator[memoryview]], Any] | None, default = None
+        If provided, this is called with the size and an iterator over the chunks of every `Binary` blob,
+        and the value it returns is used instead of the blob.
+        When possible, the file is memory-mapped so that the blobs are never read in memory at once.
+    dictionary: Dictionary | Mapping[int, Dictionary] | Iterable[Dictionary] | None, default = None
+        If provided, the data is considered compressed using a preset dictionary.
+        Refer to `loads` for more information.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value are variable length integers.
+    into: type | None, default = None
+        If provided, the objects are decoded straight into this class. Refer to `loads` for more information.
+    lazy: bool, default = False
+        If `Object` and `Array` values should be decoded lazily. Refer to `loads` for more information.
+    fields: Iterable[str] | None, default = None
+        The only fields to decode in the objects. Refer to `loads` for more information.
+    mmap: bool, default = False
+        If the file should be memory-mapped and decoded straight from the map instead of being read in memory.
+        Only the pages of the file which are needed are read, and they are shared with the other processes
+        mapping the same file. Combined with `zero_copy`, the `Binary` values are views into the map.
+        Files which can't be memory-mapped (pipes, sockets, empty files, etc.) are read as usual.
 
     Returns
     -------
@@ -173,8 +441,99 @@ def load(handler: typing.BinaryIO, schema: typing.Optional[Schema[T]] = None) ->
     ...     cain.load(fp, schema)
     ...
     ['foo', {'bar': ('baz', None, 1.0, 2)}]
+    >>> cain.load('test.cain', schema, mmap=True)
+    ['foo', {'bar': ('baz', None, 1.0, 2)}]
+    """
+    if isinstance(handler, (str, os.PathLike, int)):
+        # a given file descriptor is left open
+        with open(handler, "rb", closefd=not isinstance(handler, int)) as file:
+            return load(file, schema,
+                        intern=intern, zero_copy=zero_copy, sink=sink, dictionary=dictionary, auto_length=auto_length,
+                        into=into, lazy=lazy, fields=fields, mmap=mmap)
+
+    if mmap or (sink and dictionary is None and not lazy):
+        view = _map_handler(handler)
+        if view is not None:
+            try:
+                return loads(view, schema,
+                             intern=intern, zero_copy=zero_copy, sink=sink, dictionary=dictionary,
+                             auto_length=auto_length, into=into, lazy=lazy, fields=fields)
+            finally:
+                # the map stays open as long as some decoded values (zero-copy blobs, lazy views) use it
+                _release(view)
+    return loads(handler.read(), schema,
+                 intern=intern, zero_copy=zero_copy, sink=sink, dictionary=dictionary, auto_length=auto_length, into=into,
+                 lazy=lazy, fields=fields)
+
+
+def validate(obj: bytes,
+             schema: typing.Optional[Schema] = None,
+             dictionary: typing.Optional[Dictionaries] = None,
+             auto_length: bool = False) -> None:
+    """
+    Checks that the given Cain formatted data `obj` is well-formed for `schema`, without building the decoded values.
+
+    The lengths, terminators, union indices, booleans, redundancy tables and UTF-8 strings are checked,
+    which is much cheaper than decoding the data when it only needs to be accepted or rejected.
+
+    Parameters
+    ----------
+    obj: bytes
+        The Cain formatted data to check.
+        `obj` can be any object supporting the buffer protocol (`bytes`, `bytearray`, `memoryview`, `mmap`...).
+    schema: type[Datatype] | Datatype | type | None, default = None
+        The schema of the data.
+        When left empty, the given `obj` should contain a header with the schema.
+    dictionary: Dictionary | Mapping[int, Dictionary] | Iterable[Dictionary] | None, default = None
+        If provided, `obj` is considered compressed using a preset dictionary.
+        The offsets then refer to the decompressed data.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value are variable length integers.
+
+    Raises
+    ------
+    ValidationError
+        If the data is not well-formed, with the offset (`err.offset`) and the path of the field (`err.path`)
+        of the first problem found.
+
+    Examples
+    --------
+    >>> import cain
+    >>> from cain.types import Object
+    >>> cain.validate(b'\x00\x00\x02Anise\x00', Object[{"username": str, "favorite_number": int}])
+    >>> cain.validate(b'\x00\x00\x02Anise', Object[{"username": str, "favorite_number": int}])
+    Traceback (most recent call last):
+    ...
+    cain.errors.ValidationError: Unterminated string (at byte 3, in `username`)
     """
-    return loads(handler.read(), schema)
+    if dictionary is not None:
+        obj = _decompress(obj, dictionary)
+
+    obj = memoryview(obj).cast("B")
+    size = len(obj)
+
+    try:
+        if not schema:
+            try:
+                schema, obj = _split_header(obj)
+            except errors.ValidationError:
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                raise errors.ValidationError(Type, f"The header is not valid: {err}", size) from err
+
+        encoder, type_args = retrieve_type(schema)
+        with _decoding_context(auto_length=auto_length):
+            encoder._validate(obj, *(*encoder.__args__, *type_args))
+    except errors.ValidationError as err:
+        err.offset = size - err.remaining
+        # the frames of the tracebacks hold views over `obj`, which couldn't be closed (or resized) otherwise
+        chained = err
+        while chained is not None:
+            traceback.clear_frames(chained.__traceback__)
+            chained = chained.__cause__ or chained.__context__
+        raise
+    finally:
+        obj.release()
 
 
 def encode_schema(schema: Schema) -> bytes:
@@ -0,0 +1,295 @@
+"""
+context.py
+
+Holds the options given to a single encoding or decoding call.
+
+The datatypes only receive their type arguments when encoding or decoding, which means
+that any option given to `cain.loads` (or similar) needs to be stored somewhere the
+nested datatypes can access it without changing their signatures.
+
+Example
+-------
+>>> from cain import context
+>>> from cain.interning import Interner
+>>> with context.decoding(interner=Interner()) as ctx:
+...     context.current_decoding() is ctx
+True
+>>> context.current_decoding() is None
+True
+"""
+import contextlib
+import contextvars
+import os
+import typing
+
+from cain import errors
+
+if typing.TYPE_CHECKING:
+    from cain.interning import Interner
+
+# The size of the placeholders written in place of the streamed blobs
+TOKEN_SIZE = 16
+
+
+class DecodingContext:
+    """
+    The options given to the current decoding call.
+
+    Parameters
+    ----------
+    interner: Interner | None, default = None
+        If provided, the immutable values decoded will be hash-consed using this interner.
+    zero_copy: bool, default = False
+        If `Binary` should return slices of the decoded buffer (`memoryview`) instead of copies.
+    sink: Callable[[int, Iterator[memoryview]], Any] | None, default = None
+        If provided, every `Binary` blob is given to this callable, with its size and an iterator
+        over its chunks, and the value it returns is used as the decoded value.
+    auto_length: bool, default = False
+        If the lengths of `Binary`, `Array`, `Set` and `Tuple` values are variable length integers,
+        as if the `auto` argument was given to all of them.
+    targets: dict[type, Callable[..., Any]] | None, default = None
+        The constructors to call instead of creating `Object` instances, for each `Object` datatype.
+    fields: dict[str, dict | None] | None, default = None
+        The fields to decode in the objects (the projection), the other fields being skipped.
+        Each key maps to the fields to decode in its value, `None` meaning the whole value.
+        It is updated while decoding to always point at the fields of the current object.
+    """
+
+    def __init__(self,
+                 interner: typing.Optional["Interner"] = None,
+                 zero_copy: bool = False,
+                 sink: typing.Optional[typing.Callable[[int, typing.Iterator[memoryview]], typing.Any]] = None,
+                 auto_length: bool = False,
+                 targets: typing.Optional[typing.Dict[type, typing.Callable[..., typing.Any]]] = None,
+                 fields: typing.Optional[typing.Dict[str, typing.Any]] = None) -> None:
+        self.interner = interner
+        self.zero_copy = zero_copy
+        self.sink = sink
+        self.auto_length = auto_length
+        self.targets = targets
+        self.fields = fields
+
+
+_DECODING: contextvars.ContextVar[typing.Optional[DecodingContext]] = contextvars.ContextVar("cain_decoding",
+                                                                                             default=None)
+
+
+def current_decoding() -> typing.Optional[DecodingContext]:
+    """
+    Returns the context of the current decoding call, if any
+
+    Returns
+    -------
+    DecodingContext | None
+        The current decoding context, `None` if no option was given to the decoding call.
+    """
+    return _DECODING.get()
+
+
+@contextlib.contextmanager
+def decoding(**options) -> typing.Iterator[DecodingContext]:
+    """
+    Sets the context for the decoding operations happening in the `with` block
+
+    Parameters
+    ----------
+    **options
+        The options to give to `DecodingContext`
+
+    Yields
+    ------
+    DecodingContext
+        The new decoding context
+    """
+    current_context = DecodingContext(**options)
+    token = _DECODING.set(current_context)
+    try:
+        yield current_context
+    finally:
+        _DECODING.reset(token)
+
+
+@contextlib.contextmanager
+def restore_decoding(current_context: typing.Optional[DecodingContext]) -> typing.Iterator[typing.Optional[DecodingContext]]:
+    """
+    Sets back a decoding context saved earlier, for the decoding operations happening in the `with` block
+
+    Note: This is used by the lazy views, which decode their values after the decoding call returned.
+
+    Parameters
+    ----------
+    current_context: DecodingContext | None
+        The context to use, as returned by `current_decoding`
+
+    Yields
+    ------
+    DecodingContext | None
+        The given context
+    """
+    token = _DECODING.set(current_context)
+    try:
+        yield current_context
+    finally:
+        _DECODING.reset(token)
+
+
+class EncodingContext:
+    """
+    The options given to the current encoding call.
+
+    Parameters
+    ----------
+    streaming: bool, default = False
+        If the streamed `Binary` sources (file-like objects or `(size, chunks)` tuples)
+        should be written lazily instead of being read in memory.
+        When enabled, the blobs are replaced by unique placeholders (tokens) in the encoded data,
+        which are then replaced by the actual data using `expand`.
+    auto_length: bool, default = False
+        If the lengths of `Binary`, `Array`, `Set` and `Tuple` values should be variable length integers,
+        as if the `auto` argument was given to all of them.
+    defer_size: int | None, default = None
+        If provided (and `streaming` is enabled), the in-memory `Binary` values of at least `defer_size` bytes
+        are also replaced by placeholders, which lets `expand` give them as they are instead of copying them
+        into the encoded data (for scatter-gather writes).
+    """
+
+    def __init__(self, streaming: bool = False, auto_length: bool = False,
+                 defer_size: typing.Optional[int] = None) -> None:
+        self.streaming = streaming
+        self.auto_length = auto_length
+        self.defer_size = defer_size
+        self.streams: typing.Dict[bytes, typing.Tuple[int, typing.Iterable[bytes]]] = {}
+        # The placeholders of the identical values, which are given the same one
+        self.tokens: typing.Dict[typing.Hashable, bytes] = {}
+        # A random prefix makes it very unlikely for a placeholder to appear in the actual data
+        self.prefix = os.urandom(TOKEN_SIZE - 4)
+
+    def defer(self, size: int, chunks: typing.Iterable[bytes], key: typing.Optional[typing.Hashable] = None) -> bytes:
+        """
+        Registers a streamed source and returns the placeholder to write in its place
+
+        Parameters
+        ----------
+        size: int
+            The number of bytes the source will give
+        chunks: Iterable[bytes]
+            The chunks of data
+        key: Hashable | None, default = None
+            If provided, the sources registered with the same key get the same placeholder
+            (which lets `Array` and `Object` find the repeated values, as without placeholders).
+            The chunks of these sources should be iterable more than once.
+
+        Returns
+        -------
+        bytes
+            The placeholder
+        """
+        if key is not None:
+            token = self.tokens.get(key)
+            if token is not None:
+                return token
+        token = self.prefix + len(self.streams).to_bytes(4, byteorder="big")
+        self.streams[token] = (size, chunks)
+        if key is not None:
+            self.tokens[key] = token
+        return token
+
+    def size(self, data: bytes) -> int:
+        """
+        Returns the size of `data` once its placeholders are replaced
+
+        Parameters
+        ----------
+        data: bytes
+            The encoded data, containing placeholders
+
+        Returns
+        -------
+        int
+            The final size of the data
+        """
+        result = len(data)
+        position = data.find(self.prefix)
+        while position != -1:
+            size, _ = self.streams[bytes(data[position:position + TOKEN_SIZE])]
+            result += size - TOKEN_SIZE
+            position = data.find(self.prefix, position + TOKEN_SIZE)
+        return result
+
+    def expand(self, data: bytes) -> typing.Iterator[bytes]:
+        """
+        Replaces the placeholders in `data` with the data from their sources
+
+        Note: Each source can only be consumed once.
+
+        Parameters
+        ----------
+        data: bytes
+            The encoded data, containing placeholders
+
+        Yields
+        ------
+        bytes
+            The chunks of the final data
+
+        Raises
+        ------
+        EncodingError
+            If a source did not give the number of bytes it announced
+        """
+        view = memoryview(data)
+        start = 0
+        position = data.find(self.prefix)
+        while position != -1:
+            yield view[start:position]
+            size, chunks = self.streams[bytes(data[position:position + TOKEN_SIZE])]
+            written = 0
+            for chunk in chunks:
+                written += len(chunk)
+                yield chunk
+            if written != size:
+                from cain.types import Binary
+                raise errors.EncodingError(Binary,
+                                           f"A streamed source gave {written} bytes instead of the announced {size} bytes")
+            start = position + TOKEN_SIZE
+            position = data.find(self.prefix, start)
+        yield view[start:]
+
+
+_ENCODING: contextvars.ContextVar[typing.Optional[EncodingContext]] = contextvars.ContextVar("cain_encoding",
+                                                                                             default=None)
+
+
+def current_encoding() -> typing.Optional[EncodingContext]:
+    """
+    Returns the context of the current encoding call, if any
+
+    Returns
+    -------
+    EncodingContext | None
+        The current encoding context, `None` if no option was given to the encoding call.
+    """
+    return _ENCODING.get()
+
+
+@contextlib.contextmanager
+def encoding(**options) -> typing.Iterator[EncodingContext]:
+    """
+    Sets the context for the encoding operations happening in the `with` block
+
+    Parameters
+    ----------
+    **options
+        The options to give to `EncodingContext`
+
+    Yields
+    ------
+    EncodingContext
+        The new encoding context
+    """
+    current_context = EncodingContext(**options)
+    token = _ENCODING.set(current_context)
+    try:
+        yield current_context
+    finally:
+        _ENCODING.reset(token)
@@ -0,0 +1,228 @@
+"""
+dictionaries.py
+
+Defines the preset dictionaries, which are used to compress small messages sharing a lot of structure.
+
+A single small message barely compresses on its own, but messages following the same schema
+share a lot of content (field values, enums, common strings, etc.).
+A preset dictionary is trained once from representative messages and shared by both sides,
+which lets `zlib` refer to this shared content from the very first byte of each message.
+
+Example
+-------
+>>> import cain
+>>> from cain.types import Object
+>>> class Event(Object):
+...     kind: str
+...     user: str
+...     status: str
+>>> samples = [{"kind": "click", "user": f"user{i}", "status": "delivered"} for i in range(100)]
+>>> dictionary = cain.train_dictionary(samples, Event)
+>>> data = cain.dumps({"kind": "click", "user": "user42", "status": "delivered"}, Event, dictionary=dictionary)
+>>> cain.loads(data, Event, dictionary=dictionary)
+{'kind': 'click', 'status': 'delivered', 'user': 'user42'}
+
+Structure
+---------
+\xd2\x04\x8b\x1f \x0b\xc9\xc8...
+~~~~~~~~~~~~~~~~ ~~~~~~~~~~~~~~
+ dictionary id   raw deflate stream (compressed using the dictionary)
+"""
+import collections
+import typing
+import zlib
+
+import cain
+from cain import errors
+
+# The size of the deflate window, which is the maximum useful size for a dictionary
+MAX_SIZE = 32768
+# Raw deflate streams, to avoid paying for the zlib header and checksum on each message
+WBITS = -15
+
+
+class Dictionary:
+    """
+    A preset dictionary for `zlib`.
+
+    Parameters
+    ----------
+    data: bytes
+        The content of the dictionary
+    level: int, default = -1
+        The compression level
+    max_length: int | None, default = None
+        If provided, the maximum size of the decompressed data, which protects against
+        small messages expanding to a lot of memory.
+
+    Attributes
+    ----------
+    id: int
+        The identifier of the dictionary (CRC32 of its content), written before each message
+    """
+
+    def __init__(self, data: bytes, level: int = -1, max_length: typing.Optional[int] = None) -> None:
+        self.data = bytes(data)
+        self.level = level
+        self.max_length = max_length
+        self.id = zlib.crc32(self.data)
+
+    def compressor(self) -> "zlib._Compress":
+        """Returns a new compression object using this dictionary"""
+        return zlib.compressobj(self.level, zlib.DEFLATED, WBITS, zdict=self.data)
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compresses the given data, without the dictionary id
+
+        Parameters
+        ----------
+        data: bytes
+            The data to compress
+
+        Returns
+        -------
+        bytes
+            The raw deflate stream
+        """
+        compressor = self.compressor()
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes) -> bytes:
+        """
+        Decompresses the given data, without the dictionary id
+
+        Parameters
+        ----------
+        data: bytes
+            The raw deflate stream
+
+        Returns
+        -------
+        bytes
+            The decompressed data
+
+        Raises
+        ------
+        DecodingError
+            If the data is truncated or if the decompressed data is larger than `max_length`
+        """
+        decompressor = zlib.decompressobj(WBITS, zdict=self.data)
+        if self.max_length is None:
+            result = decompressor.decompress(data)
+        else:
+            # one more byte is requested to know if the data goes over the limit
+            result = decompressor.decompress(data, self.max_length + 1)
+            if len(result) > self.max_length:
+                raise errors.DecodingError(Dictionary, f"The decompressed data is larger than the maximum size ({self.max_length} bytes)")
+        if not decompressor.eof:
+            raise errors.DecodingError(Dictionary, "The compressed data is truncated")
+        return result
+
+    def __repr__(self) -> str:
+        return f"Dictionary(id={self.id}, size={len(self.data)})"
+
+
+Dictionaries = typing.Union[Dictionary, typing.Mapping[int, Dictionary], typing.Iterable[Dictionary]]
+
+
+def find_dictionary(dictionaries: Dictionaries, dictionary_id: int) -> typing.Optional[Dictionary]:
+    """
+    Returns the dictionary with the given id
+
+    Parameters
+    ----------
+    dictionaries: Dictionary | Mapping[int, Dictionary] | Iterable[Dictionary]
+        The available dictionaries
+    dictionary_id: int
+        The id written in the message
+
+    Returns
+    -------
+    Dictionary | None
+        The dictionary, `None` if it is not available
+    """
+    if isinstance(dictionaries, Dictionary):
+        return dictionaries if dictionaries.id == dictionary_id else None
+    if isinstance(dictionaries, typing.Mapping):
+        return dictionaries.get(dictionary_id)
+    for dictionary in dictionaries:
+        if dictionary.id == dictionary_id:
+            return dictionary
+    return None
+
+
+def train_dictionary(samples: typing.Iterable[typing.Any],
+                     schema: "cain.cain.Schema",
+                     size: int = MAX_SIZE,
+                     segment_size: int = 8,
+                     level: int = -1,
+                     max_length: typing.Optional[int] = None) -> Dictionary:
+    """
+    Builds a preset dictionary from representative messages
+
+    The samples are encoded following `schema`, then the byte sequences appearing
+    in several samples are gathered, the most useful ones (frequency times length) being
+    placed at the end of the dictionary, where they are the cheapest to refer to.
+
+    Parameters
+    ----------
+    samples: Iterable[Any]
+        Representative objects
+    schema: type[Datatype] | Datatype | type
+        The schema of the messages
+    size: int, default = 32768
+        The maximum size of the dictionary
+    segment_size: int, default = 8
+        The size of the smallest shared sequence considered
+    level: int, default = -1
+        The compression level used by the dictionary
+    max_length: int | None, default = None
+        If provided, the maximum size of the data decompressed by the dictionary
+
+    Returns
+    -------
+    Dictionary
+        The trained dictionary
+    """
+    size = min(size, MAX_SIZE)
+    encoded = [cain.dumps(sample, schema) for sample in samples]
+
+    # Counting in how many samples each sequence appears
+    frequencies = collections.Counter()
+    for data in encoded:
+        frequencies.update({data[index:index + segment_size] for index in range(len(data) - segment_size + 1)})
+
+    # Merging the consecutive shared sequences into longer segments
+    segments = collections.Counter()
+    for data in encoded:
+        sample_segments = set()
+        start = None
+        for index in range(len(data) - segment_size + 1):
+            if frequencies[data[index:index + segment_size]] > 1:
+                if start is None:
+                    start = index
+            elif start is not None:
+                sample_segments.add(data[start:index + segment_size - 1])
+                start = None
+        if start is not None:
+            sample_segments.add(data[start:])
+        segments.update(sample_segments)
+
+    # Keeping the most useful segments, which are placed at the end of the dictionary
+    chosen = []
+    content = b""
+    for segment, count in sorted(segments.items(), key=lambda item: item[1] * len(item[0]), reverse=True):
+        if len(content) + len(segment) > size:
+            continue
+        if segment in content:
+            continue
+        chosen.append(segment)
+        content += segment
+
+    if not chosen:
+        # No shared content, falling back on the most recent samples
+        content = b"".join(encoded)[-size:]
+        return Dictionary(content, level=level, max_length=max_length)
+
+    return Dictionary(b"".join(reversed(chosen)), level=level, max_length=max_length)
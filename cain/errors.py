@@ -43,3 +43,50 @@ class DecodingError(DatatypeError):
     """
     Defines an error which could happen while decoding data (Cain -> Python)
     """
+
+
+class ValidationError(DecodingError):
+    """
+    Defines an error which could happen while validating encoded data
+
+    Attributes
+    ----------
+    message: str
+        The description of the problem
+    offset: int | None
+        The position of the problem in the validated data
+    path: list[str | int]
+        The keys and indices leading to the value having the problem
+    """
+
+    def __init__(self, datatype: type, message: str, remaining: int = 0) -> None:
+        self.message = message
+        # The number of bytes left at the problem, which gives its offset once the size of the data is known
+        self.remaining = remaining
+        self.offset = None
+        self.path = []
+        super().__init__(datatype, message)
+
+    @property
+    def location(self) -> str:
+        """The path to the value having the problem (`members[1].name`)"""
+        result = ""
+        for key in self.path:
+            result += f"[{key}]" if isinstance(key, int) else f".{key}"
+        return result.lstrip(".")
+
+    def __str__(self) -> str:
+        result = self.message
+        if self.offset is not None:
+            result += f" (at byte {self.offset}"
+            result += f", in `{self.location}`)" if self.path else ")"
+        return result
+
+
+class TruncatedDataError(ValidationError):
+    """
+    Defines an error which could happen when the data ends before the value being decoded or validated
+
+    Note: Unlike the other validation errors, more data could make it valid,
+          which is used when reading streams (`cain.iterload`).
+    """
@@ -0,0 +1,455 @@
+"""
+files.py
+
+Defines the record files, which store many values of the same schema in a single file.
+
+`cain.dumps(..., include_header=True)` embeds the schema in every payload, which is wasteful when storing
+many records. A record file writes the schema once, in its header, followed by the records.
+
+Example
+-------
+>>> import cain
+>>> from cain.types import Object
+>>> class User(Object):
+...     username: str
+...     age: int
+>>> with cain.RecordFile("users.cain", "w", User) as records:
+...     records.write({"username": "Anise", "age": 20})
+>>> with cain.RecordFile("users.cain", "a") as records:
+...     records.extend([{"username": "Ichika", "age": 21}, {"username": "Nino", "age": 22}])
+>>> with cain.RecordFile("users.cain", schema=User) as records:
+...     [user.username for user in records]
+['Anise', 'Ichika', 'Nino']
+
+Indexed files
+-------------
+When `block_size` is given, the records are grouped in blocks of `block_size` records and an index
+giving the position and the number of records of each block is written at the end of the file.
+This gives the number of records without reading them, the access to any record by reading at most
+one block and the split of the file into byte ranges which can be read independently (by parallel workers).
+
+>>> with cain.RecordFile("users.cain", "w", User, block_size=2) as records:
+...     records.extend({"username": f"user{index}", "age": index} for index in range(5))
+>>> with cain.RecordFile("users.cain", schema=User) as records:
+...     len(records), records[3].username, records.split(2)
+(5, 'user3', [(63, 83), (83, 113)])
+
+Structure
+---------
+CAIN  \x01     \x00   8          \x00\x00\x02...   \t   \x00\x00\x14Anise\x00       ...
+~~~~  ~~~~     ~~~~   ~~~~~~~~~~~~~~~~~~~~~~~~~~   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~   ~~~
+Magic Version  Flags  The encoded schema           Record (its size, as a           Other
+                      (`cain.encode_schema`),      variable length integer,         records
+                      prefixed by its size         then the encoded value)
+
+Flags
+-----
+\x01 — auto_length: the records are encoded with the `auto_length` option
+\x02 — indexed: the records are followed by the index of the blocks
+
+Index (variable length integers)
+-----
+Block size    Number of blocks    [Position (difference with the previous block)    Number of records] * n
+
+The file then ends with the position of the index (8 bytes, big-endian) and `CAIX`.
+All of the positions are counted from the start of the file.
+"""
+import bisect
+import os
+import typing
+
+import cain.cain
+import cain.types
+from cain import context, errors
+from cain.interning import Interner
+from cain.streaming import DEFAULT_BUFFER_SIZE, _decode_value, _decoding_options, _StreamReader
+from cain.types.binary import Binary
+from cain.types.numbers import AUTO, UnsignedVarInt
+
+# The first bytes of every record file
+MAGIC = b"CAIN"
+# The version of the format
+VERSION = 1
+# The last bytes of an indexed file
+INDEX_MAGIC = b"CAIX"
+# The size of the position of the index, at the end of an indexed file
+INDEX_POSITION_SIZE = 8
+
+# Flags
+AUTO_LENGTH = 1 << 0
+INDEXED = 1 << 1
+
+
+class RecordFile:
+    """
+    A file containing many records of the same schema.
+
+    Parameters
+    ----------
+    file: str | PathLike | int | BinaryIO
+        The path of the file, a file descriptor or a file-like object
+    mode: str, default = "r"
+        "r" to read the records, "w" to write a new file, "a" to add records at the end of a file
+        (which is created if needed)
+    schema: type[Datatype] | Datatype | type | None, default = None
+        The schema of the records.
+        It is required to create a file. When reading, it is read from the header if not given.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value should be variable length integers
+        (only used when creating a file, the option is stored in the header).
+    block_size: int | None, default = None
+        If given, the records are written in blocks of `block_size` records, followed by an index of the blocks
+        (only used when creating a file, the index is kept when adding records).
+    buffer_size: int, default = 65536
+        The number of bytes read at once, or kept in memory before being written
+
+    Note: The index of an indexed file is written when it is closed.
+
+    Raises
+    ------
+    DecodingError
+        If the file is not a record file or uses an unsupported version
+    EncodingError
+        If no schema is given to create a file, or if the given schema doesn't match the one of the file in append mode
+    """
+
+    def __init__(self,
+                 file: typing.Union[str, os.PathLike, int, typing.BinaryIO],
+                 mode: str = "r",
+                 schema: typing.Optional["cain.cain.Schema"] = None,
+                 auto_length: bool = False,
+                 block_size: typing.Optional[int] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        if mode not in ("r", "w", "a"):
+            raise ValueError(f"Invalid mode `{mode}`, expected 'r', 'w' or 'a'")
+        if block_size is not None and block_size < 1:
+            raise ValueError("The size of the blocks should be at least 1")
+        self.mode = mode
+        self.buffer_size = buffer_size
+        self.count = 0
+        self.closed = False
+        self.auto_length = auto_length
+        self.block_size = block_size
+        # The position and number of records of each block, for indexed files
+        self.blocks: typing.Optional[typing.List[typing.List[int]]] = None
+        # The index of the first record of each block (followed by the number of records), when reading an indexed file
+        self._firsts: typing.Optional[typing.List[int]] = None
+
+        if isinstance(file, (str, os.PathLike, int)):
+            self.handler = open(file, {"r": "rb", "w": "wb", "a": "a+b"}[mode])
+            self._owned = True
+        else:
+            self.handler = file
+            self._owned = False
+
+        self._buffer = bytearray()
+        # The position of the start of the file in the handler
+        self._origin = self.handler.tell() if mode != "a" else 0
+        # The positions of the records (the end is `None` when reading until the end of the file)
+        self._data_start = 0
+        self._data_end = None
+        # The number of bytes written to the handler
+        self._written = 0
+        try:
+            if mode == "a":
+                size = self.handler.seek(0, os.SEEK_END)
+                if size == 0:
+                    mode = "w"
+                else:
+                    self.handler.seek(0)
+                    header_schema = self._read_header()
+                    if schema is not None and cain.cain.encode_schema(schema) != header_schema:
+                        raise errors.EncodingError(RecordFile, "The given schema is not the schema of the file")
+                    self._written = size
+                    # reading the header moved the handler (the records are added at the end)
+                    self.handler.seek(0, os.SEEK_END)
+                    if self.blocks is not None:
+                        # the index is written again when closing the file
+                        self.handler.truncate(self._data_end)
+                        self.handler.seek(self._origin + self._data_end)
+                        self._written = self._data_end
+            if mode == "r":
+                header_schema = self._read_header()
+            elif mode == "w":
+                if schema is None:
+                    raise errors.EncodingError(RecordFile, "A schema is needed to create a record file")
+                if block_size is not None:
+                    self.blocks = []
+                self._write_header(schema)
+        except BaseException:
+            self.close()
+            raise
+
+        self.schema = schema if schema is not None else cain.cain.decode_schema(header_schema)
+        self.datatype, self.type_args = cain.types.retrieve_type(self.schema)
+
+    def _read_header(self) -> bytes:
+        """Reads the header (and the index) of the file, returning the encoded schema"""
+        start = self.handler.read(len(MAGIC) + 2)
+        if start[:len(MAGIC)] != MAGIC:
+            raise errors.DecodingError(RecordFile, "The file is not a Cain record file")
+        if len(start) < len(MAGIC) + 2:
+            raise errors.TruncatedDataError(RecordFile, "The header of the file is truncated")
+        version, flags = start[len(MAGIC):]
+        if version != VERSION:
+            raise errors.DecodingError(RecordFile, f"Unsupported record file version ({version})")
+        self.auto_length = bool(flags & AUTO_LENGTH)
+        frame = _StreamReader(self.handler, self.buffer_size, None).read(Binary, [AUTO])
+        self._data_start = len(start) + len(frame)
+        if flags & INDEXED:
+            self._read_index()
+        schema, _ = Binary.split(frame, AUTO)
+        return schema
+
+    def _read_index(self) -> None:
+        """Reads the index of the blocks, at the end of the file"""
+        trailer_size = INDEX_POSITION_SIZE + len(INDEX_MAGIC)
+        size = self.handler.seek(0, os.SEEK_END) - self._origin
+        if size >= self._data_start + trailer_size:
+            self.handler.seek(self._origin + size - trailer_size)
+            trailer = self.handler.read(trailer_size)
+        else:
+            trailer = b""
+        if trailer[INDEX_POSITION_SIZE:] != INDEX_MAGIC:
+            raise errors.DecodingError(RecordFile, "The index of the file is missing (the file might not have been closed)")
+        self._data_end = int.from_bytes(trailer[:INDEX_POSITION_SIZE], byteorder="big")
+        self.handler.seek(self._origin + self._data_end)
+        index = self.handler.read(size - trailer_size - self._data_end)
+
+        self.block_size, offset = UnsignedVarInt.read(index)
+        blocks_count, offset = UnsignedVarInt.read(index, offset)
+        self.blocks = []
+        self._firsts = [0]
+        position = self._data_start
+        for _ in range(blocks_count):
+            difference, offset = UnsignedVarInt.read(index, offset)
+            records_count, offset = UnsignedVarInt.read(index, offset)
+            position += difference
+            self.blocks.append([position, records_count])
+            self._firsts.append(self._firsts[-1] + records_count)
+
+    def _write_header(self, schema: "cain.cain.Schema") -> None:
+        """Writes the header of the file"""
+        flags = (AUTO_LENGTH if self.auto_length else 0) | (INDEXED if self.blocks is not None else 0)
+        self._buffer += MAGIC + bytes((VERSION, flags)) + Binary._encode(cain.cain.encode_schema(schema), AUTO)
+        self._data_start = len(self._buffer)
+
+    def _write_index(self) -> None:
+        """Writes the index of the blocks at the end of the file"""
+        index = UnsignedVarInt._encode(self.block_size) + UnsignedVarInt._encode(len(self.blocks))
+        previous = self._data_start
+        for position, records_count in self.blocks:
+            index += UnsignedVarInt._encode(position - previous) + UnsignedVarInt._encode(records_count)
+            previous = position
+        position = self._written + len(self._buffer)
+        self._buffer += index + position.to_bytes(INDEX_POSITION_SIZE, byteorder="big") + INDEX_MAGIC
+
+    def write(self, record: typing.Any) -> None:
+        """
+        Encodes and adds a record at the end of the file
+
+        Parameters
+        ----------
+        record: Any
+            The value to add
+        """
+        if self.mode == "r" or self.closed:
+            raise errors.EncodingError(RecordFile, "The file is not open for writing")
+        with context.encoding(auto_length=self.auto_length):
+            data = self.datatype._encode(record, *self.datatype.__args__, *self.type_args)
+        if self.blocks is not None:
+            if not self.blocks or self.blocks[-1][1] >= self.block_size:
+                # starting a new block
+                self.blocks.append([self._written + len(self._buffer), 0])
+            self.blocks[-1][1] += 1
+        self._buffer += UnsignedVarInt._encode(len(data))
+        self._buffer += data
+        self.count += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def extend(self, records: typing.Iterable[typing.Any]) -> None:
+        """
+        Encodes and adds the given records at the end of the file
+
+        Parameters
+        ----------
+        records: Iterable[Any]
+            The values to add
+        """
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        """Writes the buffered records to the file"""
+        if self._buffer:
+            self.handler.write(self._buffer)
+            self._written += len(self._buffer)
+            self._buffer = bytearray()
+        if hasattr(self.handler, "flush"):
+            self.handler.flush()
+
+    def _check_readable(self) -> None:
+        """Checks that the records can be read"""
+        if self.mode != "r" or self.closed:
+            raise errors.DecodingError(RecordFile, "The file is not open for reading")
+
+    def _reader(self, start: int, end: typing.Optional[int],
+                decoding_context: typing.Optional[context.DecodingContext] = None) -> _StreamReader:
+        """Returns a reader over the records between the `start` and `end` positions"""
+        self.handler.seek(self._origin + start)
+        return _StreamReader(self.handler, self.buffer_size, decoding_context,
+                             limit=end - start if end is not None else None)
+
+    def records(self,
+                intern: typing.Union[bool, Interner] = False,
+                into: typing.Optional[typing.Any] = None,
+                fields: typing.Optional[typing.Iterable[str]] = None,
+                byte_range: typing.Optional[typing.Tuple[int, int]] = None) -> typing.Iterator[typing.Any]:
+        """
+        Reads the records of the file, one by one
+
+        Parameters
+        ----------
+        intern: bool | Interner, default = False
+            If the repeated immutable values should be shared. Refer to `cain.loads` for more information.
+        into: type | None, default = None
+            If provided, the objects are decoded straight into this class. Refer to `cain.loads` for more information.
+        fields: Iterable[str] | None, default = None
+            The only fields to decode in the objects. Refer to `cain.loads` for more information.
+        byte_range: tuple[int, int] | None, default = None
+            The positions of the first record to read and of the end of the last one, as given by `split`
+
+        Yields
+        ------
+        Any
+            The decoded records
+
+        Raises
+        ------
+        TruncatedDataError
+            If the file ends in the middle of a record
+        """
+        self._check_readable()
+        decoding_context = _decoding_options(self.schema, intern, self.auto_length, into, fields)
+        type_args = [*self.datatype.__args__, *self.type_args]
+        start, end = byte_range if byte_range is not None else (self._data_start, self._data_end)
+        reader = self._reader(start, end)
+        while not reader.exhausted():
+            data, _ = Binary.split(reader.read(Binary, [AUTO]), AUTO)
+            yield _decode_value(data, self.datatype, type_args, decoding_context)
+            self.count += 1
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        return self.records()
+
+    def __len__(self) -> int:
+        """
+        The number of records in the file
+
+        Note: The records are counted (without being decoded) when the file is not indexed.
+        """
+        if self.blocks is not None:
+            return sum(records_count for _, records_count in self.blocks)
+        self._check_readable()
+        reader = self._reader(self._data_start, self._data_end)
+        result = 0
+        while not reader.exhausted():
+            reader.read(Binary, [AUTO])
+            result += 1
+        return result
+
+    def __getitem__(self, index: int) -> typing.Any:
+        """
+        Reads the record at `index`
+
+        Note: The records of the block containing it which are before it are skipped without being decoded.
+              All of the records before it are skipped when the file is not indexed
+              (and all of the records are counted first if `index` is negative).
+        """
+        self._check_readable()
+        if self._firsts is not None:
+            length = self._firsts[-1]
+        elif index < 0:
+            length = len(self)
+        else:
+            # the end of the records is found while reading them
+            length = None
+        if index < 0:
+            index += length
+        if index < 0 or (length is not None and index >= length):
+            raise IndexError("RecordFile index out of range")
+
+        start = self._data_start
+        if self._firsts is not None:
+            block = bisect.bisect_right(self._firsts, index) - 1
+            start = self.blocks[block][0]
+            index -= self._firsts[block]
+
+        reader = self._reader(start, self._data_end)
+        for _ in range(index):
+            if reader.exhausted():
+                raise IndexError("RecordFile index out of range")
+            reader.read(Binary, [AUTO])
+        if reader.exhausted():
+            raise IndexError("RecordFile index out of range")
+        data, _ = Binary.split(reader.read(Binary, [AUTO]), AUTO)
+        return _decode_value(data, self.datatype, [*self.datatype.__args__, *self.type_args],
+                             _decoding_options(self.schema, False, self.auto_length, None, None))
+
+    def split(self, parts: int) -> typing.List[typing.Tuple[int, int]]:
+        """
+        Splits the records in byte ranges containing about the same number of records,
+        to be read independently with `records(byte_range=...)`
+
+        Note: The ranges are made of whole blocks, which means that there are at most as many ranges as blocks.
+              A file which is not indexed is never split.
+
+        Parameters
+        ----------
+        parts: int
+            The number of ranges wanted
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            The start and end positions of each range
+        """
+        self._check_readable()
+        if self.blocks is None:
+            end = self._data_end
+            if end is None:
+                end = self.handler.seek(0, os.SEEK_END) - self._origin
+            return [(self._data_start, end)]
+        total = len(self)
+        results = []
+        start = self._data_start
+        read = 0
+        for position, records_count in self.blocks:
+            # a range ends before the block if the block would take it further from its share of the records
+            if read and len(results) < parts - 1 and (2 * read + records_count) * parts > 2 * total * (len(results) + 1):
+                results.append((start, position))
+                start = position
+            read += records_count
+        results.append((start, self._data_end))
+        return results
+
+    def close(self) -> None:
+        """Writes the remaining records (and the index) and closes the file, if it was opened by the record file"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if self.mode != "r":
+                if self.blocks is not None:
+                    self._write_index()
+                self.flush()
+        finally:
+            if self._owned:
+                self.handler.close()
+
+    def __enter__(self) -> "RecordFile":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
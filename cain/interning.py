@@ -0,0 +1,132 @@
+"""
+interning.py
+
+Defines the Interner, which is used to share the immutable values
+decoded multiple times within a single decoding call (hash-consing).
+
+Example
+-------
+>>> import cain
+>>> from cain.interning import Interner
+>>> interner = Interner()
+>>> data = cain.dumps(["Hello", "world", "Hello"] * 100, list[str])
+>>> decoded = cain.loads(data, list[str], intern=interner)
+>>> decoded[0] is decoded[3]
+True
+>>> interner.saved > 0
+True
+
+Note: Strings are interned using `sys.intern`, integers, `decimal.Decimal` and small tuples
+      are kept in a bounded table which only lives as long as the interner.
+"""
+import decimal
+import sys
+import typing
+
+# Any integer in this range is already shared by CPython
+SMALL_INTS = range(-5, 257)
+
+
+class Interner:
+    """
+    Hash-conses the immutable values it is given.
+
+    Parameters
+    ----------
+    max_size: int, default = 65536
+        The maximum number of values kept in the table.
+        When the table is full, the already known values are still shared but no new value is added.
+    max_tuple_length: int, default = 8
+        Tuples longer than this won't be interned.
+
+    Attributes
+    ----------
+    hits: int
+        The number of values which were replaced by an already existing one.
+    saved: int
+        An estimate of the memory saved, in bytes.
+    """
+
+    def __init__(self, max_size: int = 65536, max_tuple_length: int = 8) -> None:
+        self.max_size = max_size
+        self.max_tuple_length = max_tuple_length
+        self.table: typing.Dict[typing.Hashable, typing.Any] = {}
+        self.hits = 0
+        self.saved = 0
+
+    def key(self, value: typing.Any) -> typing.Optional[typing.Hashable]:
+        """
+        Returns the key used to look up `value` in the table
+
+        Note: Values which compare equal but have different types or representations
+              (`1` and `True`, `Decimal("1.0")` and `Decimal("1.00")`, `0.0` and `-0.0`)
+              get different keys.
+
+        Returns
+        -------
+        Hashable | None
+            The key, `None` if the value can't be interned.
+        """
+        cls = value.__class__
+        if cls is str or cls is int:
+            return value
+        if cls is decimal.Decimal:
+            return (cls, value.as_tuple())
+        if cls is tuple:
+            if len(value) > self.max_tuple_length:
+                return None
+            keys = []
+            for element in value:
+                element_cls = element.__class__
+                if element is None:
+                    keys.append(None)
+                elif element_cls is bool or element_cls is bytes:
+                    keys.append((element_cls, element))
+                elif element_cls is float:
+                    keys.append((element_cls, element.hex()))
+                else:
+                    element_key = self.key(element)
+                    if element_key is None:
+                        return None
+                    keys.append(element_key if element_cls is str else (element_cls, element_key))
+            return (cls, tuple(keys))
+        return None
+
+    def __call__(self, value: typing.Any) -> typing.Any:
+        """
+        Returns the shared version of `value`
+
+        Parameters
+        ----------
+        value: Any
+            The value to intern
+
+        Returns
+        -------
+        Any
+            An object equal to `value`, which might be `value` itself
+        """
+        cls = value.__class__
+        if cls is int and value in SMALL_INTS:
+            return value
+        key = self.key(value)
+        if key is None:
+            return value
+
+        try:
+            shared = self.table[key]
+        except KeyError:
+            shared = sys.intern(value) if cls is str else value
+            if len(self.table) < self.max_size:
+                self.table[key] = shared
+        except TypeError:
+            # unhashable content, which can't be shared
+            return value
+
+        if shared is not value:
+            self.hits += 1
+            self.saved += sys.getsizeof(value)
+        return shared
+
+    def __repr__(self) -> str:
+        return f"Interner(size={len(self.table)}, hits={self.hits}, saved={self.saved})"
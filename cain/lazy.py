@@ -0,0 +1,279 @@
+"""
+lazy.py
+
+Defines the lazy views, which decode the fields of an `Object` or the elements of an `Array` only when they are accessed.
+
+Decoding a large message to only read a few of its values wastes most of the work.
+With `cain.loads(..., lazy=True)`, a read-only view is returned instead: the positions of the
+fields (or elements) are found the first time one of them is accessed, by moving past the encoded
+values without building them, and each value is decoded once, when it is first accessed.
+
+Example
+-------
+>>> import cain
+>>> from cain.types import Object
+>>> class User(Object):
+...     username: str
+...     friends: list[str]
+>>> data = cain.dumps({"username": "Anise", "friends": ["Ichika", "Nino"]}, User)
+>>> user = cain.loads(data, User, lazy=True)
+>>> user["username"]
+'Anise'
+>>> user["friends"]
+LazyArray(Array, decoded=0/2)
+>>> user["friends"][1]
+'Nino'
+>>> user.materialize()
+{'friends': ['Ichika', 'Nino'], 'username': 'Anise'}
+
+Note: The views keep a reference to the decoded buffer (a `memoryview` over it), which means that
+      a `bytearray` can't be resized and a `mmap` can't be closed while a view on it exists.
+      The decoding options (`intern`, `zero_copy`, `auto_length`, etc.) given to `cain.loads`
+      are used when the values are decoded later on.
+      With `fields`, the objects only contain the selected fields, as when decoding eagerly.
+"""
+import abc
+import collections.abc
+import copy
+import typing
+
+import cain.types
+from cain import context, errors
+from cain.model import Datatype
+
+# Marks the values which are not decoded yet
+_MISSING = object()
+
+
+def view(datatype: typing.Type[Datatype], data: memoryview, *args,
+         decoding_context: typing.Optional[context.DecodingContext] = None) -> typing.Any:
+    """
+    Returns a lazy view over the value encoded at the start of `data`
+
+    Parameters
+    ----------
+    datatype: type[Datatype]
+        The datatype of the value
+    data: memoryview
+        The data containing the value
+    *args
+        The type arguments
+    decoding_context: DecodingContext | None, default = None
+        The decoding options to use when decoding the values
+
+    Returns
+    -------
+    LazyObject | LazyArray | Any
+        A lazy view for `Object` and `Array` values, the decoded value otherwise
+    """
+    if issubclass(datatype, cain.types.Object):
+        return LazyObject(datatype, data, *args, decoding_context=decoding_context)
+    if issubclass(datatype, cain.types.Array):
+        return LazyArray(datatype, data, *args, decoding_context=decoding_context)
+    with context.restore_decoding(decoding_context):
+        result, _ = datatype._decode(data, *args)
+    return result
+
+
+def _projected(decoding_context: context.DecodingContext,
+               fields: typing.Optional[typing.Dict[str, typing.Any]]) -> context.DecodingContext:
+    """Returns a copy of `decoding_context` selecting `fields`"""
+    result = copy.copy(decoding_context)
+    result.fields = fields
+    return result
+
+
+class LazyView(abc.ABC):
+    """
+    The base class of the lazy views.
+
+    Parameters
+    ----------
+    datatype: type[Datatype]
+        The datatype of the value
+    data: memoryview
+        The data containing the value (the value is contained in the first few bytes)
+    *args
+        The type arguments
+    decoding_context: DecodingContext | None, default = None
+        The decoding options to use when decoding the values
+    """
+    __slots__ = ("_datatype", "_data", "_args", "_context", "_types", "_positions", "_constants", "_values")
+
+    def __init__(self, datatype: typing.Type[Datatype], data: memoryview, *args,
+                 decoding_context: typing.Optional[context.DecodingContext] = None) -> None:
+        self._datatype = datatype
+        self._data = data
+        self._args = args
+        self._context = decoding_context
+        # The offset index, built on first access
+        self._types = None
+        self._positions = None
+        self._constants = None
+        self._values = None
+
+    @abc.abstractmethod
+    def _locate(self) -> None:
+        """Builds the offset index"""
+
+    def _element_context(self, index: int) -> typing.Optional[context.DecodingContext]:
+        """Returns the decoding options of the value at `index`"""
+        return self._context
+
+    def _value(self, index: int) -> typing.Any:
+        """Returns the value at `index`, decoding it if needed"""
+        if self._positions is None:
+            self._locate()
+        result = self._values[index]
+        if result is not _MISSING:
+            return result
+        if index in self._constants:
+            result = self._constants[index]
+        else:
+            current_type, type_args = self._types[index][-2:]
+            result = view(current_type, self._data[self._positions[index]:], *type_args,
+                          decoding_context=self._element_context(index))
+            interner = self._context.interner if self._context else None
+            if interner is not None and not isinstance(result, LazyView):
+                result = interner(result)
+        self._values[index] = result
+        return result
+
+    @property
+    def decoded(self) -> int:
+        """The number of values already decoded"""
+        if self._values is None:
+            return 0
+        return sum(1 for value in self._values if value is not _MISSING)
+
+    def materialize(self) -> typing.Any:
+        """
+        Decodes the whole value
+
+        Returns
+        -------
+        Any
+            The value, as returned by `cain.loads` without `lazy`
+        """
+        with context.restore_decoding(self._context):
+            result, _ = self._datatype._decode(self._data, *self._args)
+        return result
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._datatype.__name__}, decoded={self.decoded}/{len(self)})"
+
+
+class LazyObject(LazyView, collections.abc.Mapping):
+    """
+    A read-only mapping over an encoded `Object`, decoding its fields when they are accessed.
+
+    Note: The nested `Object` and `Array` values are lazy views too.
+
+    Example
+    -------
+    >>> user = LazyObject(User, memoryview(User.encode({"username": "Anise", "friends": []})))
+    >>> user["username"]
+    'Anise'
+    >>> user.username
+    'Anise'
+    """
+    __slots__ = ("_keys",)
+
+    def __init__(self, datatype: typing.Type[Datatype], data: memoryview, *args,
+                 decoding_context: typing.Optional[context.DecodingContext] = None) -> None:
+        super().__init__(datatype, data, *args, decoding_context=decoding_context)
+        self._keys = {key: index for index, (key, _, _) in enumerate(datatype._plan())}
+        fields = self._fields
+        if fields is not None:
+            for key in fields:
+                if key not in self._keys:
+                    raise errors.DecodingError(datatype, f"The field `{key}` is not in the schema")
+            self._keys = {key: index for key, index in self._keys.items() if key in fields}
+
+    @property
+    def _fields(self) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """The selected fields of the object, `None` if every field is"""
+        return self._context.fields if self._context is not None else None
+
+    def _locate(self) -> None:
+        # The skipped values are not projected
+        decoding_context = self._context if self._fields is None else _projected(self._context, None)
+        with context.restore_decoding(decoding_context):
+            self._types, self._positions, self._constants, _ = self._datatype._locate(self._data, *self._args)
+        self._values = [_MISSING] * len(self._types)
+
+    def _element_context(self, index: int) -> typing.Optional[context.DecodingContext]:
+        fields = self._fields
+        if fields is None:
+            return self._context
+        # the nested objects only decode the fields selected in this one
+        return _projected(self._context, fields[self._types[index][0]])
+
+    def __getitem__(self, key: str) -> typing.Any:
+        return self._value(self._keys[key])
+
+    def __getattr__(self, key: str) -> typing.Any:
+        if key.startswith("_"):
+            # internal attributes (the slots which are not set yet, `copy` and `pickle` hooks, etc.)
+            raise AttributeError(key)
+        try:
+            index = self._keys[key]
+        except KeyError:
+            raise AttributeError(key) from None
+        return self._value(index)
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: typing.Any) -> bool:
+        return key in self._keys
+
+
+class LazyArray(LazyView, collections.abc.Sequence):
+    """
+    A read-only sequence over an encoded `Array`, decoding its elements when they are accessed.
+
+    Note: The nested `Object` and `Array` values are lazy views too.
+
+    Example
+    -------
+    >>> array = LazyArray(Array, memoryview(Array[str].encode(["Hello", "world"])), str)
+    >>> array[-1]
+    'world'
+    >>> len(array)
+    2
+    """
+    __slots__ = ()
+
+    def _locate(self) -> None:
+        with context.restore_decoding(self._context):
+            self._types, self._positions, _ = self._datatype._locate(self._data, *self._args)
+        self._constants = {}
+        self._values = [_MISSING] * len(self._types)
+
+    def __getitem__(self, index: typing.Union[int, slice]) -> typing.Any:
+        if self._positions is None:
+            self._locate()
+        if isinstance(index, slice):
+            return [self._value(current) for current in range(*index.indices(len(self._positions)))]
+        length = len(self._positions)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("LazyArray index out of range")
+        return self._value(index)
+
+    def __len__(self) -> int:
+        if self._positions is None:
+            self._locate()
+        return len(self._positions)
+
+    def __eq__(self, value: typing.Any) -> bool:
+        if isinstance(value, (LazyArray, list, tuple)):
+            return len(self) == len(value) and all(a == b for a, b in zip(self, value))
+        return NotImplemented
+
+    __hash__ = None
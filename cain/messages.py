@@ -0,0 +1,309 @@
+"""
+messages.py
+
+Defines `MessageStream`, to send and receive Cain formatted messages over sockets and pipes.
+
+Each message is written as a frame: its size (as a variable length integer) followed by the encoded value,
+the same frames as the ones of `cain.async_dump` and `cain.async_load`.
+
+Example
+-------
+>>> import socket
+>>> from cain.types import Object
+>>> class Job(Object):
+...     id: int
+...     payload: bytes
+>>> left, right = socket.socketpair()
+>>> sender, receiver = MessageStream(left, send_schema=Job), MessageStream(right, recv_schema=Job)
+>>> sender.send({"id": 1, "payload": b"data"})
+12
+>>> receiver.recv().payload
+b'data'
+"""
+import os
+import traceback
+import typing
+
+import cain.cain
+import cain.types
+from cain import context, errors
+from cain.interning import Interner
+from cain.streaming import DEFAULT_BUFFER_SIZE, _decode_value, _decoding_options
+from cain.types.numbers import UnsignedVarInt
+
+# The `Binary` values of at least this size are not copied into the encoded data when sending
+DEFAULT_SCATTER_SIZE = 1 << 14
+# The maximum number of buffers given to a single `sendmsg` or `writev` call (IOV_MAX on most systems)
+MAX_BUFFERS = 1024
+# The maximum size of the frame header (enough for any size up to 2^63)
+MAX_HEADER_SIZE = 9
+
+
+class MessageStream:
+    """
+    Sends and receives length-framed messages over a socket, a pipe or a file descriptor.
+
+    The messages are received in a single buffer, reused (and grown when needed) for every message,
+    which is filled using `recv_into` and decoded in place.
+    When sending, the `Binary` values of at least `scatter_size` bytes are not copied into the encoded message:
+    the frame size, the encoded data and these values are written at once with `sendmsg` (or `os.writev`).
+
+    Parameters
+    ----------
+    stream: socket.socket | BinaryIO | int
+        The stream to use: a socket, a (raw) file-like object or a file descriptor (a pipe for example)
+    send_schema: type[Datatype] | Datatype | type | None, default = None
+        The schema of the messages sent (needed to use `send`)
+    recv_schema: type[Datatype] | Datatype | type | None, default = None
+        The schema of the messages received (needed to use `recv`)
+    intern: bool | Interner, default = False
+        If the repeated immutable values of the received messages should be shared.
+        Refer to `cain.loads` for more information.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value are variable length integers,
+        as if the `auto` argument was given to them.
+    into: type | None, default = None
+        If provided, the received objects are decoded straight into this class. Refer to `cain.loads` for more information.
+    fields: Iterable[str] | None, default = None
+        The only fields to decode in the received objects. Refer to `cain.loads` for more information.
+    scatter_size: int | None, default = 16384
+        The size from which the `Binary` values are written separately instead of being copied
+        (`None` to always copy them).
+    buffer_size: int, default = 65536
+        The initial size of the receive buffer, which is also the number of bytes received at once.
+    max_size: int | None, default = None
+        The maximum size of the messages received, in bytes (`None` for no limit).
+        Note: The receive buffer grows as the data arrives, never straight to the size announced by the frame.
+
+    Note: The frame size is written before the message, which means that the whole message (except the
+          values written separately) is encoded before being sent.
+    """
+
+    def __init__(self,
+                 stream: typing.Any,
+                 send_schema: typing.Optional["cain.cain.Schema"] = None,
+                 recv_schema: typing.Optional["cain.cain.Schema"] = None,
+                 intern: typing.Union[bool, Interner] = False,
+                 auto_length: bool = False,
+                 into: typing.Optional[typing.Any] = None,
+                 fields: typing.Optional[typing.Iterable[str]] = None,
+                 scatter_size: typing.Optional[int] = DEFAULT_SCATTER_SIZE,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 max_size: typing.Optional[int] = None) -> None:
+        self.stream = stream
+        self.auto_length = auto_length
+        self.scatter_size = scatter_size
+        self.buffer_size = buffer_size
+        self.max_size = max_size
+
+        self.send_type = None
+        if send_schema is not None:
+            self.send_type = cain.types.retrieve_type(send_schema)
+
+        self.recv_type = None
+        self.decoding_context = None
+        if recv_schema is not None:
+            datatype, type_args = cain.types.retrieve_type(recv_schema)
+            self.recv_type = (datatype, [*datatype.__args__, *type_args])
+            self.decoding_context = _decoding_options(recv_schema, intern, auto_length, into, fields)
+
+        self._buffer = bytearray(buffer_size)
+        # The received data which is not decoded yet is `_buffer[_start:_end]`
+        self._start = 0
+        self._end = 0
+
+    @property
+    def pending(self) -> int:
+        """The number of bytes received which are not decoded yet"""
+        return self._end - self._start
+
+    # Sending
+
+    def _writev(self, buffers: typing.List[memoryview]) -> int:
+        """Writes the given buffers at once (when possible) and returns the number of bytes written"""
+        if isinstance(self.stream, int):
+            if hasattr(os, "writev"):
+                return os.writev(self.stream, buffers)
+            return os.write(self.stream, buffers[0])
+        if hasattr(self.stream, "sendmsg"):
+            return self.stream.sendmsg(buffers)
+        if hasattr(self.stream, "send"):
+            return self.stream.send(buffers[0])
+        written = self.stream.write(buffers[0])
+        return buffers[0].nbytes if written is None else written
+
+    def _write(self, buffers: typing.List[memoryview]) -> None:
+        """Writes all of the given buffers, even if they are only partially written"""
+        index = 0
+        while index < len(buffers):
+            written = self._writev(buffers[index:index + MAX_BUFFERS])
+            while written:
+                size = buffers[index].nbytes
+                if written < size:
+                    buffers[index] = buffers[index][written:]
+                    break
+                written -= size
+                index += 1
+
+    def send(self, obj: typing.Any) -> int:
+        """
+        Encodes `obj` and sends it as a single message
+
+        Note: `Binary` values can also be file-like objects or `(size, chunks)` tuples,
+              which are sent in chunks, without being read in memory.
+
+        Parameters
+        ----------
+        obj: Any
+            The message to send
+
+        Returns
+        -------
+        int
+            The number of bytes sent (including the frame size)
+
+        Raises
+        ------
+        EncodingError
+            If no `send_schema` was given
+        """
+        if self.send_type is None:
+            raise errors.EncodingError(MessageStream, "No schema was given to send messages")
+        encoder, type_args = self.send_type
+        with context.encoding(streaming=True, auto_length=self.auto_length,
+                              defer_size=self.scatter_size) as encoding_context:
+            value = encoder.encode(obj, *type_args)
+
+        if encoding_context.streams:
+            size = encoding_context.size(value)
+            chunks = encoding_context.expand(value)
+        else:
+            size = len(value)
+            chunks = (value,)
+
+        buffers = [memoryview(UnsignedVarInt._encode(size))]
+        pending = 0
+        for chunk in chunks:
+            view = memoryview(chunk).cast("B")
+            if not view.nbytes:
+                continue
+            buffers.append(view)
+            pending += view.nbytes
+            if pending >= self.buffer_size:
+                # Keeps a bounded number of chunks from the streamed sources in memory
+                self._write(buffers)
+                buffers = []
+                pending = 0
+        self._write(buffers)
+
+        if hasattr(self.stream, "flush"):
+            self.stream.flush()
+        return size + len(UnsignedVarInt._encode(size))
+
+    # Receiving
+
+    def _readinto(self, view: memoryview) -> int:
+        """Receives data into `view` and returns the number of bytes received (0 at the end of the stream)"""
+        if isinstance(self.stream, int):
+            if hasattr(os, "readv"):
+                return os.readv(self.stream, [view])
+            data = os.read(self.stream, len(view))
+            view[:len(data)] = data
+            return len(data)
+        if hasattr(self.stream, "recv_into"):
+            return self.stream.recv_into(view)
+        return self.stream.readinto(view) or 0
+
+    def _fill(self, size: int) -> bool:
+        """Receives data until at least `size` bytes are pending, returns False if the stream ended before"""
+        if self._start and self._start + size > len(self._buffer):
+            # Moves the pending data at the start of the buffer
+            pending = self._end - self._start
+            self._buffer[:pending] = self._buffer[self._start:self._end]
+            self._start, self._end = 0, pending
+
+        while self._end - self._start < size:
+            if self._end == len(self._buffer):
+                # Grows the buffer as the data arrives (the size given by the frame can't be trusted)
+                self._buffer.extend(bytes(min(size - len(self._buffer), max(len(self._buffer), self.buffer_size))))
+            with memoryview(self._buffer) as view:
+                received = self._readinto(view[self._end:])
+            if not received:
+                return False
+            self._end += received
+        return True
+
+    def _read_size(self) -> typing.Tuple[int, int]:
+        """Reads the size of the next message, returning it with the size of the frame header"""
+        if not self._fill(1):
+            raise EOFError("The stream ended")
+        while True:
+            with memoryview(self._buffer) as view:
+                try:
+                    size, end = UnsignedVarInt.read(view[:self._end], self._start)
+                    return size, end - self._start
+                except errors.TruncatedDataError:
+                    if self.pending >= MAX_HEADER_SIZE:
+                        raise errors.DecodingError(UnsignedVarInt, "The size of the message is too large") from None
+            if not self._fill(self.pending + 1):
+                raise errors.TruncatedDataError(UnsignedVarInt, "The stream ended in the middle of a message size")
+
+    def recv(self) -> typing.Any:
+        """
+        Receives and decodes the next message
+
+        Returns
+        -------
+        Any
+            The decoded message
+
+        Raises
+        ------
+        DecodingError
+            If no `recv_schema` was given, if the message is larger than `max_size`
+            or if it could not be decoded (the next call receives the message after it)
+        EOFError
+            If the stream ended before the start of a message
+        TruncatedDataError
+            If the stream ended in the middle of a message
+        """
+        if self.recv_type is None:
+            raise errors.DecodingError(MessageStream, "No schema was given to receive messages")
+        size, header_size = self._read_size()
+        if self.max_size is not None and size > self.max_size:
+            raise errors.DecodingError(MessageStream,
+                                       f"The message ({size} bytes) is larger than the maximum size ({self.max_size} bytes)")
+        if not self._fill(header_size + size):
+            raise errors.TruncatedDataError(MessageStream,
+                                            f"The stream ended in the middle of a message ({self.pending - header_size} bytes out of {size})")
+
+        start = self._start + header_size
+        datatype, type_args = self.recv_type
+        try:
+            with memoryview(self._buffer) as view:
+                result = _decode_value(view[start:start + size], datatype, type_args, self.decoding_context)
+        except Exception as err:
+            # the frames of the traceback hold views over the buffer, which couldn't be resized
+            traceback.clear_frames(err.__traceback__)
+            if isinstance(err, errors.TruncatedDataError):
+                # the whole message was received
+                raise errors.DecodingError(MessageStream, f"The message could not be decoded: {err}") from err
+            raise
+        finally:
+            # Moves past the message, even if it could not be decoded
+            self._start = start + size
+
+        if self._start == self._end:
+            self._start = self._end = 0
+            if len(self._buffer) > self.buffer_size:
+                # Gives back the memory used by a large message
+                del self._buffer[self.buffer_size:]
+        return result
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        """Receives the messages until the end of the stream"""
+        while True:
+            try:
+                yield self.recv()
+            except EOFError:
+                return
@@ -29,11 +29,12 @@ class DatatypeMeta(type):
     def __type_hints__(cls):
         """Parses the type annotations for this class"""
         try:
-            annotations, results = cls.__type_hints_cache__
+            # The cache of the parent classes should not be used
+            annotations, results = cls.__dict__["__type_hints_cache__"]
             if annotations != cls.__annotations__:
-                raise AttributeError("internal error: the annotations have changed")
+                raise KeyError("internal error: the annotations have changed")
             return results
-        except AttributeError:
+        except KeyError:
             # print("__type_hints__: cache miss")
             results = typing.get_type_hints(cls)
             cls.__type_hints_cache__ = (cls.__annotations__, results)
@@ -138,11 +139,20 @@ class Datatype(metaclass=DatatypeMeta):
     @property
     def __root__(cls):
         """Returns a version of the current datatype without any arguments or type annotations"""
+        # The root is created once per class, which keeps the caches attached to it
+        # (type hints, fields, etc.) alive between the encoding and decoding calls
+        try:
+            return cls.__dict__["__root_datatype__"]
+        except KeyError:
+            pass
+
         class NewDatatype(cls):
             """A subclass which doesn't have any type argument"""
             __annotations__ = {}
             __args__ = []
         NewDatatype.__name__ = cls.__name__
+        NewDatatype.__root_datatype__ = NewDatatype
+        cls.__root_datatype__ = NewDatatype
 
         return NewDatatype
 
@@ -184,6 +194,63 @@ class Datatype(metaclass=DatatypeMeta):
         """
         raise errors.DecodingError(cls, f"A value could not be decoded to `{cls.__name__}`")
 
+    @classmethod
+    def _skip(cls, value: bytes, *args) -> bytes:
+        """
+        Moves past an encoded value, without building it (used by the lazy views)
+
+        Note: The datatypes having a cheaper way to find the end of their values override this,
+              the value is decoded and thrown away otherwise.
+
+        Parameters
+        ----------
+        value: bytes
+            The data containing the value (the value is contained in the first few bytes)
+        *args: tuple[str, type]
+            Any argument passed with the type.
+
+        Returns
+        -------
+        bytes
+            The remaining bytes from `value` after the value
+        """
+        _, value = cls._decode(value, *args)
+        return value
+
+    @classmethod
+    def _validate(cls, value: bytes, *args) -> bytes:
+        """
+        Checks that an encoded value is well-formed, without keeping any decoded value (used by `cain.validate`)
+
+        Note: The datatypes able to check their values without building them override this,
+              the value is decoded and thrown away otherwise.
+
+        Parameters
+        ----------
+        value: bytes
+            The data containing the value (the value is contained in the first few bytes)
+        *args: tuple[str, type]
+            Any argument passed with the type.
+
+        Returns
+        -------
+        bytes
+            The remaining bytes from `value` after the value
+
+        Raises
+        ------
+        ValidationError
+            If the value is not well-formed
+        """
+        try:
+            _, value = cls._decode(value, *args)
+        except errors.ValidationError:
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            raise errors.ValidationError(cls, str(err) or f"The value could not be decoded to `{cls.__name__}`",
+                                         len(value)) from err
+        return value
+
     @classmethod
     def encode(cls, value: typing.Any, *args) -> bytes:
         """
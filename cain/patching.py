@@ -0,0 +1,215 @@
+"""
+patching.py
+
+Defines `patch`, which updates some fields of an encoded `Object` without decoding and encoding it entirely.
+
+The fields are found using the positions given by `Object._locate`:
+
+- When the new value has the same size as the old one and is not shared with another field
+  (through the redundancy table), it is written in place.
+- When its size changes, only the field is encoded again and spliced in, because the values
+  of an object are written one after the other without any length.
+- Otherwise (repeated value, default value left out, optional value marked in a bitmap, etc.),
+  the smallest object containing the field is decoded, updated, encoded again and spliced in.
+
+Example
+-------
+>>> import cain
+>>> from cain.types import Object
+>>> class Counter(Object):
+...     name: str
+...     count: int
+>>> data = cain.dumps({"name": "visits", "count": 1}, Counter)
+>>> data, strategies = cain.patch(data, Counter, {"count": 2})
+>>> strategies
+{'count': 'in-place'}
+>>> cain.loads(data, Counter)
+Counter({'count': 2, 'name': 'visits'})
+"""
+import collections
+import collections.abc
+import contextlib
+import typing
+
+import cain
+from cain import context, errors
+from cain.model import Datatype
+from cain.records import Record
+
+# The strategies reported for each patched field
+IN_PLACE = "in-place"
+SPLICED = "spliced"
+
+
+class _Change:
+    """The new value of a field, as a leaf of the changes tree"""
+    __slots__ = ("value",)
+
+    def __init__(self, value: typing.Any) -> None:
+        self.value = value
+
+
+def _changes_tree(changes: typing.Mapping[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """Returns the changes as a tree, the nested fields being separated by dots"""
+    tree = {}
+    for path, value in changes.items():
+        node = tree
+        *parents, last = path.split(".")
+        for key in parents:
+            node = node.setdefault(key, {})
+            if isinstance(node, _Change):
+                raise errors.EncodingError(cain.types.Object, f"The field `{key}` is changed along with some of its fields")
+        if last in node:
+            raise errors.EncodingError(cain.types.Object, f"The field `{path}` is changed along with some of its fields")
+        node[last] = _Change(value)
+    return tree
+
+
+def _paths(tree: typing.Dict[str, typing.Any], prefix: str = "") -> typing.Iterator[str]:
+    """Returns the paths of the changes in `tree`"""
+    for key, node in tree.items():
+        if isinstance(node, _Change):
+            yield prefix + key
+        else:
+            yield from _paths(node, prefix + key + ".")
+
+
+def _apply(value: typing.Any, tree: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """Applies the changes in `tree` to the decoded object `value`, returning the updated fields"""
+    if isinstance(value, Record):
+        value = value._asdict()
+    elif isinstance(value, Datatype):
+        value = dict(value._cain_value)
+    elif isinstance(value, collections.abc.Mapping):
+        value = dict(value)
+    else:
+        raise errors.EncodingError(cain.types.Object, f"The fields of a `{value.__class__.__name__}` value can't be changed")
+    for key, node in tree.items():
+        if key not in value:
+            raise errors.EncodingError(cain.types.Object, f"The field `{key}` is not in the schema")
+        value[key] = node.value if isinstance(node, _Change) else _apply(value[key], node)
+    return value
+
+
+def patch(data: typing.Union[bytes, bytearray],
+          schema: typing.Optional["cain.cain.Schema"],
+          changes: typing.Mapping[str, typing.Any],
+          auto_length: bool = False) -> typing.Tuple[bytearray, typing.Dict[str, str]]:
+    """
+    Changes some fields of the encoded object `data`, without encoding the whole object again
+
+    Parameters
+    ----------
+    data: bytes | bytearray
+        The Cain formatted object. A `bytearray` is updated in place (and returned).
+    schema: type[Object] | None
+        The `Object` schema of the data.
+        When left empty, the given `data` should contain a header with the schema.
+    changes: Mapping[str, Any]
+        The new values, for each field. Nested fields are separated by dots (`{"owner.email": ...}`).
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value are variable length integers.
+
+    Returns
+    -------
+    tuple[bytearray, dict[str, str]]
+        The updated data and, for each changed field, how it was updated:
+        `"in-place"` if the new value was written over the old one,
+        `"spliced"` if the field (or an object containing it) was encoded again and spliced in.
+
+    Raises
+    ------
+    EncodingError
+        If a field is not in the schema or a new value can't be encoded
+    """
+    if not isinstance(data, bytearray):
+        data = bytearray(data)
+
+    offset = 0
+    if not schema:
+        schema, content = cain.cain._split_header(data)
+        offset = len(data) - len(content)
+        # the view would prevent the bytearray from being resized
+        content.release()
+
+    datatype, type_args = cain.types.retrieve_type(schema)
+    if not issubclass(datatype, cain.types.Object):
+        raise errors.EncodingError(datatype, "Only `Object` values can be patched")
+
+    strategies = {}
+    with contextlib.ExitStack() as stack:
+        if auto_length:
+            stack.enter_context(context.decoding(auto_length=True))
+            stack.enter_context(context.encoding(auto_length=True))
+        _patch_object(data, offset, datatype, [*datatype.__args__, *type_args], _changes_tree(changes), "", strategies)
+    return data, strategies
+
+
+def _span(data: bytearray, offset: int, datatype: typing.Type[Datatype], type_args: typing.List) -> int:
+    """Returns the end of the value starting at `offset`"""
+    with memoryview(data) as view:
+        rest = datatype._skip(view[offset:], *type_args)
+        end = len(data) - len(rest)
+        del rest
+    return end
+
+
+def _replace(data: bytearray, start: int, end: int, new: bytes) -> str:
+    """Replaces `data[start:end]` with `new`, returning the strategy used"""
+    data[start:end] = new
+    return IN_PLACE if len(new) == end - start else SPLICED
+
+
+def _patch_object(data: bytearray, offset: int, datatype: typing.Type[Datatype], type_args: typing.List,
+                  tree: typing.Dict[str, typing.Any], prefix: str, strategies: typing.Dict[str, str]) -> None:
+    """Applies the changes in `tree` to the object starting at `offset`"""
+    with memoryview(data) as view:
+        types, positions, constants, rest = datatype._locate(view[offset:], *type_args)
+        end = len(data) - len(rest)
+        del rest
+    keys = {key: index for index, (key, _, _) in enumerate(types)}
+    optionals = set(datatype._bitmap_plan()[1]) if cain.types.objects.BITMAP in type_args else set()
+    shared = collections.Counter(position for position in positions if position is not None)
+
+    def reachable(key: str) -> bool:
+        """If the field can be updated on its own"""
+        try:
+            index = keys[key]
+        except KeyError:
+            raise errors.EncodingError(datatype, f"The field `{key}` is not in the schema") from None
+        if index in constants or shared[positions[index]] > 1:
+            # not written or shared with other fields
+            return False
+        node = tree[key]
+        if isinstance(node, _Change):
+            # the bitmap would change
+            return not (node.value is None and index in optionals)
+        return True
+
+    if not all([reachable(key) for key in tree]):
+        # Encoding the whole object again
+        value, _ = datatype._decode(bytes(data[offset:end]), *type_args)
+        new = datatype._encode(_apply(value, tree), *type_args)
+        data[offset:end] = new
+        for path in _paths(tree, prefix):
+            strategies[path] = SPLICED
+        return
+
+    # Starting from the end keeps the positions of the other fields valid
+    for key in sorted(tree, key=lambda current_key: positions[keys[current_key]], reverse=True):
+        index = keys[key]
+        _, current_type, current_args = types[index]
+        start = offset + positions[index]
+        node = tree[key]
+        if isinstance(node, _Change):
+            field_end = _span(data, start, current_type, current_args)
+            strategies[prefix + key] = _replace(data, start, field_end, current_type._encode(node.value, *current_args))
+        elif issubclass(current_type, cain.types.Object):
+            _patch_object(data, start, current_type, current_args, node, prefix + key + ".", strategies)
+        else:
+            # a value which can't be patched directly (`Optional`, `Compressed`, etc.)
+            field_end = _span(data, start, current_type, current_args)
+            value, _ = current_type._decode(bytes(data[start:field_end]), *current_args)
+            _replace(data, start, field_end, current_type._encode(_apply(value, node), *current_args))
+            for path in _paths(node, prefix + key + "."):
+                strategies[path] = SPLICED
@@ -0,0 +1,335 @@
+"""
+records.py
+
+Defines the records, which are compact classes generated for `Object` schemas.
+
+Decoding an `Object` gives an instance of the `Object` subclass, holding a dictionary.
+When the `record` argument is given to the schema, the values are decoded straight into
+a generated class using `__slots__` instead, with one attribute per field (in the sorted keys order).
+
+Example
+-------
+>>> from cain.types import Object
+>>> from cain.types.objects import RECORD
+>>> class User(Object[RECORD]):
+...     username: str
+...     favorite_number: int
+>>> user = User.decode(User.encode({"username": "Anise", "favorite_number": 2}))
+>>> user
+User(favorite_number=2, username='Anise')
+>>> user.username
+'Anise'
+>>> user["favorite_number"]
+2
+>>> user._asdict()
+{'favorite_number': 2, 'username': 'Anise'}
+
+Note: The keys of the object need to be valid Python identifiers.
+
+Targets
+-------
+`cain.loads(..., into=...)` decodes the objects straight into user defined classes (dataclasses,
+`typing.NamedTuple`, `attrs` classes or any class using `__slots__`).
+The type hints of the target are matched with the schema to find the nested targets
+(`members: list[Member]` is matched with `members: list[MemberSchema]`) and a constructor
+is generated once for each pair of `Object` schema and target class.
+
+>>> import dataclasses
+>>> import cain
+>>> @dataclasses.dataclass
+... class UserData:
+...     username: str
+...     favorite_number: int
+>>> cain.loads(b'\x00\x00\x00\x02Anise\x00', User, into=UserData)
+UserData(username='Anise', favorite_number=2)
+"""
+import dataclasses
+import keyword
+import typing
+
+import cain
+from cain import errors
+
+try:
+    from attr import NOTHING as _ATTRS_NOTHING
+except ImportError:  # no class can use `attrs` when it is not installed
+    _ATTRS_NOTHING = None
+
+
+class Record:
+    """
+    The base class of the generated records.
+
+    Note: Records compare equal to other records of the same class with the same values
+          and to dictionaries with the same content.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> typing.Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def _astuple(self) -> typing.Tuple[typing.Any, ...]:
+        """Returns the values of the record, in the sorted keys order"""
+        return tuple(getattr(self, key) for key in self.__slots__)
+
+    def _asdict(self) -> typing.Dict[str, typing.Any]:
+        """Returns the content of the record as a dictionary"""
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    @property
+    def _cain_value(self) -> typing.Dict[str, typing.Any]:
+        """The content of the record, to be used like the value of a `Datatype` instance"""
+        return self._asdict()
+
+    def __eq__(self, value: typing.Any) -> bool:
+        if isinstance(value, Record):
+            return self.__class__ is value.__class__ and self._astuple() == value._astuple()
+        if isinstance(value, dict):
+            return self._asdict() == value
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{key}={getattr(self, key)!r}" for key in self.__slots__)
+        return f"{self.__class__.__name__}({values})"
+
+
+# The names used by `Record`, which can't be used as fields
+RESERVED = frozenset(dir(Record))
+
+
+def make_record(name: str, keys: typing.Iterable[str], module: typing.Optional[str] = None) -> typing.Type[Record]:
+    """
+    Generates a new record class
+
+    Parameters
+    ----------
+    name: str
+        The name of the class
+    keys: Iterable[str]
+        The fields of the record, in the order the values are given to the constructor
+    module: str | None, default = None
+        The module the class should appear to be defined in
+
+    Returns
+    -------
+    type[Record]
+        The new class, taking the values of its fields as positional arguments
+
+    Raises
+    ------
+    DatatypeError
+        If a key can't be used as an attribute name
+    """
+    keys = tuple(keys)
+    for key in keys:
+        if not key.isidentifier() or keyword.iskeyword(key) or key.startswith("__") or key in RESERVED:
+            raise errors.DatatypeError(Record, f"The key `{key}` can't be used as a record field")
+
+    # The constructor is generated once, to avoid looping over the fields for each new record
+    arguments = ", ".join(keys)
+    body = "".join(f"\n    self.{key} = {key}" for key in keys) or "\n    pass"
+    namespace = {}
+    exec(f"def __init__(self, {arguments}):{body}", namespace)  # pylint: disable=exec-used
+
+    return type(name, (Record,), {
+        "__slots__": keys,
+        "__init__": namespace["__init__"],
+        "__module__": module or __name__,
+        "__qualname__": name
+    })
+
+
+# The constructor of a target, taking the values of the fields in the sorted keys order
+Constructor = typing.Callable[..., typing.Any]
+
+
+def target_fields(target: type) -> typing.Tuple[typing.Dict[str, str], bool]:
+    """
+    Returns the fields of a target class
+
+    Parameters
+    ----------
+    target: type
+        A dataclass, `typing.NamedTuple`, `attrs` class or a class using `__slots__`
+
+    Returns
+    -------
+    tuple[dict[str, str], bool]
+        The fields, mapping the keys expected in the schema to the name of the constructor arguments,
+        and if the constructor should be called with them.
+        When `False`, the instance is created without calling `__init__` and the attributes are set directly.
+    """
+    if dataclasses.is_dataclass(target):
+        return {field.name: field.name for field in dataclasses.fields(target) if field.init}, True
+    if issubclass(target, tuple) and hasattr(target, "_fields"):
+        return {field: field for field in target._fields}, True
+    if hasattr(target, "__attrs_attrs__"):
+        # `attrs` removes the leading underscores from the private attributes in `__init__`
+        return {_attrs_alias(attribute): _attrs_alias(attribute)
+                for attribute in target.__attrs_attrs__ if attribute.init}, True
+    slots = {}
+    for parent in reversed(target.__mro__):
+        parent_slots = parent.__dict__.get("__slots__", ())
+        for slot in ((parent_slots,) if isinstance(parent_slots, str) else parent_slots):
+            if slot not in ("__dict__", "__weakref__"):
+                slots[slot] = slot
+    return slots, False
+
+
+def required_fields(target: type) -> typing.Set[str]:
+    """Returns the fields of `target` which don't have any default value"""
+    if dataclasses.is_dataclass(target):
+        return {field.name for field in dataclasses.fields(target)
+                if field.init
+                and field.default is dataclasses.MISSING
+                and field.default_factory is dataclasses.MISSING}
+    if issubclass(target, tuple) and hasattr(target, "_fields"):
+        return set(target._fields) - set(getattr(target, "_field_defaults", {}))
+    if hasattr(target, "__attrs_attrs__"):
+        # `attrs.NOTHING` marks the attributes without any default value
+        return {_attrs_alias(attribute) for attribute in target.__attrs_attrs__
+                if attribute.init and attribute.default is _ATTRS_NOTHING}
+    return set()
+
+
+def target_hints(target: type) -> typing.Dict[str, typing.Any]:
+    """Returns the type hints of `target`, using the same keys as `target_fields`"""
+    try:
+        hints = typing.get_type_hints(target)
+    except Exception:  # pylint: disable=broad-except
+        return {}
+    if hasattr(target, "__attrs_attrs__"):
+        return {_attrs_alias(attribute): hints[attribute.name]
+                for attribute in target.__attrs_attrs__ if attribute.name in hints}
+    return hints
+
+
+def _attrs_alias(attribute: typing.Any) -> str:
+    """Returns the name of the `__init__` argument for the given `attrs` attribute"""
+    return getattr(attribute, "alias", None) or attribute.name.lstrip("_")
+
+
+def make_constructor(schema: typing.Type["cain.types.Object"], target: type) -> Constructor:
+    """
+    Generates the function creating instances of `target` from the decoded values of `schema`
+
+    Note: The constructor is generated once for each schema and target.
+
+    Parameters
+    ----------
+    schema: type[Object]
+        The `Object` datatype being decoded
+    target: type
+        The class to create
+
+    Returns
+    -------
+    Callable[..., Any]
+        A function taking the values of the fields of `schema`, in the sorted keys order
+
+    Raises
+    ------
+    DecodingError
+        If a field required by `target` is not in the schema
+    """
+    schema = schema.__root__
+    constructors = schema.__dict__.get("__constructors__")
+    if constructors is None:
+        constructors = {}
+        schema.__constructors__ = constructors
+    try:
+        return constructors[target]
+    except KeyError:
+        pass
+
+    keys = [key for key, _, _ in schema._plan()]
+    fields, call = target_fields(target)
+    missing = required_fields(target) - set(keys)
+    if missing:
+        raise errors.DecodingError(schema, f"The fields {sorted(missing)} of `{target.__name__}` are not in the schema")
+
+    parameters = ", ".join(f"_{index}" for index in range(len(keys)))
+    if call:
+        arguments = ", ".join(f"{fields[key]}=_{index}" for index, key in enumerate(keys) if key in fields)
+        body = f"\n    return target({arguments})"
+    else:
+        body = "\n    instance = new(target)"
+        body += "".join(f"\n    instance.{key} = _{index}" for index, key in enumerate(keys) if key in fields)
+        body += "\n    return instance"
+    namespace = {"target": target, "new": object.__new__}
+    exec(f"def construct({parameters}):{body}", namespace)  # pylint: disable=exec-used
+
+    constructor = namespace["construct"]
+    constructors[target] = constructor
+    return constructor
+
+
+def collect_targets(schema: typing.Any, target: typing.Any) -> typing.Dict[type, Constructor]:
+    """
+    Matches the `Object` datatypes in `schema` with the classes in `target`
+
+    Parameters
+    ----------
+    schema: type[Datatype] | Datatype | type
+        The schema used to decode the data
+    target: type
+        The class to decode the root object into (or a generic alias like `list[MyDataclass]`).
+        When `schema` is a container (`list[MyObject]`, `Optional[MyObject]`, etc.),
+        a class can also be given directly to be used for the objects it contains.
+
+    Returns
+    -------
+    dict[type, Callable[..., Any]]
+        The constructors to use for each `Object` datatype
+    """
+    targets = {}
+    _collect_targets(*cain.types.retrieve_type(schema), target, targets)
+    return targets
+
+
+def _collect_targets(datatype: type, type_args: typing.List, target: typing.Any, targets: typing.Dict[type, Constructor]) -> None:
+    """Fills `targets` with the constructors for the `Object` datatypes found in `datatype`"""
+    if target is None or target is typing.Any:
+        return
+
+    if issubclass(datatype, cain.types.Object):
+        target = typing.get_origin(target) or target
+        if not isinstance(target, type) or issubclass(target, (dict, cain.model.Datatype)):
+            return
+        if datatype in targets:
+            # already matched (recursive schemas)
+            return
+        targets[datatype] = make_constructor(datatype, target)
+        hints = target_hints(target)
+        fields, _ = target_fields(target)
+        for key, field_datatype, field_args in datatype._plan():
+            if key in fields and key in hints:
+                _collect_targets(field_datatype, field_args, hints[key], targets)
+        return
+
+    # Containers: matching their type arguments
+    schemas = []
+    for arg in type_args:
+        try:
+            schemas.append(cain.types.retrieve_type(arg))
+        except (errors.UnknownTypeError, TypeError):
+            # not a type (`long`, `auto`, etc.)
+            continue
+    target_args = [arg for arg in typing.get_args(target) if arg is not type(None) and arg is not Ellipsis]
+    if not target_args:
+        # a class given directly is used for every object inside the container
+        target_args = [target]
+    if len(target_args) == 1:
+        target_args = target_args * len(schemas)
+    for (current_datatype, current_args), current_target in zip(schemas, target_args):
+        _collect_targets(current_datatype, current_args, current_target, targets)
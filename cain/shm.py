@@ -0,0 +1,343 @@
+"""
+shm.py
+
+Defines `Channel`, a transport between two processes using a ring buffer in shared memory.
+
+The producer encodes the records and writes them in the shared memory (the large `Binary` values being
+copied there directly), and the consumer decodes them right from it (from a `memoryview`),
+without any pipe or copy in between.
+
+Structure
+---------
+The shared memory starts with a header, made of the write position (followed by the capacity and the closing flag)
+and the read position, each on its own cache line. The positions only ever grow: the offset in the ring is the
+position modulo the capacity, and `write - read` is the number of bytes used.
+
+Each record is written as its size (4 bytes) followed by the encoded value, in one contiguous piece.
+When a record doesn't fit before the end of the ring, the remaining space is skipped (marked with a size of 0xFFFFFFFF
+when there is enough room for it) and the record is written at the start.
+
+Note: This is a single-producer/single-consumer channel: only one process should put records and only one should get them.
+
+Example
+-------
+>>> from cain.types import Object
+>>> class Job(Object):
+...     id: int
+...     name: str
+>>> with Channel(None, 1024, Job) as producer:
+...     consumer = Channel(producer.name, schema=Job)  # usually in another process
+...     producer.put({"id": 1, "name": "resize"})
+...     consumer.get().name
+...     consumer.close()
+'resize'
+"""
+import os
+import queue
+import struct
+import time
+import traceback
+import typing
+from multiprocessing import shared_memory
+
+import cain.cain
+import cain.types
+from cain import context, errors
+from cain.interning import Interner
+from cain.messages import DEFAULT_SCATTER_SIZE
+from cain.streaming import _decode_value, _decoding_options
+
+# The size of the header, made of two cache lines (one written by the producer, one by the consumer)
+HEADER_SIZE = 128
+# The indices of the header fields, as 8-byte integers
+WRITE_POSITION = 0
+CAPACITY = 1
+CLOSED = 2
+READ_POSITION = 8
+
+RECORD_SIZE = struct.Struct("<I")
+# The size written to mark the end of the ring (the record is at the start)
+WRAP = 0xFFFFFFFF
+
+# The number of times the positions are checked before sleeping, when waiting
+# (spinning only delays the other process when they share a single CPU)
+SPIN_COUNT = 100 if (os.cpu_count() or 1) > 1 else 0
+# The longest time slept at once (in seconds), when waiting
+MAX_SLEEP = 1e-3
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Opens an existing shared memory block, which should not be destroyed when this process exits"""
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Python < 3.13: the block is registered again, which does nothing
+        # when it's in a child process (the resource tracker is shared)
+        return shared_memory.SharedMemory(name)
+
+
+class Channel:
+    """
+    A single-producer/single-consumer channel between processes, using a ring buffer in shared memory.
+
+    The shared memory is created when `capacity` is given, and opened otherwise.
+
+    Parameters
+    ----------
+    name: str | None, default = None
+        The name of the shared memory block (a random name is given when creating one without a name)
+    capacity: int | None, default = None
+        The size of the ring buffer, in bytes, when creating the channel (each record needs to fit in it)
+    schema: type[Datatype] | Datatype | type | None, default = None
+        The schema of the records
+    intern: bool | Interner, default = False
+        If the repeated immutable values of the records received should be shared.
+        Refer to `cain.loads` for more information.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value are variable length integers,
+        as if the `auto` argument was given to them.
+    into: type | None, default = None
+        If provided, the objects received are decoded straight into this class. Refer to `cain.loads` for more information.
+    fields: Iterable[str] | None, default = None
+        The only fields to decode in the objects received. Refer to `cain.loads` for more information.
+    scatter_size: int | None, default = 16384
+        The size from which the `Binary` values are copied right into the shared memory instead of being
+        copied into the encoded record first (`None` to always encode them with the record).
+
+    Note: The channel can be given to another process (`multiprocessing.Process(args=(channel,))`),
+          where it opens the same shared memory.
+          The process which created the channel removes the shared memory when leaving the `with` block (`unlink`),
+          after which it can't be opened anymore (the processes which already opened it can still use it).
+    """
+
+    def __init__(self,
+                 name: typing.Optional[str] = None,
+                 capacity: typing.Optional[int] = None,
+                 schema: typing.Optional["cain.cain.Schema"] = None,
+                 intern: typing.Union[bool, Interner] = False,
+                 auto_length: bool = False,
+                 into: typing.Optional[typing.Any] = None,
+                 fields: typing.Optional[typing.Iterable[str]] = None,
+                 scatter_size: typing.Optional[int] = DEFAULT_SCATTER_SIZE) -> None:
+        self.schema = schema
+        self.auto_length = auto_length
+        self.scatter_size = scatter_size
+        self._options = (intern, auto_length, into, fields, scatter_size)
+
+        self.created = capacity is not None
+        if self.created:
+            if capacity < RECORD_SIZE.size:
+                raise errors.EncodingError(Channel, f"The capacity of the channel should be at least {RECORD_SIZE.size} bytes")
+            self._memory = shared_memory.SharedMemory(name, create=True, size=HEADER_SIZE + capacity)
+        else:
+            if name is None:
+                raise errors.DecodingError(Channel, "The name of the channel to open is needed")
+            self._memory = _attach(name)
+
+        self._header = self._memory.buf[:HEADER_SIZE].cast("Q")
+        if self.created:
+            self._header[CAPACITY] = capacity
+        self.capacity = self._header[CAPACITY]
+        self._data = self._memory.buf[HEADER_SIZE:HEADER_SIZE + self.capacity]
+
+        self.datatype = None
+        self.type_args = None
+        self.decoding_context = None
+        if schema is not None:
+            self.datatype, type_args = cain.types.retrieve_type(schema)
+            self.type_args = [*self.datatype.__args__, *type_args]
+            self.decoding_context = _decoding_options(schema, intern, auto_length, into, fields)
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory block"""
+        return self._memory.name
+
+    @property
+    def closed(self) -> bool:
+        """If the channel was closed by any side"""
+        return self._header is None or bool(self._header[CLOSED])
+
+    def __len__(self) -> int:
+        """The number of bytes used in the ring buffer"""
+        return self._header[WRITE_POSITION] - self._header[READ_POSITION]
+
+    def __reduce__(self):
+        return (self.__class__, (self.name, None, self.schema, *self._options))
+
+    @staticmethod
+    def _wait(ready: typing.Callable[[], bool], deadline: typing.Optional[float]) -> bool:
+        """Waits until `ready` returns True, returns False if `deadline` is reached before"""
+        for _ in range(SPIN_COUNT):
+            if ready():
+                return True
+        delay = 1e-5
+        while not ready():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_SLEEP)
+        return True
+
+    def _reserve(self, size: int, deadline: typing.Optional[float]) -> None:
+        """Waits until `size` bytes are free in the ring"""
+        header = self._header
+        limit = self.capacity - size
+        if not self._wait(lambda: header[WRITE_POSITION] - header[READ_POSITION] <= limit or header[CLOSED], deadline):
+            raise queue.Full
+        if header[CLOSED]:
+            raise BrokenPipeError("The channel is closed")
+
+    def put(self, obj: typing.Any, timeout: typing.Optional[float] = None) -> None:
+        """
+        Encodes `obj` and writes it in the channel, waiting for enough space to be freed if needed
+
+        Parameters
+        ----------
+        obj: Any
+            The record to write
+        timeout: float | None, default = None
+            The maximum number of seconds to wait for, `None` to wait as long as needed
+
+        Raises
+        ------
+        EncodingError
+            If no schema was given or if the record is larger than the channel
+        queue.Full
+            If there was not enough space before `timeout` seconds
+        BrokenPipeError
+            If the channel is closed
+        """
+        if self.datatype is None:
+            raise errors.EncodingError(Channel, "No schema was given to the channel")
+        if self._header is None:
+            raise BrokenPipeError("The channel is closed")
+        with context.encoding(streaming=True, auto_length=self.auto_length,
+                              defer_size=self.scatter_size) as encoding_context:
+            data = self.datatype.encode(obj, *self.type_args)
+        if encoding_context.streams:
+            length = encoding_context.size(data)
+            chunks = encoding_context.expand(data)
+        else:
+            length = len(data)
+            chunks = (data,)
+
+        size = RECORD_SIZE.size + length
+        if size > self.capacity:
+            raise errors.EncodingError(Channel, f"The record ({size} bytes) is larger than the channel ({self.capacity} bytes)")
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        position = self._header[WRITE_POSITION]
+        offset = position % self.capacity
+        remaining = self.capacity - offset
+        if remaining < size:
+            # The record is written at the start of the ring
+            self._reserve(remaining, deadline)
+            if remaining >= RECORD_SIZE.size:
+                RECORD_SIZE.pack_into(self._data, offset, WRAP)
+            position += remaining
+            self._header[WRITE_POSITION] = position
+            offset = 0
+
+        self._reserve(size, deadline)
+        RECORD_SIZE.pack_into(self._data, offset, length)
+        start = offset + RECORD_SIZE.size
+        for chunk in chunks:
+            end = start + len(chunk)
+            if end > offset + size:
+                raise errors.EncodingError(Channel, "A streamed source gave more bytes than announced")
+            self._data[start:end] = chunk
+            start = end
+        # The record is visible to the consumer once the position is updated
+        self._header[WRITE_POSITION] = position + size
+
+    def get(self, timeout: typing.Optional[float] = None) -> typing.Any:
+        """
+        Reads and decodes the next record of the channel, waiting for one if needed
+
+        Parameters
+        ----------
+        timeout: float | None, default = None
+            The maximum number of seconds to wait for, `None` to wait as long as needed
+
+        Returns
+        -------
+        Any
+            The decoded record
+
+        Raises
+        ------
+        DecodingError
+            If no schema was given, or if the record could not be decoded (the next call reads the record after it)
+        queue.Empty
+            If no record was written before `timeout` seconds
+        EOFError
+            If the channel is closed and every record was read
+        """
+        if self.datatype is None:
+            raise errors.DecodingError(Channel, "No schema was given to the channel")
+        if self._header is None:
+            raise EOFError("The channel is closed")
+        header = self._header
+        deadline = None if timeout is None else time.monotonic() + timeout
+        position = header[READ_POSITION]
+        while True:
+            if not self._wait(lambda: header[WRITE_POSITION] != position or header[CLOSED], deadline):
+                raise queue.Empty
+            if header[WRITE_POSITION] == position:
+                raise EOFError("The channel is closed")
+
+            offset = position % self.capacity
+            remaining = self.capacity - offset
+            if remaining >= RECORD_SIZE.size:
+                size, = RECORD_SIZE.unpack_from(self._data, offset)
+                if size != WRAP:
+                    start = offset + RECORD_SIZE.size
+                    try:
+                        return _decode_value(self._data[start:start + size], self.datatype, self.type_args,
+                                             self.decoding_context)
+                    except Exception as err:
+                        # the frames of the traceback hold views over the shared memory, which couldn't be closed
+                        traceback.clear_frames(err.__traceback__)
+                        if isinstance(err, errors.TruncatedDataError):
+                            # the whole record was written
+                            raise errors.DecodingError(Channel, f"The record could not be decoded: {err}") from err
+                        raise
+                    finally:
+                        # The space is given back to the producer once the record is decoded (or can't be)
+                        header[READ_POSITION] = position + RECORD_SIZE.size + size
+            # The next record is at the start of the ring
+            position += remaining
+            header[READ_POSITION] = position
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        """Reads the records until the channel is closed"""
+        while True:
+            try:
+                yield self.get()
+            except EOFError:
+                return
+
+    def close(self) -> None:
+        """
+        Closes the channel (the consumer can still read the records written before) and releases the shared memory in this process
+        """
+        if self._data is None:
+            return
+        self._header[CLOSED] = 1
+        self._data.release()
+        self._header.release()
+        self._data = self._header = None
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Removes the shared memory block, which can't be opened by other processes anymore"""
+        self._memory.unlink()
+
+    def __enter__(self) -> "Channel":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+        if self.created:
+            self.unlink()
@@ -0,0 +1,684 @@
+"""
+streaming.py
+
+Defines the tools to write and read large Cain formatted data without holding it entirely in memory.
+
+`cain.dump` needs the whole value to encode it: `Array` looks for the repeated elements before writing anything.
+`ArrayWriter` encodes the elements of an array one by one instead, writing them to the file as it goes.
+`iterload` does the opposite, reading the file through a bounded buffer and giving the elements
+of the array as soon as they are read.
+
+Example
+-------
+>>> import cain
+>>> from cain.types import Object
+>>> class Row(Object):
+...     username: str
+...     age: int
+>>> with open("rows.cain", "w+b") as fp:
+...     with cain.ArrayWriter(fp, Row) as writer:
+...         writer.append({"username": "Anise", "age": 20})
+...         writer.extend({"username": "Ichika", "age": age} for age in range(3))
+>>> with open("rows.cain", "rb") as fp:
+...     for row in cain.iterload(fp, list[Row]):
+...         print(row.username, row.age)
+Anise 20
+Ichika 0
+Ichika 1
+Ichika 2
+"""
+import typing
+
+import cain.cain
+import cain.types
+from cain import context, errors
+from cain.interning import Interner
+from cain.model import Datatype
+from cain.records import collect_targets
+from cain.types.arrays import register_index, validate_repeated
+from cain.types.numbers import UnsignedInt, UnsignedVarInt, auto_length as is_auto_length
+
+# The number of bytes kept in memory before being written to the handler
+DEFAULT_BUFFER_SIZE = 1 << 16
+# The number of bytes reserved for the length of the array when it is a variable length integer (up to 2^63 - 1)
+RESERVED_VARINT_SIZE = 9
+
+
+def padded_varint(value: int, size: int) -> bytes:
+    """
+    Encodes `value` as a variable length integer taking exactly `size` bytes
+
+    Note: The unused bytes only hold the continuation bit, which keeps the result
+          readable by `UnsignedVarInt` while allowing it to be written over a placeholder.
+
+    Example
+    -------
+    >>> padded_varint(3, 3)
+    b'\x83\x80\x00'
+    >>> UnsignedVarInt.decode(padded_varint(3, 3))
+    3
+    """
+    result = bytearray()
+    for _ in range(size - 1):
+        result.append((value & 0x7F) | 0x80)
+        value >>= 7
+    if value >= 0x80:
+        raise errors.EncodingError(UnsignedVarInt, f"The number is too large to be encoded in {size} bytes")
+    result.append(value)
+    return bytes(result)
+
+
+class ArrayWriter:
+    """
+    Writes an `Array` to a file-like object, encoding its elements one by one.
+
+    The length of the array is written at the start of the data:
+
+    - when `length` is given, it is written right away and checked when closing the writer
+    - otherwise, the handler needs to be seekable: a placeholder is written and replaced once the writer is closed
+
+    Note: The repeated elements are not looked for (the redundancy table is empty) because it is written
+          before the elements. The data is decoded as usual, with `cain.load(fp, list[schema, *args])`.
+
+    Parameters
+    ----------
+    handler: BinaryIO
+        The file-like object to write to
+    schema: type[Datatype] | Datatype | type
+        The schema of the elements
+    *args
+        The type arguments of the array (`long`, `short`, `auto`)
+    length: int | None, default = None
+        The number of elements which will be written, if known
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value should be encoded as
+        variable length integers, as if the `auto` argument was given to them.
+    buffer_size: int, default = 65536
+        The number of bytes kept in memory before writing them to `handler`
+
+    Example
+    -------
+    >>> import io
+    >>> fp = io.BytesIO()
+    >>> with ArrayWriter(fp, int) as writer:
+    ...     writer.extend([1, 2, 3])
+    >>> fp.getvalue()
+    b'\x00\x03\x00\x00\x00\x01\x00\x02\x00\x03'
+    """
+
+    def __init__(self,
+                 handler: typing.BinaryIO,
+                 schema: "cain.cain.Schema",
+                 *args,
+                 length: typing.Optional[int] = None,
+                 auto_length: bool = False,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        self.handler = handler
+        self.datatype, self.type_args = cain.types.retrieve_type(schema)
+        self.args = args
+        self.length = length
+        self.auto_length = auto_length
+        self.buffer_size = buffer_size
+        self.count = 0
+        self.closed = False
+
+        self._buffer = bytearray()
+        self._start = None
+        if is_auto_length(args, context.EncodingContext(auto_length=auto_length)):
+            self._integer_encoder = UnsignedVarInt
+            self._integer_size = RESERVED_VARINT_SIZE
+        else:
+            self._integer_encoder = UnsignedInt
+            _, self._integer_size = UnsignedInt.process_args(args)
+
+        if length is not None:
+            self._buffer += self._encode_length(length)
+        else:
+            if not (hasattr(handler, "seekable") and handler.seekable()):
+                raise errors.EncodingError(cain.types.Array,
+                                           "The length of the array needs to be given when the handler is not seekable")
+            self._start = handler.tell()
+            self._buffer += bytes(self._integer_size)
+        # no repeated element
+        self._buffer += self._integer_encoder._encode(0, *args)
+
+    def _encode_length(self, length: int) -> bytes:
+        """Encodes the length of the array"""
+        if self._integer_encoder is UnsignedVarInt:
+            if self._start is None:
+                return UnsignedVarInt._encode(length)
+            return padded_varint(length, self._integer_size)
+        try:
+            return UnsignedInt._encode(length, *self.args)
+        except OverflowError:
+            raise errors.EncodingError(cain.types.Array,
+                                       f"The length of the array ({length}) can't be encoded in {self._integer_size} bytes "
+                                       "(the `long` or `auto` arguments allow for longer arrays)") from None
+
+    def append(self, value: typing.Any) -> None:
+        """
+        Encodes and adds a new element to the array
+
+        Parameters
+        ----------
+        value: Any
+            The element to add
+        """
+        if self.closed:
+            raise errors.EncodingError(cain.types.Array, "The writer is closed")
+        if self.auto_length:
+            with context.encoding(auto_length=True):
+                self._buffer += self.datatype._encode(value, *self.type_args)
+        else:
+            self._buffer += self.datatype._encode(value, *self.type_args)
+        self.count += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def extend(self, values: typing.Iterable[typing.Any]) -> None:
+        """
+        Encodes and adds the given elements to the array
+
+        Parameters
+        ----------
+        values: Iterable[Any]
+            The elements to add
+        """
+        for value in values:
+            self.append(value)
+
+    def flush(self) -> None:
+        """Writes the buffered data to the handler"""
+        if self._buffer:
+            self.handler.write(self._buffer)
+            self._buffer = bytearray()
+
+    def close(self) -> None:
+        """
+        Writes the remaining data and the length of the array
+
+        Raises
+        ------
+        EncodingError
+            If the number of elements doesn't match the given `length` or can't be encoded
+        """
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        if self.length is not None:
+            if self.count != self.length:
+                raise errors.EncodingError(cain.types.Array,
+                                           f"{self.count} elements were written instead of the announced {self.length}")
+            return
+        end = self.handler.tell()
+        self.handler.seek(self._start)
+        self.handler.write(self._encode_length(self.count))
+        self.handler.seek(end)
+
+    def __enter__(self) -> "ArrayWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # the data is incomplete anyway
+            self.flush()
+            self.closed = True
+
+
+def _decoding_options(schema: "cain.cain.Schema",
+                      intern: typing.Union[bool, Interner],
+                      auto_length: bool,
+                      into: typing.Optional[typing.Any],
+                      fields: typing.Optional[typing.Iterable[str]]) -> typing.Optional[context.DecodingContext]:
+    """Returns the decoding context for the given options, to be set back for each value"""
+    targets = collect_targets(schema, into) if into is not None else None
+    with cain.cain._decoding_context(intern=intern, auto_length=auto_length, targets=targets,
+                                     fields=cain.cain._fields_tree(fields) if fields is not None else None):
+        return context.current_decoding()
+
+
+def _decode_value(data: bytes, datatype: typing.Type[Datatype], type_args: typing.List,
+                  decoding_context: typing.Optional[context.DecodingContext]) -> typing.Any:
+    """Decodes the value encoded in `data` with the given options"""
+    with context.restore_decoding(decoding_context):
+        result, _ = datatype._decode(data, *type_args)
+    interner = decoding_context.interner if decoding_context else None
+    if interner is not None:
+        result = interner(result)
+    return result
+
+
+class _StreamReader:
+    """
+    Reads the values one after the other from a file-like object, keeping only the unread data in memory
+
+    Parameters
+    ----------
+    handler: BinaryIO
+        The file-like object to read from
+    buffer_size: int
+        The number of bytes read at once (more is read when a single value is larger)
+    decoding_context: DecodingContext | None
+        The decoding options
+    limit: int | None, default = None
+        The number of bytes which can be read from `handler`, everything is read otherwise
+    """
+
+    def __init__(self, handler: typing.BinaryIO, buffer_size: int,
+                 decoding_context: typing.Optional[context.DecodingContext],
+                 limit: typing.Optional[int] = None) -> None:
+        self.handler = handler
+        self.buffer_size = buffer_size
+        self.decoding_context = decoding_context
+        self.limit = limit
+        self.buffer = bytearray()
+        self.position = 0
+        self.eof = False
+
+    def fill(self) -> None:
+        """Reads more data, at least as much as what is already buffered"""
+        # the read part is dropped (the buffer can't be resized while a view on it exists)
+        del self.buffer[:self.position]
+        self.position = 0
+        size = max(self.buffer_size, len(self.buffer))
+        if self.limit is not None:
+            size = min(size, self.limit)
+        chunk = self.handler.read(size) if size else b""
+        if self.limit is not None:
+            self.limit -= len(chunk)
+        if chunk:
+            self.buffer += chunk
+        else:
+            self.eof = True
+
+    def exhausted(self) -> bool:
+        """If every byte of the file has been read"""
+        if self.position == len(self.buffer) and not self.eof:
+            self.fill()
+        return self.eof and self.position == len(self.buffer)
+
+    def read(self, datatype: typing.Type[Datatype], type_args: typing.List) -> bytes:
+        """
+        Returns the encoded data of the next value
+
+        Raises
+        ------
+        TruncatedDataError
+            If the file ends before the value
+        ValidationError
+            If the value is not well-formed
+        """
+        while True:
+            truncated = False
+            with memoryview(self.buffer) as view, context.restore_decoding(self.decoding_context):
+                try:
+                    end = len(view) - len(datatype._validate(view[self.position:], *type_args))
+                except errors.TruncatedDataError:
+                    if self.eof:
+                        raise
+                    truncated = True
+            if truncated:
+                self.fill()
+                continue
+            result = bytes(self.buffer[self.position:end])
+            self.position = end
+            return result
+
+    def decode(self, data: bytes, datatype: typing.Type[Datatype], type_args: typing.List) -> typing.Any:
+        """Decodes the value encoded in `data`"""
+        return _decode_value(data, datatype, type_args, self.decoding_context)
+
+
+def iterload(handler: typing.BinaryIO,
+             schema: "cain.cain.Schema",
+             intern: typing.Union[bool, Interner] = False,
+             auto_length: bool = False,
+             into: typing.Optional[typing.Any] = None,
+             fields: typing.Optional[typing.Iterable[str]] = None,
+             buffer_size: int = DEFAULT_BUFFER_SIZE) -> typing.Iterator[typing.Any]:
+    """
+    Reads the `Array`, `Set` or `Tuple` from `handler` element by element
+
+    Note: Only the buffered data and the repeated elements which are not given yet are kept in memory.
+          The elements of a `Set` are given in the order they were written, duplicates included.
+
+    Parameters
+    ----------
+    handler: BinaryIO
+        The file-like object to read the Cain formatted data from
+    schema: type[Datatype] | Datatype | type
+        The schema of the whole data (`list[MyObject]`, `set[str]`, etc.)
+    intern: bool | Interner, default = False
+        If the repeated immutable values should be shared. Refer to `cain.loads` for more information.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value are variable length integers.
+    into: type | None, default = None
+        If provided, the objects are decoded straight into this class. Refer to `cain.loads` for more information.
+    fields: Iterable[str] | None, default = None
+        The only fields to decode in the objects. Refer to `cain.loads` for more information.
+    buffer_size: int, default = 65536
+        The number of bytes read at once
+
+    Yields
+    ------
+    Any
+        The decoded elements
+
+    Raises
+    ------
+    TruncatedDataError
+        If the file ends before the last element
+    DecodingError
+        If the data can't be decoded
+    """
+    datatype, type_args = cain.types.retrieve_type(schema)
+    type_args = [*datatype.__args__, *type_args]
+    if issubclass(datatype, cain.types.Set):
+        type_args = cain.types.Set.preprocess_types(type_args)
+    elif not issubclass(datatype, (cain.types.Array, cain.types.Tuple)):
+        raise errors.DecodingError(datatype, "Only `Array`, `Set` and `Tuple` values can be read element by element")
+
+    decoding_context = _decoding_options(schema, intern, auto_length, into, fields)
+    return _iterate(_StreamReader(handler, buffer_size, decoding_context), datatype, type_args)
+
+
+def _iterate(reader: _StreamReader, datatype: typing.Type[Datatype], type_args: typing.List) -> typing.Iterator[typing.Any]:
+    """Reads the elements of the array, following the layout of `Array._decode`"""
+    types = cain.types.Array.process_types_args(type_args)
+    if len(types) == 1:
+        if is_auto_length(type_args, reader.decoding_context):
+            integer_encoder = UnsignedVarInt
+        else:
+            integer_encoder = UnsignedInt
+    else:
+        integer_encoder = cain.types.numbers.recommended_size(len(types))
+
+    def read_integer() -> int:
+        """Reads one of the integers of the header"""
+        # not interned and decoded without any option
+        result, _ = integer_encoder._decode(reader.read(integer_encoder, type_args), *type_args)
+        return result
+
+    if len(types) == 1:
+        length = read_integer()
+        element_type = types[0]
+
+        def type_of(index: int) -> typing.Tuple[typing.Type[Datatype], typing.List]:
+            return element_type
+    else:
+        length = len(types)
+        type_of = types.__getitem__
+
+    # The repeated elements, kept until they are given for their last index
+    repeated: typing.Dict[int, bytes] = {}
+    for _ in range(read_integer()):
+        indices = [read_integer() for _ in range(read_integer())]
+        if not indices:
+            raise errors.DecodingError(datatype, "A repeated value should appear at least once")
+        if any(index >= length for index in indices):
+            raise errors.DecodingError(datatype, f"A repeated value index is out of range ({length} elements)")
+        current_type, current_args = type_of(indices[0])
+        data = reader.read(current_type, current_args)
+        for index in indices:
+            repeated[index] = data
+
+    for index in range(length):
+        current_type, current_args = type_of(index)
+        data = repeated.pop(index, None)
+        if data is None:
+            data = reader.read(current_type, current_args)
+        yield reader.decode(data, current_type, current_args)
+
+
+class _Cursor:
+    """The data received for the value being validated by `_validation` and the position reached in it"""
+
+    __slots__ = ("view", "offset")
+
+    def __init__(self) -> None:
+        self.view: typing.Optional[memoryview] = None
+        self.offset = 0
+
+    @property
+    def remaining(self) -> int:
+        """The number of bytes received after the position"""
+        return len(self.view) - self.offset
+
+
+def _step(cursor: _Cursor, function: typing.Callable[..., bytes], *args) -> typing.Generator[None, None, None]:
+    """Validates the data at the cursor with `function` (which returns the rest), waiting for more data while it is truncated"""
+    while True:
+        try:
+            rest = len(function(cursor.view[cursor.offset:], *args))
+            break
+        except errors.TruncatedDataError:
+            pass
+        # yields outside of the `except` block, to not keep the data alive through the traceback
+        yield
+    cursor.offset = len(cursor.view) - rest
+
+
+def _integer(cursor: _Cursor, integer_encoder: typing.Type[Datatype], type_args: typing.List) -> typing.Generator[None, None, int]:
+    """Reads one of the integers of an array header"""
+    start = cursor.offset
+    yield from _step(cursor, integer_encoder._validate, *type_args)
+    result, _ = integer_encoder._decode(cursor.view[start:cursor.offset], *type_args)
+    return result
+
+
+def _uses(datatype: typing.Type[Datatype], base: typing.Type[Datatype]) -> bool:
+    """If `datatype` is validated like `base`"""
+    return issubclass(datatype, base) and datatype._validate.__func__ is base._validate.__func__
+
+
+def _validation(cursor: _Cursor, datatype: typing.Type[Datatype], type_args: typing.List) -> typing.Generator[None, None, None]:
+    """
+    Validates a value as its data is received, yielding each time more data is needed.
+
+    The `Array`, `Set`, `Tuple` and `Object` values are validated element by element, following their `_validate` method,
+    which lets the validation start again from the element which was truncated instead of the start of the value.
+    """
+    if _uses(datatype, cain.types.Set):
+        datatype, type_args = cain.types.Array, cain.types.Set.preprocess_types(type_args)
+    elif _uses(datatype, cain.types.Tuple):
+        datatype = cain.types.Array
+
+    keys = None
+    processed = set()
+    if _uses(datatype, cain.types.Array):
+        types = cain.types.Array.process_types_args(type_args)
+        if len(types) == 1:
+            if is_auto_length(type_args, context.current_decoding()):
+                integer_encoder = UnsignedVarInt
+            else:
+                integer_encoder = UnsignedInt
+            length = yield from _integer(cursor, integer_encoder, type_args)
+            element_type = types[0]
+
+            def type_of(index: int) -> typing.Tuple[typing.Type[Datatype], typing.List]:
+                return element_type
+        else:
+            length = len(types)
+            integer_encoder = cain.types.numbers.recommended_size(length)
+            type_of = types.__getitem__
+    elif _uses(datatype, cain.types.Object):
+        plan = []
+
+        def validate_bitmaps(value: bytes, *args) -> bytes:
+            types, fields_processed, rest = datatype._validate_bitmaps(value, *args)
+            plan[:] = [types, fields_processed]
+            return rest
+
+        yield from _step(cursor, validate_bitmaps, *type_args)
+        types, processed = plan
+        length = len(types)
+        integer_encoder = cain.types.numbers.recommended_size(length)
+        keys = [key for key, _, _ in types]
+        element_types = [(current_type, current_args) for _, current_type, current_args in types]
+        type_of = element_types.__getitem__
+    else:
+        yield from _step(cursor, datatype._validate, *type_args)
+        return
+
+    # The redundancy table
+    redundancy_count = yield from _integer(cursor, integer_encoder, type_args)
+    for _ in range(redundancy_count):
+        indices = []
+        indices_count = yield from _integer(cursor, integer_encoder, type_args)
+        if indices_count == 0:
+            raise errors.ValidationError(datatype, "A repeated value should appear at least once", cursor.remaining)
+        for _ in range(indices_count):
+            remaining = cursor.remaining
+            index = yield from _integer(cursor, integer_encoder, type_args)
+            register_index(datatype, index, length, processed, remaining)
+            indices.append(index)
+        yield from _step(cursor, validate_repeated, indices, type_of, keys)
+
+    for index in range(length):
+        if index in processed:
+            continue
+        current_type, current_args = type_of(index)
+        try:
+            yield from _validation(cursor, current_type, current_args)
+        except errors.ValidationError as err:
+            err.path.insert(0, keys[index] if keys else index)
+            raise
+
+
+class Decoder:
+    """
+    Decodes a stream of values (like the messages received on a socket) from chunks of any size.
+
+    The data is given with `feed` as it arrives, and every value completed by a chunk is returned.
+    A value split between chunks (even in the middle of a number, a string or a length) is kept
+    until the rest of it is given: its validation starts again from the element which was cut
+    (for `Array`, `Set`, `Tuple` and `Object` values), never from the start of the value or the values before it.
+
+    Parameters
+    ----------
+    schema: type[Datatype] | Datatype | type
+        The schema of each value
+    intern: bool | Interner, default = False
+        If the repeated immutable values should be shared. Refer to `cain.loads` for more information.
+    auto_length: bool, default = False
+        If the lengths of every `Binary`, `Array`, `Set` and `Tuple` value are variable length integers.
+    into: type | None, default = None
+        If provided, the objects are decoded straight into this class. Refer to `cain.loads` for more information.
+    fields: Iterable[str] | None, default = None
+        The only fields to decode in the objects. Refer to `cain.loads` for more information.
+
+    Example
+    -------
+    >>> decoder = Decoder(str)
+    >>> decoder.feed(b"Hello\x00wor")
+    ['Hello']
+    >>> decoder.feed(b"ld\x00")
+    ['world']
+    """
+
+    def __init__(self,
+                 schema: "cain.cain.Schema",
+                 intern: typing.Union[bool, Interner] = False,
+                 auto_length: bool = False,
+                 into: typing.Optional[typing.Any] = None,
+                 fields: typing.Optional[typing.Iterable[str]] = None) -> None:
+        self.datatype, type_args = cain.types.retrieve_type(schema)
+        self.type_args = [*self.datatype.__args__, *type_args]
+        self.decoding_context = _decoding_options(schema, intern, auto_length, into, fields)
+        # The received data which is not decoded yet is `_buffer[_start:_end]` (the buffer is never resized in place)
+        self._buffer = bytearray()
+        self._start = 0
+        self._end = 0
+        # The validation of the value being received, resumed with each chunk
+        self._cursor = _Cursor()
+        self._validation: typing.Optional[typing.Generator[None, None, None]] = None
+
+    @property
+    def pending(self) -> int:
+        """The number of bytes received which are not decoded yet"""
+        return self._end - self._start
+
+    def _append(self, data: bytes) -> None:
+        """Adds `data` after the pending data, moving it to a larger buffer if needed"""
+        size = len(data)
+        if self._end + size > len(self._buffer):
+            pending = self.pending
+            buffer = bytearray(2 * (pending + size))
+            buffer[:pending] = self._buffer[self._start:self._end]
+            self._buffer, self._start, self._end = buffer, 0, pending
+        self._buffer[self._end:self._end + size] = data
+        self._end += size
+
+    def _next(self) -> typing.Optional[int]:
+        """Resumes the validation of the next value, returning its size or `None` if it is not complete yet"""
+        if self._validation is None:
+            self._cursor.offset = 0
+            self._validation = _validation(self._cursor, self.datatype, self.type_args)
+        with memoryview(self._buffer) as view, context.restore_decoding(self.decoding_context):
+            self._cursor.view = view[self._start:self._end]
+            try:
+                next(self._validation)
+                return None
+            except StopIteration:
+                self._validation = None
+                return self._cursor.offset
+            except BaseException:
+                self._validation = None
+                raise
+            finally:
+                self._cursor.view.release()
+                self._cursor.view = None
+
+    def feed(self, data: bytes) -> typing.List[typing.Any]:
+        """
+        Adds the received data and decodes the values it completes
+
+        Parameters
+        ----------
+        data: bytes
+            The new chunk of data
+
+        Returns
+        -------
+        list[Any]
+            The values completed by this chunk, in order (empty if none is)
+
+        Raises
+        ------
+        ValidationError
+            If a value is not well-formed (the stream can't be decoded any further)
+        """
+        self._append(data)
+        results = []
+        while self._start < self._end:
+            size = self._next()
+            if size is None:
+                break
+            if size == 0:
+                raise errors.DecodingError(self.datatype, "The values of the stream can't be empty")
+            end = self._start + size
+            results.append(_decode_value(bytes(self._buffer[self._start:end]), self.datatype, self.type_args,
+                                         self.decoding_context))
+            self._start = end
+        if self._start == self._end:
+            self._start = self._end = 0
+            if len(self._buffer) > DEFAULT_BUFFER_SIZE:
+                # Gives back the memory used by a large value
+                self._buffer = bytearray()
+        return results
+
+    def close(self) -> None:
+        """
+        Checks that the stream did not end in the middle of a value
+
+        Raises
+        ------
+        TruncatedDataError
+            If some data is left without forming a whole value
+        """
+        if self.pending:
+            raise errors.TruncatedDataError(self.datatype,
+                                            f"The stream ended in the middle of a value ({self.pending} bytes left)")
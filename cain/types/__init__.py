@@ -13,16 +13,19 @@ from .strings import String
 from .numbers import Number, Int, Float, Double, Decimal
 from .numbers import Complex, DoubleComplex
 from .numbers import SignedInt, UnsignedInt, Int8, UInt8, Int16, UInt16, Int32, UInt32, Int64, UInt64
+from .numbers import VarInt, UnsignedVarInt
 from .nonetype import NoneType
 from .optionals import Optional
 from .unions import Union
 from .booleans import Boolean, Bool
 from .binary import Binary
+from .compressed import Compressed
 from .arrays import Array, List
 from .sets import Set
 from .tuples import Tuple
 from .ranges import Range
 from .objects import Object, Dict
+from .tables import Table
 from .enums import Enum
 
 
@@ -22,6 +22,8 @@ b'\x00Hello\x00\x00\x01'
 b'\x00Hello\x00\x00\x01Yay\x00'
 >>> Array[str, int].encode(["Hello", 1, "Yay"], str)
 b'\x00Hello\x00\x00\x01Yay\x00'
+>>> Array[int, "auto"].encode([1, 2, 3])
+b'\x03\x00\x00\x01\x00\x02\x00\x03'
 
 Structure
 ---------
@@ -33,6 +35,10 @@ Example: [1, 2, 3]
 Array     Number     Rest of data
 Length    of repeats
 
+Note: The length, the number of repeats and the indices are 2 bytes long by default (`long` and `short` change it).
+      With the `auto` argument (or `auto_length` option), they are variable length integers (1 byte up to 127),
+      which removes any limit on the number of elements.
+
 Case 2: With repetition in the data
 Example: ["Hello", "Hi", "Hello", "Hey"]
 
@@ -46,7 +52,7 @@ import typing
 import typing_extensions
 
 import cain.types
-from cain import errors
+from cain import context, errors
 from cain.model import Datatype
 
 T = typing_extensions.TypeVarTuple("T")
@@ -56,6 +62,15 @@ class Array(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
     """
     Handles the encoding and decoding of arrays.
 
+    Parameters
+    ----------
+    long
+        Adds 1 byte to the integers storing the length and indices (can be used multiple times)
+    short
+        Removes 1 byte from the integers storing the length and indices (can be used multiple times)
+    auto
+        Stores the length and indices as variable length integers, without any limit on the number of elements.
+
     Example
     -------
     >>> Array[int].encode([1, 2, 3])
@@ -92,11 +107,13 @@ class Array(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
             # Case 1: Only a single type is given.
             # All of the elements will be of the same type.
             # Example: list[int] with [1, 2, 3]
-            result = cain.types.numbers.UnsignedInt._encode(length, *args)
-            types = [types[0]] * length
-
             # We are working with length and indices, which can't be negative.
-            integer_encoder = cain.types.numbers.UnsignedInt
+            if cain.types.numbers.auto_length(args, context.current_encoding()):
+                integer_encoder = cain.types.numbers.UnsignedVarInt
+            else:
+                integer_encoder = cain.types.numbers.UnsignedInt
+            result = integer_encoder._encode(length, *args)
+            types = [types[0]] * length
         else:
             # Case 2: Multiple types are given.
             # The number of types should match the number of elements.
@@ -164,12 +181,17 @@ class Array(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
 
         results = []
 
+        decoding_context = context.current_decoding()
+
         if types_length == 1:
             # Case 1
             # Refer to the explanation in `_encode`
-            length, value = cain.types.numbers.UnsignedInt._decode(value, *args)
+            if cain.types.numbers.auto_length(args, decoding_context):
+                integer_encoder = cain.types.numbers.UnsignedVarInt
+            else:
+                integer_encoder = cain.types.numbers.UnsignedInt
+            length, value = integer_encoder._decode(value, *args)
             types = [types[0]] * length
-            integer_encoder = cain.types.numbers.UnsignedInt
         else:
             # Case 2
             # Refer to the explanation in `_encode`
@@ -183,6 +205,8 @@ class Array(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
 
         processed_indices = []
 
+        interner = decoding_context.interner if decoding_context else None
+
         # Getting the number of repeated items
         redundancy_header_length, value = integer_encoder._decode(value, *args)
 
@@ -206,6 +230,8 @@ class Array(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
             current_type, type_args = types[index]
             # Decoding the data for the first index
             data, after_decoding = current_type._decode(value, *type_args)
+            if interner is not None:
+                data = interner(data)
             results[index] = data
 
             # Decoding the data for the rest of the indices
@@ -217,6 +243,8 @@ class Array(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
                 # We already removed the bytes corresponding to the data the first time,
                 # so we don't need to remove it again.
                 data, _ = current_type._decode(value, *type_args)
+                if interner is not None:
+                    data = interner(data)
                 results[index] = data
 
             value = after_decoding
@@ -227,8 +255,217 @@ class Array(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
                 continue
             # If not already processed, then decode the actual value and add it
             data, value = current_type._decode(value, *type_args)
+            if interner is not None:
+                data = interner(data)
             results[index] = data
 
         return results, value
 
+    @classmethod
+    def _locate(cls, value: bytes, *args) -> typing.Tuple[typing.List[typing.Tuple[Datatype, typing.List]],
+                                                          typing.List[int],
+                                                          bytes]:
+        """
+        Finds where each element starts, without decoding them (used by the lazy views)
+
+        Parameters
+        ----------
+        value: bytes
+            The data containing the array
+        *args
+            The type arguments
+
+        Returns
+        -------
+        tuple[list[tuple[Datatype, list]], list[int], bytes]
+            The datatype and type arguments of each element, the position of each element
+            in `value` (repeated elements share the same position) and the rest of the data
+        """
+        types = cls.process_types_args(args)
+        types_length = len(types)
+        size = len(value)
+
+        if types_length == 1:
+            # Case 1
+            if cain.types.numbers.auto_length(args, context.current_decoding()):
+                integer_encoder = cain.types.numbers.UnsignedVarInt
+            else:
+                integer_encoder = cain.types.numbers.UnsignedInt
+            length, value = integer_encoder._decode(value, *args)
+            types = [types[0]] * length
+        else:
+            # Case 2
+            length = types_length
+            integer_encoder = cain.types.numbers.recommended_size(length)
+
+        positions = [None] * length
+
+        redundancy_header_length, value = integer_encoder._decode(value, *args)
+        for _ in range(redundancy_header_length):
+            redundancy_count, value = integer_encoder._decode(value, *args)
+            current_indices = []
+            for _ in range(redundancy_count):
+                index, value = integer_encoder._decode(value, *args)
+                current_indices.append(index)
+            # every index points to the same data
+            for index in current_indices:
+                positions[index] = size - len(value)
+            current_type, type_args = types[current_indices[0]]
+            value = current_type._skip(value, *type_args)
+
+        for index, (current_type, type_args) in enumerate(types):
+            if positions[index] is not None:
+                continue
+            positions[index] = size - len(value)
+            value = current_type._skip(value, *type_args)
+
+        return types, positions, value
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        _, _, value = cls._locate(value, *args)
+        return value
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        types = cls.process_types_args(args)
+        types_length = len(types)
+
+        if types_length == 1:
+            # Case 1
+            if cain.types.numbers.auto_length(args, context.current_decoding()):
+                integer_encoder = cain.types.numbers.UnsignedVarInt
+            else:
+                integer_encoder = cain.types.numbers.UnsignedInt
+            rest = integer_encoder._validate(value, *args)
+            length, _ = integer_encoder._decode(value, *args)
+            value = rest
+            element_type = types[0]
+            if length > len(value) and not _empty_element(*element_type):
+                # Each element needs at least one byte (the length can't be trusted before checking this)
+                raise errors.TruncatedDataError(cls, f"The array has {length} elements but only {len(value)} bytes are left",
+                                                len(value))
+
+            def type_of(index: int) -> typing.Tuple[typing.Type[Datatype], typing.List]:
+                return element_type
+        else:
+            # Case 2
+            length = types_length
+            integer_encoder = cain.types.numbers.recommended_size(length)
+            type_of = types.__getitem__
+
+        processed = set()
+        value = validate_redundancies(cls, value, length, type_of, processed, integer_encoder, args)
+
+        for index in range(length):
+            if index in processed:
+                continue
+            current_type, type_args = type_of(index)
+            value = validate_element(value, index, current_type, type_args)
+
+        return value
+
 List = Array
+
+
+def _empty_element(datatype: typing.Type[Datatype], type_args: typing.List) -> bool:
+    """Returns True if a value of `datatype` can be encoded without any byte"""
+    try:
+        datatype._validate(b"", *type_args)
+    except errors.ValidationError:
+        return False
+    return True
+
+
+def _read_integer(integer_encoder: typing.Type[Datatype], value: bytes, args) -> typing.Tuple[int, bytes]:
+    """Decodes one of the integers of the redundancy table, checking that it is not truncated"""
+    rest = integer_encoder._validate(value, *args)
+    result, _ = integer_encoder._decode(value, *args)
+    return result, rest
+
+
+def validate_element(value: bytes, key: typing.Union[str, int],
+                      datatype: typing.Type[Datatype], type_args: typing.List) -> bytes:
+    """Validates the element `key`, adding it to the path of the error if it is not well-formed"""
+    try:
+        return datatype._validate(value, *type_args)
+    except errors.ValidationError as err:
+        err.path.insert(0, key)
+        raise
+
+
+def validate_redundancies(cls: typing.Type[Datatype], value: bytes, length: int,
+                           type_of: typing.Callable[[int], typing.Tuple[typing.Type[Datatype], typing.List]],
+                           processed: typing.Set[int], integer_encoder: typing.Type[Datatype], args,
+                           keys: typing.Optional[typing.List[str]] = None) -> bytes:
+    """
+    Validates the redundancy table at the start of `value` (shared by `Array` and `Object`)
+
+    Parameters
+    ----------
+    cls: type[Datatype]
+        The datatype being validated
+    value: bytes
+        The data starting with the redundancy table
+    length: int
+        The number of elements
+    type_of: Callable[[int], tuple[type[Datatype], list]]
+        Returns the datatype and type arguments of the element at the given index
+    processed: set[int]
+        The elements which are not expected in the table (not written), updated with the elements found in it
+    integer_encoder: type[Datatype]
+        The datatype of the integers in the table
+    args
+        The type arguments
+    keys: list[str] | None, default = None
+        The keys of the elements, used in the error paths (their indices are used if not provided)
+
+    Returns
+    -------
+    bytes
+        The rest of the data
+
+    Raises
+    ------
+    ValidationError
+        If the table is not well-formed
+    """
+    redundancy_header_length, value = _read_integer(integer_encoder, value, args)
+    for _ in range(redundancy_header_length):
+        redundancy_count, value = _read_integer(integer_encoder, value, args)
+        if redundancy_count == 0:
+            raise errors.ValidationError(cls, "A repeated value should appear at least once", len(value))
+        current_indices = []
+        for _ in range(redundancy_count):
+            remaining = len(value)
+            index, value = _read_integer(integer_encoder, value, args)
+            register_index(cls, index, length, processed, remaining)
+            current_indices.append(index)
+        value = validate_repeated(value, current_indices, type_of, keys)
+    return value
+
+
+def register_index(cls: typing.Type[Datatype], index: int, length: int, processed: typing.Set[int], remaining: int) -> None:
+    """Adds an index of the redundancy table to `processed`, checking that it is valid"""
+    if index >= length:
+        raise errors.ValidationError(cls, f"The index {index} is out of range ({length} elements)", remaining)
+    if index in processed:
+        raise errors.ValidationError(cls, f"The element {index} is already given", remaining)
+    processed.add(index)
+
+
+def validate_repeated(value: bytes, indices: typing.List[int],
+                      type_of: typing.Callable[[int], typing.Tuple[typing.Type[Datatype], typing.List]],
+                      keys: typing.Optional[typing.List[str]] = None) -> bytes:
+    """Validates the data of a repeated element, using the datatype of each of its indices"""
+    rest = None
+    checked = []
+    for index in indices:
+        current_type, type_args = type_of(index)
+        if any(current_type is checked_type and type_args == checked_args for checked_type, checked_args in checked):
+            continue
+        checked.append((current_type, type_args))
+        after = validate_element(value, keys[index] if keys else index, current_type, type_args)
+        if rest is None:
+            rest = after
+    return rest
@@ -17,6 +17,39 @@ b'Hello world'
 b'\x00\x00\x00\x00\x0bHello world'
 >>> Binary.decode(b"\x00\x00\x00\x00\x0bHello world", "long")
 b'Hello world'
+>>> Binary.encode(b"Hello world", "auto")
+b'\x0bHello world'
+
+Zero-copy decoding
+------------------
+When decoding with `cain.loads(..., zero_copy=True)`, the blobs are returned as `memoryview` slices
+of the decoded buffer instead of `bytes` copies.
+Those views keep the original buffer alive and reflect any change made to it afterwards:
+a `bytearray` can't be resized and a `mmap` can't be closed while a view on it exists (`BufferError`).
+Use `bytes(view)` to get an independent copy.
+
+Streaming
+---------
+Instead of `bytes`, a `Binary` value can be a readable file-like object (its remaining content is used)
+or a `(size, chunks)` tuple, where `chunks` is an iterable of bytes-like objects giving exactly `size` bytes.
+When encoding with `cain.dump`, those sources are written to the file in chunks without being read in memory.
+They are read in memory when using `cain.dumps`.
+
+On the decoding side, the `sink` parameter of `cain.load` and `cain.loads` receives the size of each blob
+and an iterator over its chunks, and returns the value to use instead of the blob.
+
+>>> import io
+>>> import cain
+>>> with open("test.cain", "wb") as handler, open("model.bin", "rb") as model:
+...     cain.dump({"name": "model", "weights": model}, handler, Object[{"name": str, "weights": bytes}])
+>>> def save(size, chunks):
+...     with open("weights.bin", "wb") as output:
+...         for chunk in chunks:
+...             output.write(chunk)
+...     return "weights.bin"
+>>> with open("test.cain", "rb") as handler:
+...     cain.load(handler, Object[{"name": str, "weights": bytes}], sink=save)
+{'name': 'model', 'weights': 'weights.bin'}
 
 Structure
 ---------
@@ -24,14 +57,22 @@ Structure
 ~~~~~~~~~~~~~~~~ ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
   size of blob                   blob itself
 """
+import io
+import os
 import typing
 import typing_extensions
 
+from cain import context, errors
 from cain.model import Datatype
+from cain.types.numbers import UnsignedVarInt, auto_length
 
 # Type Arguments
 long = LONG = Long = "long"
 short = SHORT = Short = "short"
+auto = AUTO = Auto = "auto"
+
+# The size of the chunks read from and given to the streams
+CHUNK_SIZE = 65536
 
 T = typing_extensions.TypeVarTuple("T")
 
@@ -48,12 +89,15 @@ class Binary(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
         Increases the size of the integer used to store the binary size by 1 byte.
     long
         Decreases the size of the integer used to store the binary size by 1 byte.
+    auto
+        Stores the binary size as a variable length integer (1 byte for up to 127 bytes, 2 bytes for up to 16,383 bytes, etc.)
 
     Example
     -------
     >>> class A(Object):
     ...     a: Binary[LONG] # Will be able to take binary blobs as big as 1,099,511,627,776 bytes (~1100 GB) long.
     ...     b: Binary[SHORT] # Will be able to take binary blobs as big as 16,777,216 bytes (~17 MB) long.
+    ...     c: Binary[AUTO] # Will only use the bytes needed to store the size, without any limit.
     >>> Binary.encode(b"Hello world")
     b'\x00\x00\x00\x0bHello world'
     >>> Binary.decode(b"\x00\x00\x00\x0bHello world")
@@ -94,14 +138,149 @@ class Binary(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
                 size -= 1
         return size
 
+    @staticmethod
+    def open_source(value: typing.Union[typing.BinaryIO, typing.Tuple[int, typing.Iterable[bytes]]]) -> typing.Tuple[int, typing.Iterable[bytes]]:
+        """
+        Returns the size and the chunks of a streamed source
+
+        Parameters
+        ----------
+        value: BinaryIO | tuple[int, Iterable[bytes]]
+            A readable file-like object or a `(size, chunks)` tuple
+
+        Returns
+        -------
+        tuple[int, Iterable[bytes]]
+            The number of bytes which will be read and an iterable over the chunks of data
+        """
+        if not hasattr(value, "read"):
+            size, chunks = value
+            return size, chunks
+
+        try:
+            size = os.fstat(value.fileno()).st_size - value.tell()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            position = value.tell()
+            size = value.seek(0, io.SEEK_END) - position
+            value.seek(position)
+
+        def read_chunks():
+            remaining = size
+            while remaining > 0:
+                chunk = value.read(min(remaining, CHUNK_SIZE))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+        return size, read_chunks()
+
+    @classmethod
+    def encode_length(cls, length: int, args) -> bytes:
+        """
+        Encodes the size of a blob
+
+        Parameters
+        ----------
+        length: int
+            The size of the blob
+        args
+            The type arguments
+
+        Returns
+        -------
+        bytes
+            The encoded size
+        """
+        if auto_length(args, context.current_encoding()):
+            return UnsignedVarInt._encode(length)
+        return length.to_bytes(cls.process_args(args), signed=False, byteorder="big")
+
     @classmethod
     def _encode(cls, value: bytes, *args):
-        len_size = cls.process_args(args)
+        encoding_context = context.current_encoding()
+        streaming = encoding_context is not None and encoding_context.streaming
+        if isinstance(value, tuple) or hasattr(value, "read"):
+            # Streamed source
+            size, chunks = cls.open_source(value)
+            if streaming:
+                # The data will be written by the encoding context
+                return cls.encode_length(size, args) + encoding_context.defer(size, chunks)
+            value = b"".join(chunks)
+            if len(value) != size:
+                raise errors.EncodingError(cls, f"A streamed source gave {len(value)} bytes instead of the announced {size} bytes")
+        elif streaming and encoding_context.defer_size is not None and len(value) >= encoding_context.defer_size:
+            # The blob is given as is when writing the data, instead of being copied into it
+            # (the equal `bytes` values, and the other buffers given more than once, share their placeholder)
+            key = value if isinstance(value, bytes) else id(value)
+            return cls.encode_length(len(value), args) + encoding_context.defer(len(value), (value,), key=key)
         # length of blob + blob itself
-        return len(value).to_bytes(len_size, signed=False, byteorder="big") + value
+        return cls.encode_length(len(value), args) + value
+
+    @classmethod
+    def split(cls, value: bytes, *args) -> typing.Tuple[bytes, bytes]:
+        """
+        Splits the encoded blob from the rest of the data, without any further processing
+
+        Note: Slices of `value` are returned, which means that they are views if `value` is a `memoryview`.
+
+        Parameters
+        ----------
+        value: bytes
+            The data to decode
+        *args
+            The type arguments
+
+        Returns
+        -------
+        tuple[bytes, bytes]
+            The blob and the rest of the data
+
+        Raises
+        ------
+        TruncatedDataError
+            If the blob is truncated
+        """
+        if auto_length(args, context.current_decoding()):
+            blob_size, start = UnsignedVarInt.read(value)
+        else:
+            start = cls.process_args(args)
+            if len(value) < start:
+                raise errors.TruncatedDataError(cls, "The length of the binary blob is truncated")
+            blob_size = int.from_bytes(value[:start], signed=False, byteorder="big")  # getting the length first
+        blob = value[start:start + blob_size]  # decoding the appropriate length
+        if len(blob) != blob_size:
+            raise errors.TruncatedDataError(cls, f"The binary blob is truncated ({len(blob)} bytes out of {blob_size})")
+        return blob, value[start + blob_size:]
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        _, value = cls.split(value, *args)
+        return value
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        try:
+            _, rest = cls.split(value, *args)
+        except errors.TruncatedDataError as err:
+            raise errors.TruncatedDataError(cls, str(err), len(value)) from err
+        except errors.DecodingError as err:
+            raise errors.ValidationError(cls, str(err), len(value)) from err
+        return rest
 
     @classmethod
     def _decode(cls, value: bytes, *args):
-        len_size = cls.process_args(args)
-        blob_size = int.from_bytes(value[:len_size], signed=False, byteorder="big")  # getting the length first
-        return value[len_size:len_size + blob_size], value[len_size + blob_size:]  # decoding the appropriate length
+        blob, value = cls.split(value, *args)
+
+        decoding_context = context.current_decoding()
+        if decoding_context and decoding_context.sink:
+            view = memoryview(blob)
+            chunks = (view[index:index + CHUNK_SIZE] for index in range(0, len(view), CHUNK_SIZE))
+            return decoding_context.sink(len(view), chunks), value
+
+        if blob.__class__ is not bytes:
+            # decoding from another bytes-like object (`bytearray`, `memoryview`, `mmap`...)
+            if not decoding_context or not decoding_context.zero_copy or not isinstance(blob, memoryview):
+                # the view should not outlive the decoding call unless explicitly asked
+                blob = bytes(blob)
+        return blob, value
@@ -45,11 +45,25 @@ class Boolean(Datatype):
     @classmethod
     def _decode(cls, value: bytes, *args):
         # could allow for booleans as integers or strings in `args` ?
-        if value.startswith(b'\x00'):
+        # Slicing then comparing works with any bytes-like object (including memoryviews)
+        marker = value[:1]
+        if marker == b'\x00':
             return False, value[1:]
-        elif value.startswith(b'\x01'):
+        elif marker == b'\x01':
             return True, value[1:]
         raise errors.DecodingError(cls, "The given value does not seem to be a boolean")
 
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        return value[1:]
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        if not value:
+            raise errors.TruncatedDataError(cls, "The boolean is missing")
+        if value[:1] not in (b'\x00', b'\x01'):
+            raise errors.ValidationError(cls, "The given value does not seem to be a boolean", len(value))
+        return value[1:]
+
 
 Bool = Boolean
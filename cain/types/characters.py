@@ -33,6 +33,7 @@ Chararacter length  |        UTF-8 octet sequence
 The `x` has the actual code point.
 """
 
+from cain import errors
 from cain.model import Datatype
 
 
@@ -59,7 +60,7 @@ class Character(Datatype):
     def _decode(cls, value: bytes, *args):
         for i in range(1, 5):
             try:
-                return value[:i].decode("utf-8"), value[i:]
+                return str(value[:i], "utf-8"), value[i:]
             except UnicodeDecodeError:
                 continue
 
@@ -78,4 +79,37 @@ class Character(Datatype):
         # before giving the codepoints and `10` at the start of each byte.
         # At least, we might be able to optimize to fit more characters, but it would require making
         # another standard.
-        return value[:bytes_length].decode("utf-8"), value[bytes_length:]
+        return str(value[:bytes_length], "utf-8"), value[bytes_length:]
+
+    @staticmethod
+    def _length(value: bytes) -> int:
+        """Returns the number of bytes of the character starting at `value`, from its first byte (0 if it can't start a character)"""
+        first = value[0]
+        if first < 0x80:
+            return 1
+        if first >> 5 == 0b110:
+            return 2
+        if first >> 4 == 0b1110:
+            return 3
+        if first >> 3 == 0b11110:
+            return 4
+        return 0
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        return value[max(cls._length(value), 1):]
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        if not value:
+            raise errors.TruncatedDataError(cls, "The character is missing")
+        length = cls._length(value)
+        if not length:
+            raise errors.ValidationError(cls, "The given value does not start a UTF-8 character", len(value))
+        if len(value) < length:
+            raise errors.TruncatedDataError(cls, f"The character is truncated ({len(value)} bytes out of {length})", len(value))
+        try:
+            str(value[:length], "utf-8")
+        except UnicodeDecodeError as err:
+            raise errors.ValidationError(cls, str(err), len(value)) from err
+        return value[length:]
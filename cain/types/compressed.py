@@ -0,0 +1,176 @@
+"""
+compressed.py
+
+Defines the Compressed datatype, which is used to compress the encoded value of another datatype.
+
+Example
+-------
+>>> from cain.types import Compressed
+>>> Compressed[str, "zlib", 9].encode("Hello world" * 100)
+b'\x00\x00\x00\x1ex\xda\xf3H\xcd\xc9\xc9W(\xcf/\xcaI\xf1\x18e\x8e2G\x99\xa3Lr\x99\x0c\x00!e\xa7\x80'
+>>> Compressed[str, "zlib", 9].decode(b'\x00\x00\x00\x1ex\xda\xf3H\xcd\xc9\xc9W(\xcf/\xcaI\xf1\x18e\x8e2G\x99\xa3Lr\x99\x0c\x00!e\xa7\x80')
+'Hello worldHello world...'
+>>> class Article(Object):
+...     title: str
+...     content: Compressed[str, LZMA] # only this field pays the compression cost
+
+Note: The compressors come from the standard library (`zlib`, `lzma` and `bz2`).
+      When encoding with `cain.dump`, streamed `Binary` sources inside a `Compressed` value are read in memory.
+
+Structure
+---------
+The inner value is encoded following the given schema, compressed, then encoded as a `Binary` blob.
+
+\x00\x00\x00\x1e x\xda\xf3H\xcd\xc9\xc9W(\xcf/\xcaI\xf1\x18e\x8e2G\x99\xa3Lr\x99\x0c\x00!e\xa7\x80
+~~~~~~~~~~~~~~~~ ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+size of the       compressed encoded value
+compressed data
+
+Refer to `Binary` for more information.
+"""
+import bz2
+import lzma
+import typing
+import zlib
+
+import typing_extensions
+
+import cain.types
+from cain import context, errors
+from cain.model import Datatype
+from cain.types import Binary
+
+# Type Arguments
+ZLIB = Zlib = "zlib"
+LZMA = Lzma = "lzma"
+BZ2 = Bz2 = "bz2"
+
+T = typing_extensions.TypeVarTuple("T")
+
+
+def _compress_zlib(data: bytes, level: typing.Optional[int]) -> bytes:
+    return zlib.compress(data, -1 if level is None else level)
+
+
+def _compress_lzma(data: bytes, level: typing.Optional[int]) -> bytes:
+    return lzma.compress(data, preset=level)
+
+
+def _compress_bz2(data: bytes, level: typing.Optional[int]) -> bytes:
+    return bz2.compress(data, 9 if level is None else level)
+
+
+CODECS: typing.Dict[str, typing.Tuple[typing.Callable[[bytes, typing.Optional[int]], bytes],
+                                      typing.Callable[[bytes], bytes]]] = {
+    ZLIB: (_compress_zlib, zlib.decompress),
+    LZMA: (_compress_lzma, lzma.decompress),
+    BZ2: (_compress_bz2, bz2.decompress)
+}
+"""The available codecs, with their compression and decompression functions"""
+
+
+class Compressed(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
+    """
+    Handles the compression of the encoded value of another datatype.
+
+    Parameters
+    ----------
+    schema
+        The schema of the compressed value
+    ZLIB, default
+        Compresses using `zlib`
+    LZMA
+        Compresses using `lzma`
+    BZ2
+        Compresses using `bz2`
+    int
+        The compression level (or preset for `lzma`), the codec default is used if not provided.
+
+    Note: The other type arguments are given to the `Binary` datatype holding the compressed data.
+
+    Example
+    -------
+    >>> Compressed[str, "zlib", 9].encode("Hello world" * 100)
+    b'\x00\x00\x00\x1ex\xda\xf3H\xcd\xc9\xc9W(\xcf/\xcaI\xf1\x18e\x8e2G\x99\xa3Lr\x99\x0c\x00!e\xa7\x80'
+    >>> Compressed[str, "zlib", 9].decode(b'\x00\x00\x00\x1ex\xda\xf3H\xcd\xc9\xc9W(\xcf/\xcaI\xf1\x18e\x8e2G\x99\xa3Lr\x99\x0c\x00!e\xa7\x80')
+    'Hello worldHello world...'
+    """
+
+    @staticmethod
+    def process_args(args):
+        """
+        Returns the schema, codec, level and `Binary` arguments from the given type arguments
+
+        Example
+        -------
+        >>> Compressed.process_args((str, "lzma", 6, "long"))
+        (<class 'str'>, 'lzma', 6, ['long'])
+        >>> Compressed.process_args((str,))
+        (<class 'str'>, 'zlib', None, [])
+        """
+        schema = None
+        codec = ZLIB
+        level = None
+        binary_args = []
+        for arg in args:
+            if isinstance(arg, str):
+                if arg in CODECS:
+                    codec = arg
+                else:
+                    binary_args.append(arg)
+            elif isinstance(arg, int) and not isinstance(arg, bool):
+                level = arg
+            elif schema is None:
+                schema = arg
+        return schema, codec, level, binary_args
+
+    @classmethod
+    def _encode(cls, value: typing.Any, *args):
+        schema, codec, level, binary_args = cls.process_args(args)
+        if schema is None:
+            raise errors.EncodingError(cls, "No schema was given for the compressed value")
+        datatype, type_args = cain.types.retrieve_type(schema)
+        compress, _ = CODECS[codec]
+
+        encoding_context = context.current_encoding()
+        if encoding_context and encoding_context.streaming:
+            # The placeholders of the streamed sources can't be replaced once compressed
+            with context.encoding(streaming=False, auto_length=encoding_context.auto_length):
+                data = datatype._encode(value, *type_args)
+        else:
+            data = datatype._encode(value, *type_args)
+
+        return Binary._encode(compress(data, level), *binary_args)
+
+    @classmethod
+    def _decode(cls, value: bytes, *args):
+        schema, codec, _, binary_args = cls.process_args(args)
+        if schema is None:
+            raise errors.DecodingError(cls, "No schema was given for the compressed value")
+        datatype, type_args = cain.types.retrieve_type(schema)
+        _, decompress = CODECS[codec]
+
+        data, value = Binary.split(value, *binary_args)
+        try:
+            data = decompress(data)
+        except (zlib.error, lzma.LZMAError, OSError, ValueError) as err:
+            raise errors.DecodingError(cls, f"The compressed data could not be decompressed with `{codec}`") from err
+        result, _ = datatype._decode(data, *type_args)
+        return result, value
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        _, _, _, binary_args = cls.process_args(args)
+        return Binary._skip(value, *binary_args)
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        # Only the blob is checked: the compressed value would need to be decompressed
+        _, _, _, binary_args = cls.process_args(args)
+        try:
+            _, rest = Binary.split(value, *binary_args)
+        except errors.TruncatedDataError as err:
+            raise errors.TruncatedDataError(cls, str(err), len(value)) from err
+        except errors.DecodingError as err:
+            raise errors.ValidationError(cls, str(err), len(value)) from err
+        return rest
@@ -19,6 +19,7 @@ Note: The type arguments are sorted.
 import typing
 
 import cain.types.numbers as numbers
+from cain import errors
 from cain.model import Datatype
 
 
@@ -51,3 +52,16 @@ class Enum(Datatype):
         int_encoder = numbers.recommended_size(len(args))
         arg_index, value = int_encoder._decode(value, *args)
         return args[arg_index], value
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        return numbers.recommended_size(len(args))._skip(value)
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        int_encoder = numbers.recommended_size(len(args))
+        rest = int_encoder._validate(value)
+        arg_index, _ = int_encoder._decode(value)
+        if arg_index >= len(args):
+            raise errors.ValidationError(cls, f"The index {arg_index} is out of the enum ({len(args)} values)", len(value))
+        return rest
@@ -46,3 +46,11 @@ class NoneType(Datatype):
     @classmethod
     def _decode(cls, value: bytes, *args):
         return None, value
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        return value
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        return value
@@ -42,6 +42,10 @@ the `short`, `long`, `signed` and `unsigned` parameters.
 You can also use the different fixed size classes (`Int64`, `UInt32`, etc.)
 to save time on the arguments processing.
 
+Variable length integers (`VarInt` and `UnsignedVarInt`) use as many bytes as needed:
+7 bits per byte, the most significant bit being set on every byte except the last one (LEB128).
+Signed variable length integers are ZigZag encoded so that small negative numbers stay small.
+
 Refer to the different implementations for more information.
 """
 import struct
@@ -49,6 +53,7 @@ import typing
 import typing_extensions
 import decimal
 
+from cain import errors
 from cain.types import String
 from cain.model import Datatype
 
@@ -61,8 +66,18 @@ unsigned = UNSIGNED = Unsigned = "unsigned"
 long = LONG = Long = "long"
 short = SHORT = Short = "short"
 
+auto = AUTO = Auto = "auto"
+
 T = typing_extensions.TypeVarTuple("T")
 
+
+def _check_size(cls: typing.Type[Datatype], value: bytes, size: int) -> bytes:
+    """Returns the rest of `value` after a number of `size` bytes, checking that it is not truncated"""
+    if len(value) < size:
+        raise errors.TruncatedDataError(cls, f"The number is truncated ({len(value)} bytes out of {size})", len(value))
+    return value[size:]
+
+
 # Number parent class
 
 
@@ -93,6 +108,14 @@ class Number(Datatype):
         [val] = struct.unpack('d', value[:8])
         return val, value[8:]
 
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        return value[8:]
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        return _check_size(cls, value, 8)
+
 # FLOATING POINT NUMBERS
 
 
@@ -118,6 +141,14 @@ class Float(Number):
         [val] = struct.unpack('f', value[:4])
         return val, value[4:]
 
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        return value[4:]
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        return _check_size(cls, value, 4)
+
 
 class Double(Number):
     """
@@ -140,6 +171,15 @@ class Decimal(Number):
         result, value = String._decode(value, *args)
         return decimal.Decimal(result), value
 
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        return String._skip(value, *args)
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        # the content of the string needs to be checked
+        return super(Number, cls)._validate(value, *args)
+
 
 class Complex(Number):
     """
@@ -155,6 +195,14 @@ class Complex(Number):
         [real, imag] = struct.unpack('ff', value[:8])
         return complex(real, imag), value[8:]
 
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        return value[8:]
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        return _check_size(cls, value, 8)
+
 
 class DoubleComplex(Number):
     """
@@ -170,6 +218,14 @@ class DoubleComplex(Number):
         [real, imag] = struct.unpack('dd', value[:16])
         return complex(real, imag), value[16:]
 
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        return value[16:]
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        return _check_size(cls, value, 16)
+
 # Integers
 
 
@@ -232,6 +288,16 @@ class Int(Number, typing.Generic[typing_extensions.Unpack[T]]):
         signed, size = cls.process_args(args)
         return int.from_bytes(value[:size], signed=signed, byteorder="big"), value[size:]
 
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        _, size = cls.process_args(args)
+        return value[size:]
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        _, size = cls.process_args(args)
+        return _check_size(cls, value, size)
+
 
 Integer = Int
 
@@ -404,6 +470,157 @@ class UInt64(Int):
 UnsignedInt64 = uint64_t = uint64 = UInt64
 
 
+class UnsignedVarInt(Int):
+    """
+    Represents a variable length unsigned integer
+
+    Note: Numbers below 128 take 1 byte, below 16,384 take 2 bytes, etc. without any upper limit.
+
+    Example
+    -------
+    >>> UnsignedVarInt.encode(3)
+    b'\x03'
+    >>> UnsignedVarInt.encode(300)
+    b'\xac\x02'
+    >>> UnsignedVarInt.decode(b'\xac\x02')
+    300
+    """
+
+    @staticmethod
+    def process_args(args):
+        # the smallest size of an encoded integer
+        return False, 1
+
+    @classmethod
+    def _encode(cls, value: int, *args):
+        value = int(value)
+        if value < 0x80:
+            if value < 0:
+                raise errors.EncodingError(cls, f"A negative number ({value}) can't be encoded as an unsigned integer")
+            return bytes((value,))
+        result = bytearray()
+        while value >= 0x80:
+            result.append((value & 0x7F) | 0x80)
+            value >>= 7
+        result.append(value)
+        return bytes(result)
+
+    @classmethod
+    def read(cls, value: bytes, offset: int = 0) -> typing.Tuple[int, int]:
+        """
+        Reads the integer starting at `offset` in `value`, without slicing it
+
+        Parameters
+        ----------
+        value: bytes
+            The data to read from
+        offset: int, default = 0
+            The position of the integer in `value`
+
+        Returns
+        -------
+        tuple[int, int]
+            The integer and the position right after it
+
+        Raises
+        ------
+        TruncatedDataError
+            If the integer is truncated
+        """
+        result = 0
+        shift = 0
+        length = len(value)
+        while offset < length:
+            byte = value[offset]
+            offset += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, offset
+            shift += 7
+        raise errors.TruncatedDataError(cls, "The variable length integer is truncated")
+
+    @classmethod
+    def _decode(cls, value: bytes, *args):
+        result, offset = cls.read(value)
+        return result, value[offset:]
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        _, offset = cls.read(value)
+        return value[offset:]
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        return super(Number, cls)._validate(value, *args)
+
+
+uvarint = UVarInt = UnsignedVarInt
+
+
+class VarInt(Int):
+    """
+    Represents a variable length signed integer
+
+    Note: Numbers between -64 and 63 take 1 byte, between -8,192 and 8,191 take 2 bytes, etc. without any limit.
+
+    Example
+    -------
+    >>> VarInt.encode(-3)
+    b'\x05'
+    >>> VarInt.encode(300)
+    b'\xd8\x04'
+    >>> VarInt.decode(b'\x05')
+    -3
+    """
+
+    @staticmethod
+    def process_args(args):
+        # the smallest size of an encoded integer
+        return True, 1
+
+    @classmethod
+    def _encode(cls, value: int, *args):
+        value = int(value)
+        # ZigZag encoding: 0, -1, 1, -2, 2... become 0, 1, 2, 3, 4...
+        return UnsignedVarInt._encode(value << 1 if value >= 0 else (-value << 1) - 1)
+
+    @classmethod
+    def _decode(cls, value: bytes, *args):
+        result, offset = UnsignedVarInt.read(value)
+        return (result >> 1) ^ -(result & 1), value[offset:]
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        _, offset = UnsignedVarInt.read(value)
+        return value[offset:]
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        return super(Number, cls)._validate(value, *args)
+
+
+varint = VarInt
+
+
+def auto_length(args, current_context) -> bool:
+    """
+    Returns whether the lengths should be encoded as variable length integers
+
+    Parameters
+    ----------
+    args
+        The type arguments
+    current_context: EncodingContext | DecodingContext | None
+        The current encoding or decoding context
+
+    Returns
+    -------
+    bool
+        If the `auto` argument is given or the `auto_length` option is set for the current call
+    """
+    return AUTO in args or (current_context is not None and current_context.auto_length)
+
+
 def recommended_size(number: int, signed: bool = False) -> typing.Type[Int]:
     """
     Returns the recommended integer encoder for the given number
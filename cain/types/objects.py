@@ -48,11 +48,86 @@ repeats     of indices                 Data
 (n)
 
 Note: Unlike Arrays we don't need to encode the length because it is fixed.
+
+Encoding objects
+----------------
+Any mapping can be encoded (`dict`, `Object` instances, etc.), as well as any object
+having the fields as attributes (dataclasses, classes using `__slots__`, ORM rows, etc.).
+
+A class can also define a `__cain__` method, returning a mapping with the fields to encode.
+
+>>> class User:
+...     def __init__(self, username, favorite_number):
+...         self.username = username
+...         self.favorite_number = favorite_number
+>>> TestObject.encode(User("Anise", 2))
+b'\x00\x00\x00\x02Anise\x00'
+
+Records
+-------
+With the `record` argument, the objects are decoded into a generated `__slots__` class
+(refer to `cain.records`) instead of `Object` instances holding a dictionary.
+
+>>> class User(Object[RECORD]):
+...     username: str
+...     favorite_number: int
+>>> User.decode(b'\x00\x00\x00\x02Anise\x00')
+User(favorite_number=2, username='Anise')
+
+Default values
+--------------
+With the `defaults` argument, the fields equal to their default value (set in the class body) are left out.
+A bitmap, written before anything else, marks them: bit `n` is set if the `n`-th field having a default value
+(in the sorted keys order) is left out.
+
+>>> class Settings(Object[DEFAULTS]):
+...     theme: str = "light"
+...     volume: int = 50
+>>> Settings.encode({"theme": "dark"})
+b'\x02\x00dark\x00'
+>>> Settings.decode(b'\x02\x00dark\x00')
+{'theme': 'dark', 'volume': 50}
+
+Presence bitmap
+---------------
+With the `bitmap` argument, the markers of the `Optional` fields are replaced by a bitmap
+written before the rest of the data, and the `None` values are not written at all.
+Bit `n` (starting from the least significant bit of the first byte) is set if the `n`-th optional field
+(in the sorted keys order) is present.
+
+Example: {"a": None, "b": 2, "c": None} with `a`, `b` and `c` being `Optional[int]`
+
+\x02     \x00\x00   \x00\x02
+~~~~     ~~~~~~~~   ~~~~~~~~~~~
+Bitmap   Number     Rest of data (only `b`, without its marker)
+(010)    of repeats
 """
+import collections.abc
+import copy
+import operator
 import typing
 
 import cain.types
+import cain.types.arrays as arrays
+from cain import context, errors
 from cain.model import Datatype
+from cain.records import Record, make_record
+
+# Type Arguments
+record = RECORD = "record"
+bitmap = BITMAP = "bitmap"
+defaults = DEFAULTS = "defaults"
+
+# The default values which can be shared between the decoded objects
+IMMUTABLE_DEFAULTS = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _default_value(default: typing.Any) -> typing.Any:
+    """Returns the value to give to a field left out because it was equal to `default`"""
+    if default.__class__ in IMMUTABLE_DEFAULTS:
+        return default
+    # The default value set in the class body should never be changed through a decoded object
+    return copy.deepcopy(default)
 
 
 class Object(Datatype):
@@ -80,6 +155,20 @@ class Object(Datatype):
     ...     favorite_number: int
     >>> TestObject2.encode({"name": "Anise", "username": "Anise", "favorite_number": 2})
     b'\x00\x01\x00\x02\x00\x01\x00\x02Anise\x00\x00\x02'
+
+    Parameters
+    ----------
+    record
+        Decodes the objects into a generated `__slots__` class (see `record_class`)
+        instead of `Object` instances, which uses less memory and gives faster attribute access.
+    bitmap
+        Writes the presence of all of the `Optional` fields in a single bitmap instead of
+        a marker byte for each of them. The `None` values then take no space at all.
+    defaults
+        Leaves out the fields equal to their default value (set in the class body),
+        marking them in a bitmap. They are filled back in from the class when decoding.
+
+    Note: The fields having a default value can be missing from the encoded objects.
     """
 
     def __init__(self, value: typing.Optional[dict] = None, *args, **kwargs) -> None:
@@ -100,9 +189,205 @@ class Object(Datatype):
                 raise err from exc
 
     @classmethod
-    def _encode(cls, value: dict, *args):
+    def _plan(cls) -> typing.List[typing.Tuple[str, typing.Type[Datatype], typing.List]]:
+        """
+        Returns the fields of the object, sorted by key, with their datatype and type arguments
+
+        Note: The result is computed once per class (as long as its type hints don't change).
+        """
+        type_hints = cls.__type_hints__
+        try:
+            cached_type_hints, plan = cls.__dict__["__plan_cache__"]
+            if cached_type_hints is type_hints:
+                return plan
+        except KeyError:
+            pass
+        plan = [(key, *cain.types.retrieve_type(current_type))
+                for key, current_type in sorted(type_hints.items(), key=lambda item: item[0])]
+        cls.__plan_cache__ = (type_hints, plan)
+        return plan
+
+    @classmethod
+    def _getters(cls) -> typing.Tuple[typing.Callable[[typing.Any], typing.Tuple],
+                                      typing.Callable[[typing.Any], typing.Tuple]]:
+        """
+        Returns the functions reading the values of the fields, in the sorted keys order,
+        from a mapping (`operator.itemgetter`) and from an object (`operator.attrgetter`)
+
+        Note: The result is computed once per class (as long as its type hints don't change).
+        """
+        plan = cls._plan()
+        try:
+            cached_plan, getters = cls.__dict__["__getters_cache__"]
+            if cached_plan is plan:
+                return getters
+        except KeyError:
+            pass
+        keys = [key for key, _, _ in plan]
+        if len(keys) > 1:
+            getters = (operator.itemgetter(*keys), operator.attrgetter(*keys))
+        elif keys:
+            # the getters don't return a tuple when given a single key
+            item_getter, attribute_getter = operator.itemgetter(keys[0]), operator.attrgetter(keys[0])
+            getters = (lambda value: (item_getter(value),), lambda value: (attribute_getter(value),))
+        else:
+            getters = (lambda value: (), lambda value: ())
+        cls.__getters_cache__ = (plan, getters)
+        return getters
+
+    @classmethod
+    def _values(cls, value: typing.Any) -> typing.Tuple:
+        """
+        Returns the values of the fields of `value`, in the sorted keys order
+
+        Parameters
+        ----------
+        value: Any
+            A mapping (`dict`, `Object`, etc.), an object implementing `__cain__`
+            or an object holding the fields as attributes
+
+        Returns
+        -------
+        tuple
+            The values to encode
+        """
+        item_getter, attribute_getter = cls._getters()
+        if value.__class__ is dict:
+            getter = item_getter
+        else:
+            hook = getattr(value.__class__, "__cain__", None)
+            if hook is not None:
+                value = hook(value)
+                getter = item_getter
+            elif isinstance(value, (collections.abc.Mapping, Datatype)):
+                getter = item_getter
+            else:
+                getter = attribute_getter
+        try:
+            return getter(value)
+        except (KeyError, AttributeError):
+            defaults = dict(cls._defaults())
+            if not defaults:
+                raise
+
+        # Some fields are missing, falling back on their default values
+        values = []
+        for index, (key, _, _) in enumerate(cls._plan()):
+            try:
+                values.append(value[key] if getter is item_getter else getattr(value, key))
+            except (KeyError, AttributeError):
+                if index not in defaults:
+                    raise
+                values.append(defaults[index])
+        return tuple(values)
+
+    @classmethod
+    def _defaults(cls) -> typing.List[typing.Tuple[int, typing.Any]]:
+        """
+        Returns the indices and values of the fields having a default value (set in the class body)
+
+        Note: The result is computed once per class (as long as its type hints don't change).
+        """
+        plan = cls._plan()
+        try:
+            cached_plan, defaults = cls.__dict__["__defaults_cache__"]
+            if cached_plan is plan:
+                return defaults
+        except KeyError:
+            pass
+        defaults = []
+        for index, (key, _, _) in enumerate(plan):
+            for parent in cls.__mro__:
+                if parent is Object:
+                    break
+                if key in parent.__dict__:
+                    defaults.append((index, parent.__dict__[key]))
+                    break
+        cls.__defaults_cache__ = (plan, defaults)
+        return defaults
+
+    @classmethod
+    def _bitmap_plan(cls) -> typing.Tuple[typing.List[typing.Tuple[str, typing.Type[Datatype], typing.List]],
+                                          typing.List[int]]:
+        """
+        Returns the fields of the object when using the `bitmap` argument, where the `Optional` fields
+        are replaced by their value datatype, and the indices of the `Optional` fields
+
+        Note: The result is computed once per class (as long as its type hints don't change).
+        """
+        plan = cls._plan()
+        try:
+            cached_plan, result = cls.__dict__["__bitmap_cache__"]
+            if cached_plan is plan:
+                return result
+        except KeyError:
+            pass
+        bitmap_plan = []
+        optionals = []
+        for index, (key, current_type, type_args) in enumerate(plan):
+            if issubclass(current_type, cain.types.Optional):
+                # `Optional` encodes its value using `Union`, after the marker
+                current_type = cain.types.Union
+                optionals.append(index)
+            bitmap_plan.append((key, current_type, type_args))
+        result = (bitmap_plan, optionals)
+        cls.__bitmap_cache__ = (plan, result)
+        return result
+
+    @classmethod
+    def record_class(cls) -> typing.Type[Record]:
+        """
+        Returns the `__slots__` class the object is decoded into when using the `record` argument
+
+        Note: The class is generated once per `Object` subclass. Its fields are in the sorted keys order.
+
+        Example
+        -------
+        >>> class TestObject(Object):
+        ...     username: str
+        ...     favorite_number: int
+        >>> TestObject.record_class()(2, "Anise")
+        TestObject(favorite_number=2, username='Anise')
+        """
+        root = cls.__root__
+        try:
+            return root.__dict__["__record_class__"]
+        except KeyError:
+            pass
+        record_class = make_record(root.__name__, [key for key, _, _ in root._plan()], module=root.__base__.__module__)
+        root.__record_class__ = record_class
+        return record_class
+
+    @classmethod
+    def _encode(cls, value: typing.Any, *args):
         result = b""
-        types = sorted(cls.__type_hints__.items(), key=lambda item: item[0])
+        values = cls._values(value)
+        # The indices of the fields which are not written
+        absent = set()
+        if DEFAULTS in args:
+            defaults = cls._defaults()
+            if defaults:
+                # Setting the bits of the fields equal to their default value
+                elided = 0
+                for bit, (index, default) in enumerate(defaults):
+                    current_value = values[index]
+                    if current_value.__class__ is default.__class__ and current_value == default:
+                        absent.add(index)
+                        elided |= 1 << bit
+                result += elided.to_bytes((len(defaults) + 7) // 8, byteorder="little")
+        if BITMAP in args:
+            types, optionals = cls._bitmap_plan()
+            if optionals:
+                # Setting the bits of the present optional fields
+                presence = 0
+                for bit, index in enumerate(optionals):
+                    if values[index] is None:
+                        absent.add(index)
+                    else:
+                        presence |= 1 << bit
+                result += presence.to_bytes((len(optionals) + 7) // 8, byteorder="little")
+        else:
+            types = cls._plan()
         # Because we are working with integers less or equal than a fixed length,
         # we can optimize the size of the encoded integers.
         integer_encoder = cain.types.numbers.recommended_size(len(types))
@@ -111,9 +396,12 @@ class Object(Datatype):
         results_table: typing.Dict[bytes, typing.List[int]] = {}
         results = []
 
-        for index, (key, current_type) in enumerate(types):
-            current_type, type_args = cain.types.retrieve_type(current_type)
-            data = current_type._encode(value[key], *type_args)
+        for index, (current_value, (_, current_type, type_args)) in enumerate(zip(values, types)):
+            if index in absent:
+                # absent optional field or default value, marked in the bitmaps
+                results.append(None)
+                continue
+            data = current_type._encode(current_value, *type_args)
 
             try:
                 results_table[data].append(index)
@@ -148,7 +436,7 @@ class Object(Datatype):
         result += redundancies_result  # adding the repeated data
 
         for index, data in enumerate(results):
-            if index in redundancies_indices:
+            if data is None or index in redundancies_indices:
                 continue
             # adding the rest of the data (which is not repeated)
             result += data
@@ -157,12 +445,38 @@ class Object(Datatype):
 
     @classmethod
     def _decode(cls, value: bytes, *args):
-        results = {}
-        types = sorted(cls.__type_hints__.items(), key=lambda item: item[0])
+        decoding_context = context.current_decoding()
+        if decoding_context is not None and decoding_context.fields is not None:
+            return cls._decode_fields(value, decoding_context, *args)
+
+        processed_indices = []
+        defaulted = ()
+        if DEFAULTS in args:
+            defaults = cls._defaults()
+            if defaults:
+                bitmap_size = (len(defaults) + 7) // 8
+                elided = int.from_bytes(value[:bitmap_size], byteorder="little")
+                value = value[bitmap_size:]
+                defaulted = [(index, default) for bit, (index, default) in enumerate(defaults) if elided >> bit & 1]
+                processed_indices.extend(index for index, _ in defaulted)
+        if BITMAP in args:
+            types, optionals = cls._bitmap_plan()
+            if optionals:
+                bitmap_size = (len(optionals) + 7) // 8
+                presence = int.from_bytes(value[:bitmap_size], byteorder="little")
+                value = value[bitmap_size:]
+                # The absent fields are left to `None`
+                processed_indices.extend(index for bit, index in enumerate(optionals) if not presence >> bit & 1)
+        else:
+            types = cls._plan()
+        # The values are stored following the sorted keys order
+        results = [None] * len(types)
+        for index, default in defaulted:
+            results[index] = _default_value(default)
         # Getting the right integer decoder
         integer_encoder = cain.types.numbers.recommended_size(len(types))
 
-        processed_indices = []
+        interner = decoding_context.interner if decoding_context else None
 
         # Getting the number of repeated items
         redundancy_header_length, value = integer_encoder._decode(value, *args)
@@ -184,36 +498,234 @@ class Object(Datatype):
             # Because `try...catch` blocks are expensive, we won't be checking this case.
             # Therefore, repeats present in 0 locations in the array are prohibited.
             index = current_indices[0]
-            key, current_type = types[index]
-            current_type, type_args = cain.types.retrieve_type(current_type)
+            _, current_type, type_args = types[index]
             # Decoding the data for the first index
             data, after_decoding = current_type._decode(value, *type_args)
-            results[key] = data
+            if interner is not None:
+                data = interner(data)
+            results[index] = data
 
             # Decoding the data for the rest of the indices
             for index in current_indices[1:]:
                 # We can't use the same datatype as two different datatypes
                 # can produce the same encoded bytes.
                 # Example: `Array`, `Tuple` and `Set`
-                key, current_type = types[index]
-                current_type, type_args = cain.types.retrieve_type(current_type)
+                _, current_type, type_args = types[index]
                 # We already removed the bytes corresponding to the data the first time,
                 # so we don't need to remove it again.
                 data, _ = current_type._decode(value, *type_args)
-                results[key] = data
+                if interner is not None:
+                    data = interner(data)
+                results[index] = data
 
             value = after_decoding
             continue
 
-        for index, (key, current_type) in enumerate(types):
+        for index, (_, current_type, type_args) in enumerate(types):
             if index in processed_indices:
                 continue
             # If not already processed, then decode the actual value and add it
-            current_type, type_args = cain.types.retrieve_type(current_type)
             data, value = current_type._decode(value, *type_args)
+            if interner is not None:
+                data = interner(data)
+            results[index] = data
+
+        if decoding_context is not None and decoding_context.targets:
+            constructor = decoding_context.targets.get(cls)
+            if constructor is not None:
+                return constructor(*results), value
+        if RECORD in args:
+            return cls.record_class()(*results), value
+        return cls({key: results[index] for index, (key, _, _) in enumerate(types)}), value
+
+    @classmethod
+    def _decode_fields(cls, value: bytes, decoding_context: context.DecodingContext, *args):
+        """
+        Decodes the fields selected in `decoding_context.fields` only, moving past the other ones
+
+        Note: The result only contains the selected fields, records and `into` targets are not used.
+
+        Parameters
+        ----------
+        value: bytes
+            The data to decode
+        decoding_context: DecodingContext
+            The current decoding context, holding the selected fields
+        *args
+            The type arguments
+
+        Returns
+        -------
+        tuple[Object, bytes]
+            The object and the rest of the data
+        """
+        fields = decoding_context.fields
+        start = value
+        # The skipped values are not projected
+        decoding_context.fields = None
+        try:
+            types, positions, constants, value = cls._locate(value, *args)
+        finally:
+            decoding_context.fields = fields
+
+        keys = {key for key, _, _ in types}
+        for key in fields:
+            if key not in keys:
+                raise errors.DecodingError(cls, f"The field `{key}` is not in the schema")
+
+        interner = decoding_context.interner
+        results = {}
+        for index, (key, current_type, type_args) in enumerate(types):
+            if key not in fields:
+                continue
+            if index in constants:
+                results[key] = constants[index]
+                continue
+            # the nested objects only decode the fields selected in this one
+            decoding_context.fields = fields[key]
+            try:
+                data, _ = current_type._decode(start[positions[index]:], *type_args)
+            finally:
+                decoding_context.fields = fields
+            if interner is not None:
+                data = interner(data)
             results[key] = data
 
         return cls(results), value
 
+    @classmethod
+    def _locate(cls, value: bytes, *args) -> typing.Tuple[typing.List[typing.Tuple[str, typing.Type[Datatype], typing.List]],
+                                                          typing.List[typing.Optional[int]],
+                                                          typing.Dict[int, typing.Any],
+                                                          bytes]:
+        """
+        Finds where each field starts, without decoding them (used by the lazy views)
+
+        Parameters
+        ----------
+        value: bytes
+            The data containing the object
+        *args
+            The type arguments
+
+        Returns
+        -------
+        tuple[list[tuple[str, type[Datatype], list]], list[int | None], dict[int, Any], bytes]
+            The fields (as in `_plan`), the position of each field in `value` (repeated fields share
+            the same position), the values of the fields which are not written (default values and
+            absent optional fields) and the rest of the data
+        """
+        size = len(value)
+        constants = {}
+        if DEFAULTS in args:
+            defaults = cls._defaults()
+            if defaults:
+                bitmap_size = (len(defaults) + 7) // 8
+                elided = int.from_bytes(value[:bitmap_size], byteorder="little")
+                value = value[bitmap_size:]
+                constants.update((index, _default_value(default)) for bit, (index, default) in enumerate(defaults) if elided >> bit & 1)
+        if BITMAP in args:
+            types, optionals = cls._bitmap_plan()
+            if optionals:
+                bitmap_size = (len(optionals) + 7) // 8
+                presence = int.from_bytes(value[:bitmap_size], byteorder="little")
+                value = value[bitmap_size:]
+                constants.update((index, None) for bit, index in enumerate(optionals) if not presence >> bit & 1)
+        else:
+            types = cls._plan()
+        integer_encoder = cain.types.numbers.recommended_size(len(types))
+        positions = [None] * len(types)
+
+        redundancy_header_length, value = integer_encoder._decode(value, *args)
+        for _ in range(redundancy_header_length):
+            redundancy_count, value = integer_encoder._decode(value, *args)
+            current_indices = []
+            for _ in range(redundancy_count):
+                index, value = integer_encoder._decode(value, *args)
+                current_indices.append(index)
+            # every index points to the same data
+            for index in current_indices:
+                positions[index] = size - len(value)
+            _, current_type, type_args = types[current_indices[0]]
+            value = current_type._skip(value, *type_args)
+
+        for index, (_, current_type, type_args) in enumerate(types):
+            if positions[index] is not None or index in constants:
+                continue
+            positions[index] = size - len(value)
+            value = current_type._skip(value, *type_args)
+
+        return types, positions, constants, value
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        _, _, _, value = cls._locate(value, *args)
+        return value
+
+    @classmethod
+    def _validate_bitmaps(cls, value: bytes, *args) -> typing.Tuple[typing.List, typing.Set[int], bytes]:
+        """
+        Validates the bitmaps written at the start of the object
+
+        Parameters
+        ----------
+        value: bytes
+            The data to validate
+        *args
+            The type arguments
+
+        Returns
+        -------
+        tuple[list, set[int], bytes]
+            The plan of the fields, the indices of the fields which are not written and the rest of the data
+        """
+        plan = cls._plan()
+        processed = set()
+        if DEFAULTS in args:
+            defaults = cls._defaults()
+            if defaults:
+                bitmap_size = (len(defaults) + 7) // 8
+                if len(value) < bitmap_size:
+                    raise errors.TruncatedDataError(cls, "The default values bitmap is truncated", len(value))
+                elided = int.from_bytes(value[:bitmap_size], byteorder="little")
+                if elided >> len(defaults):
+                    raise errors.ValidationError(cls, "The default values bitmap has unused bits set", len(value))
+                value = value[bitmap_size:]
+                for bit, (index, _) in enumerate(defaults):
+                    if elided >> bit & 1:
+                        processed.add(index)
+        if BITMAP in args:
+            types, optionals = cls._bitmap_plan()
+            if optionals:
+                bitmap_size = (len(optionals) + 7) // 8
+                if len(value) < bitmap_size:
+                    raise errors.TruncatedDataError(cls, "The presence bitmap is truncated", len(value))
+                presence = int.from_bytes(value[:bitmap_size], byteorder="little")
+                if presence >> len(optionals):
+                    raise errors.ValidationError(cls, "The presence bitmap has unused bits set", len(value))
+                value = value[bitmap_size:]
+                for bit, index in enumerate(optionals):
+                    if not presence >> bit & 1:
+                        processed.add(index)
+        else:
+            types = plan
+        return types, processed, value
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        types, processed, value = cls._validate_bitmaps(value, *args)
+        integer_encoder = cain.types.numbers.recommended_size(len(types))
+        keys = [key for key, _, _ in types]
+        element_types = [(current_type, type_args) for _, current_type, type_args in types]
+        value = arrays.validate_redundancies(cls, value, len(types), element_types.__getitem__,
+                                              processed, integer_encoder, args, keys=keys)
+
+        for index, (key, current_type, type_args) in enumerate(types):
+            if index in processed:
+                continue
+            value = arrays.validate_element(value, key, current_type, type_args)
+
+        return value
+
 
 Dict = Object
@@ -25,6 +25,7 @@ import typing
 import typing_extensions
 
 import cain.types
+from cain import errors
 from cain.model import Datatype
 
 T = typing_extensions.TypeVarTuple("T")
@@ -54,6 +55,23 @@ class Optional(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
 
     @classmethod
     def _decode(cls, value: bytes, *args):
-        if value.startswith(b"\x00"):
+        if value[:1] == b"\x00":
             return None, value[1:]
         return cain.types.Union._decode(value[1:], *args)
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        if value[:1] == b"\x00":
+            return value[1:]
+        return cain.types.Union._skip(value[1:], *args)
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        marker = value[:1]
+        if not marker:
+            raise errors.TruncatedDataError(cls, "The optional value marker is missing")
+        if marker == b"\x00":
+            return value[1:]
+        if marker != b"\x01":
+            raise errors.ValidationError(cls, "The optional value marker should be 0 or 1", len(value))
+        return cain.types.Union._validate(value[1:], *args)
@@ -38,6 +38,7 @@ import typing
 import typing_extensions
 
 import cain.types.numbers as numbers
+from cain import errors
 from cain.model import Datatype
 
 T = typing_extensions.TypeVarTuple("T")
@@ -74,3 +75,21 @@ class Range(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
         stop, value = numbers.Int._decode(value, *args)
         step, value = numbers.Int._decode(value, *args)
         return range(start, stop, step), value
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        args += (numbers.SHORT,)  # start with only 8 bits integers
+        for _ in range(3):
+            value = numbers.Int._skip(value, *args)
+        return value
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        args += (numbers.SHORT,)  # start with only 8 bits integers
+        value = numbers.Int._validate(value, *args)
+        value = numbers.Int._validate(value, *args)
+        rest = numbers.Int._validate(value, *args)
+        step, _ = numbers.Int._decode(value, *args)
+        if step == 0:
+            raise errors.ValidationError(cls, "The step of the range can't be zero", len(value))
+        return rest
@@ -74,3 +74,11 @@ class Set(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
         # TODO: Look for optimisations utilizing the fact that sets are unordered
         data, value = Array._decode(value, *cls.preprocess_types(args))
         return set(data), value
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        return Array._skip(value, *cls.preprocess_types(args))
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        return Array._validate(value, *cls.preprocess_types(args))
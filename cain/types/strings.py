@@ -52,9 +52,14 @@ class String(Datatype):
     @classmethod
     def _decode(cls, value: bytes, *args):
         # Warning: This method only works because `characters.Character` only uses UTF-8
-        term = value.find(b"\x00")
+        term = _terminator(value)
         if term == -1:
-            raise errors.DecodingError(cls, "Unterminated string")
+            raise errors.TruncatedDataError(cls, "Unterminated string")
+        if isinstance(value, memoryview):
+            # only the string is copied, not the whole buffer
+            result, _ = cls._decode(value[:term + 1].tobytes(), *args)
+            return result, value[term + 1:]
+
         try:
             return value[:term].decode("utf-8"), value[term + 1:]
         except UnicodeDecodeError:
@@ -68,5 +73,37 @@ class String(Datatype):
             letter, value = characters.Character._decode(value, *args)
             result += letter
         else:
-            raise errors.DecodingError(cls, "Unterminated string")
+            raise errors.TruncatedDataError(cls, "Unterminated string")
         return result, value[1:]  # value contains "\x00" at its start
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        term = _terminator(value)
+        if term == -1:
+            raise errors.TruncatedDataError(cls, "Unterminated string")
+        return value[term + 1:]
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        term = _terminator(value)
+        if term == -1:
+            raise errors.TruncatedDataError(cls, "Unterminated string", len(value))
+        try:
+            str(value[:term], "utf-8")
+        except UnicodeDecodeError as err:
+            raise errors.ValidationError(cls, f"Invalid UTF-8 data ({err.reason})", len(value) - err.start) from err
+        return value[term + 1:]
+
+
+def _terminator(value: bytes) -> int:
+    """Returns the position of the NULL character ending the string at the start of `value`, -1 if there is none"""
+    if isinstance(value, memoryview):
+        # memoryviews don't provide `find`, so we are looking for the terminator
+        # in growing windows instead of copying the whole buffer.
+        window = 64
+        while True:
+            term = value[:window].tobytes().find(b"\x00")
+            if term != -1 or window >= len(value):
+                return term
+            window *= 4
+    return value.find(b"\x00")
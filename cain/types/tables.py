@@ -0,0 +1,408 @@
+"""
+tables.py
+
+Defines the Table datatype, which is used to store lists of objects column by column.
+
+`Array[MyObject]` encodes the objects one after the other, each of them having its own redundancy table,
+which means that a value repeated in the same field of many objects is written every time.
+`Table[MyObject]` transposes the objects into one column per field and encodes each column with
+the codec giving the smallest result.
+
+Example
+-------
+>>> from cain.types import Object, Table
+>>> class User(Object):
+...     username: str
+...     age: int
+>>> Table[User].encode([{"username": "Anise", "age": 20}, {"username": "Anise", "age": 21}])
+b'\x02\x02(\x02\x01\x01Anise\x00'
+>>> Table[User].decode(b'\x02\x02(\x02\x01\x01Anise\x00')
+[User({'age': 20, 'username': 'Anise'}), User({'age': 21, 'username': 'Anise'})]
+>>> Table[User, "columns"].decode(b'\x02\x02(\x02\x01\x01Anise\x00')
+{'age': [20, 21], 'username': ['Anise', 'Anise']}
+
+Structure
+---------
+\x02               \x02 ( \x02           \x01 \x01 Anise\x00
+~~~~               ~~~~~~~~~~~           ~~~~~~~~~~~~~~~~~~~
+Number of rows     `age` column          `username` column
+(variable length   (delta: 20, +1)       (deduplicated: 1 distinct value,
+integer)                                  the indices taking 0 bit)
+
+Each column (in the sorted keys order) starts with the codec used:
+
+\x00 — Plain: the values, encoded one after the other
+\x01 — Deduplicated: the number of distinct values (variable length integer), the distinct values,
+       then the index of the value of each row, bit-packed
+\x02 — Delta (integers only): the difference with the previous value of each row, as `VarInt`
+\x03 — Bit-packed (integers only): the smallest value (`VarInt`), the number of bits used by each value (1 byte),
+       then the difference with the smallest value of each row, bit-packed
+
+The bit-packed numbers are written by groups of 8, each group taking exactly `bits` bytes
+(little-endian, the first number being in the least significant bits).
+"""
+import collections.abc
+import decimal
+import typing
+
+import typing_extensions
+
+import cain.types
+from cain import context, errors
+from cain.model import Datatype
+from cain.types.arrays import validate_element
+from cain.types.numbers import UnsignedVarInt, VarInt
+from cain.types.objects import RECORD
+
+# Type Arguments
+columns = COLUMNS = "columns"
+
+# Column codecs
+PLAIN = 0
+DEDUPLICATED = 1
+DELTA = 2
+BITPACKED = 3
+
+# The values which can be shared between the rows when decoding a deduplicated column
+IMMUTABLE_TYPES = (str, int, float, complex, bool, bytes, decimal.Decimal, type(None))
+
+T = typing_extensions.TypeVarTuple("T")
+
+
+def pack_bits(values: typing.List[int], bits: int) -> bytes:
+    """
+    Packs the given non-negative integers using `bits` bits for each of them
+
+    Example
+    -------
+    >>> pack_bits([1, 2, 3], 2)
+    b'9\x00'
+    """
+    result = bytearray()
+    # Working by groups of 8 values, which take exactly `bits` bytes,
+    # keeps the integers small instead of building a single huge one
+    for start in range(0, len(values), 8):
+        group = 0
+        for shift, current_value in enumerate(values[start:start + 8]):
+            group |= current_value << (shift * bits)
+        result += group.to_bytes(bits, byteorder="little")
+    return bytes(result)
+
+
+def unpack_bits(value: bytes, count: int, bits: int) -> typing.List[int]:
+    """
+    Unpacks `count` integers packed with `pack_bits`
+
+    Example
+    -------
+    >>> unpack_bits(b'9\x00', 3, 2)
+    [1, 2, 3]
+    """
+    mask = (1 << bits) - 1
+    results = []
+    for group_index in range((count + 7) // 8):
+        group = int.from_bytes(value[group_index * bits:(group_index + 1) * bits], byteorder="little")
+        for _ in range(min(8, count - group_index * 8)):
+            results.append(group & mask)
+            group >>= bits
+    return results
+
+
+def packed_size(count: int, bits: int) -> int:
+    """Returns the number of bytes taken by `count` integers packed with `pack_bits`"""
+    return (count + 7) // 8 * bits
+
+
+def _read_byte(value: bytes, name: str) -> typing.Tuple[int, bytes]:
+    """Reads the byte at the start of `value` (the codec or the number of bits of a column)"""
+    if not value:
+        raise errors.TruncatedDataError(Table, f"The {name} of the column is missing")
+    return value[0], value[1:]
+
+
+class Table(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
+    """
+    Handles the encoding and decoding of lists of objects, column by column.
+
+    Parameters
+    ----------
+    schema
+        The `Object` datatype of the rows
+    columns
+        Decodes the table as a dictionary mapping each field to the list of its values
+        instead of a list of objects
+
+    Note: The tables can be encoded from a list of objects (anything `Object` can encode)
+          or from a mapping of columns (`{"username": [...], "age": [...]}`).
+
+    Example
+    -------
+    >>> Table[User].encode([{"username": "Anise", "age": 20}, {"username": "Anise", "age": 21}])
+    b'\x02\x02(\x02\x01\x01Anise\x00'
+    >>> Table[User, "columns"].decode(b'\x02\x02(\x02\x01\x01Anise\x00')
+    {'age': [20, 21], 'username': ['Anise', 'Anise']}
+    """
+
+    @staticmethod
+    def process_args(args) -> typing.Tuple[typing.Type[Datatype], typing.List]:
+        """
+        Returns the `Object` datatype of the rows and its type arguments
+        """
+        for arg in args:
+            if isinstance(arg, str):
+                continue
+            datatype, type_args = cain.types.retrieve_type(arg)
+            if issubclass(datatype, cain.types.Object):
+                return datatype, type_args
+        raise errors.DatatypeError(Table, "No `Object` schema was given for the rows of the table")
+
+    @classmethod
+    def _encode(cls, value: typing.Any, *args):
+        datatype, _ = cls.process_args(args)
+        plan = datatype._plan()
+
+        if isinstance(value, collections.abc.Mapping):
+            # columnar form
+            table_columns = [list(value[key]) for key, _, _ in plan]
+            count = len(table_columns[0]) if table_columns else 0
+            if any(len(column) != count for column in table_columns):
+                raise errors.EncodingError(cls, "All of the columns should have the same length")
+        else:
+            rows = [datatype._values(row) for row in value]
+            count = len(rows)
+            table_columns = list(zip(*rows)) if rows else [[] for _ in plan]
+
+        result = UnsignedVarInt._encode(count)
+        for column, (_, current_type, type_args) in zip(table_columns, plan):
+            result += cls._encode_column(column, current_type, type_args)
+        return result
+
+    @staticmethod
+    def _encode_column(column: typing.Sequence[typing.Any], datatype: typing.Type[Datatype], type_args: typing.List) -> bytes:
+        """
+        Encodes the values of a column, using the codec giving the smallest result
+        """
+        encoded = [datatype._encode(current_value, *type_args) for current_value in column]
+        candidates = [bytes((PLAIN,)) + b"".join(encoded)]
+
+        # Deduplicated
+        distinct: typing.Dict[bytes, int] = {}
+        indices = [distinct.setdefault(data, len(distinct)) for data in encoded]
+        if len(distinct) < len(encoded):
+            bits = (len(distinct) - 1).bit_length()
+            candidates.append(bytes((DEDUPLICATED,)) + UnsignedVarInt._encode(len(distinct))
+                              + b"".join(distinct) + pack_bits(indices, bits))
+
+        if column and issubclass(datatype, cain.types.Int):
+            integers = [int(current_value) for current_value in column]
+            # Delta
+            previous = 0
+            deltas = []
+            for current_value in integers:
+                deltas.append(VarInt._encode(current_value - previous))
+                previous = current_value
+            candidates.append(bytes((DELTA,)) + b"".join(deltas))
+            # Bit-packed
+            lowest = min(integers)
+            bits = (max(integers) - lowest).bit_length()
+            if bits < 256:
+                candidates.append(bytes((BITPACKED,)) + VarInt._encode(lowest) + bytes((bits,))
+                                  + pack_bits([current_value - lowest for current_value in integers], bits))
+
+        # the first (simplest) codec is kept when several give the same size
+        return min(candidates, key=len)
+
+    @staticmethod
+    def _decode_column(value: bytes, count: int, datatype: typing.Type[Datatype],
+                       type_args: typing.List) -> typing.Tuple[typing.List[typing.Any], bytes]:
+        """
+        Decodes the `count` values of a column
+        """
+        decoding_context = context.current_decoding()
+        interner = decoding_context.interner if decoding_context else None
+
+        codec, value = _read_byte(value, "codec")
+        results = []
+        if codec == PLAIN:
+            for _ in range(count):
+                data, value = datatype._decode(value, *type_args)
+                if interner is not None:
+                    data = interner(data)
+                results.append(data)
+        elif codec == DEDUPLICATED:
+            distinct_count, value = UnsignedVarInt._decode(value)
+            distinct = []
+            for _ in range(distinct_count):
+                data, after_decoding = datatype._decode(value, *type_args)
+                if interner is not None:
+                    data = interner(data)
+                # the mutable values are decoded again for each row
+                distinct.append((data, None if isinstance(data, IMMUTABLE_TYPES) else value))
+                value = after_decoding
+            bits = (distinct_count - 1).bit_length()
+            size = packed_size(count, bits)
+            for index in unpack_bits(value[:size], count, bits):
+                if index >= distinct_count:
+                    raise errors.DecodingError(Table, f"The index {index} is out of range ({distinct_count} distinct values)")
+                data, start = distinct[index]
+                if start is not None:
+                    data, _ = datatype._decode(start, *type_args)
+                results.append(data)
+            value = value[size:]
+        elif codec == DELTA:
+            offset = 0
+            previous = 0
+            for _ in range(count):
+                data, offset = UnsignedVarInt.read(value, offset)
+                previous += (data >> 1) ^ -(data & 1)
+                results.append(previous)
+            value = value[offset:]
+        elif codec == BITPACKED:
+            lowest, value = VarInt._decode(value)
+            bits, value = _read_byte(value, "number of bits")
+            size = packed_size(count, bits)
+            results = [lowest + data for data in unpack_bits(value[:size], count, bits)]
+            value = value[size:]
+        else:
+            raise errors.DecodingError(Table, f"Unknown column codec `{codec}`")
+        return results, value
+
+    @staticmethod
+    def _skip_column(value: bytes, count: int, datatype: typing.Type[Datatype], type_args: typing.List) -> bytes:
+        """
+        Moves past the `count` values of a column, without decoding them
+        """
+        codec, value = _read_byte(value, "codec")
+        if codec == PLAIN:
+            for _ in range(count):
+                value = datatype._skip(value, *type_args)
+            return value
+        if codec == DEDUPLICATED:
+            distinct_count, value = UnsignedVarInt._decode(value)
+            for _ in range(distinct_count):
+                value = datatype._skip(value, *type_args)
+            return value[packed_size(count, (distinct_count - 1).bit_length()):]
+        if codec == DELTA:
+            offset = 0
+            for _ in range(count):
+                _, offset = UnsignedVarInt.read(value, offset)
+            return value[offset:]
+        if codec == BITPACKED:
+            bits, value = _read_byte(VarInt._skip(value), "number of bits")
+            return value[packed_size(count, bits):]
+        raise errors.DecodingError(Table, f"Unknown column codec `{codec}`")
+
+    @staticmethod
+    def _validate_column(value: bytes, count: int, datatype: typing.Type[Datatype], type_args: typing.List) -> bytes:
+        """
+        Checks that the `count` values of a column are well-formed
+        """
+        remaining = len(value)
+        codec, value = _read_byte(value, "codec")
+        if codec == PLAIN:
+            for index in range(count):
+                value = validate_element(value, index, datatype, type_args)
+            return value
+        if codec == DEDUPLICATED:
+            remaining = len(value)
+            rest = UnsignedVarInt._validate(value)
+            distinct_count, _ = UnsignedVarInt._decode(value)
+            value = rest
+            if distinct_count > count or (count and not distinct_count):
+                raise errors.ValidationError(Table, f"A deduplicated column of {count} rows can't have {distinct_count} distinct values",
+                                             remaining)
+            for index in range(distinct_count):
+                value = validate_element(value, index, datatype, type_args)
+            bits = (distinct_count - 1).bit_length()
+            size = packed_size(count, bits)
+            if len(value) < size:
+                raise errors.TruncatedDataError(Table, f"The indices of the column are truncated ({len(value)} bytes out of {size})",
+                                                len(value))
+            if any(index >= distinct_count for index in unpack_bits(value[:size], count, bits)):
+                raise errors.ValidationError(Table, f"An index of the column is out of range ({distinct_count} distinct values)",
+                                             len(value))
+            return value[size:]
+        if codec == DELTA:
+            for _ in range(count):
+                value = UnsignedVarInt._validate(value)
+            return value
+        if codec == BITPACKED:
+            bits, value = _read_byte(VarInt._validate(value), "number of bits")
+            size = packed_size(count, bits)
+            if len(value) < size:
+                raise errors.TruncatedDataError(Table, f"The values of the column are truncated ({len(value)} bytes out of {size})",
+                                                len(value))
+            return value[size:]
+        raise errors.ValidationError(Table, f"Unknown column codec `{codec}`", remaining)
+
+    @classmethod
+    def _decode(cls, value: bytes, *args):
+        datatype, type_args = cls.process_args(args)
+        plan = datatype._plan()
+        decoding_context = context.current_decoding()
+        # The fields selected in the rows (like `Object._decode_fields`)
+        fields = decoding_context.fields if decoding_context is not None else None
+        if fields is not None:
+            plan_keys = {key for key, _, _ in plan}
+            for key in fields:
+                if key not in plan_keys:
+                    raise errors.DecodingError(datatype, f"The field `{key}` is not in the schema")
+
+        count, value = UnsignedVarInt._decode(value)
+        keys = []
+        table_columns = []
+        try:
+            for key, current_type, current_args in plan:
+                if fields is not None:
+                    if key not in fields:
+                        # The skipped values are not projected
+                        decoding_context.fields = None
+                        value = cls._skip_column(value, count, current_type, current_args)
+                        continue
+                    # the nested objects only decode the fields selected in this one
+                    decoding_context.fields = fields[key]
+                column, value = cls._decode_column(value, count, current_type, current_args)
+                keys.append(key)
+                table_columns.append(column)
+        finally:
+            if fields is not None:
+                decoding_context.fields = fields
+
+        if COLUMNS in args:
+            return dict(zip(keys, table_columns)), value
+
+        # Creating the rows the same way `Object` does
+        constructor = None
+        if fields is None and decoding_context is not None and decoding_context.targets:
+            constructor = decoding_context.targets.get(datatype)
+        if constructor is None:
+            if fields is None and RECORD in type_args:
+                constructor = datatype.record_class()
+            else:
+                def constructor(*values):
+                    return datatype(dict(zip(keys, values)))
+
+        rows = zip(*table_columns) if table_columns else [()] * count
+        return [constructor(*row) for row in rows], value
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        datatype, _ = cls.process_args(args)
+        count, value = UnsignedVarInt._decode(value)
+        for _, current_type, current_args in datatype._plan():
+            value = cls._skip_column(value, count, current_type, current_args)
+        return value
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        datatype, _ = cls.process_args(args)
+        rest = UnsignedVarInt._validate(value)
+        count, _ = UnsignedVarInt._decode(value)
+        value = rest
+        for key, current_type, current_args in datatype._plan():
+            try:
+                value = cls._validate_column(value, count, current_type, current_args)
+            except errors.ValidationError as err:
+                err.path.insert(0, key)
+                raise
+        return value
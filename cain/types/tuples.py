@@ -53,3 +53,11 @@ class Tuple(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
     def _decode(cls, value: bytes, *args):
         data, value = Array._decode(value, *args)
         return tuple(data), value
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        return Array._skip(value, *args)
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        return Array._validate(value, *args)
@@ -44,7 +44,7 @@ class Type(cain.types.Object):
     """The keys for the annotations, in the order they appear in `annotations_values`"""
     annotations_values: typing.List[Type]
     """The values for the annotations, in the order they appear in `annotations_values`"""
-    arguments: typing.list[typing.Union[str, Type]]
+    arguments: typing.List[typing.Union[str, Type, int]]
     """The different type arguments"""
 
     @classmethod
@@ -60,16 +60,36 @@ class Type(cain.types.Object):
             "name": type_name if type_name != datatype.__name__ else None,
             "annotations_keys": list(datatype_annotations.keys()),
             "annotations_values": list(datatype_annotations.values()),
-            "arguments": list(type_args)
+            "arguments": [cls.normalize(arg) for arg in type_args]
         }
         if json:
             result["annotations_values"] = [Type.pack(val, json=True) for val in result["annotations_values"]]
-            result["arguments"] = [Type.pack(val, json=True) if not isinstance(val, str) else val
+            result["arguments"] = [Type.pack(val, json=True) if not isinstance(val, (str, int)) else val
                                    for val in result["arguments"]]
             # JSON exclusive
             result["datatype"] = repr(datatype)
         return result
 
+    @staticmethod
+    def normalize(argument: typing.Union[str, int, Schema]) -> typing.Union[str, int, typing.Type[cain.model.Datatype]]:
+        """
+        Turns the type arguments which are Python types (`list[str]`, `typing.Optional[int]`, etc.)
+        into their datatype, so that they can be encoded
+
+        Example
+        -------
+        >>> Type.normalize(typing.List[str])
+        Array[String]
+        >>> Type.normalize("long")
+        'long'
+        """
+        if isinstance(argument, (str, int)) or isinstance(argument, cain.model.DatatypeMeta):
+            return argument
+        datatype, type_args = cain.types.retrieve_type(argument)
+        if not type_args:
+            return datatype
+        return datatype[tuple(type_args)]
+
     @classmethod
     def _encode(cls, value: Schema, *args):
         return super()._encode(cls.pack(value), *args)
@@ -138,5 +158,9 @@ TYPES_REGISTRY = [
     "Tuple",
     "Type",
     "Union",
-    "Enum"
+    "Enum",
+    "Compressed",
+    "VarInt",
+    "UnsignedVarInt",
+    "Table"
 ]
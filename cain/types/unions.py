@@ -100,3 +100,28 @@ class Union(Datatype, typing.Generic[typing_extensions.Unpack[T]]):
         type_index, value = int_encoder._decode(value, *args)
         current_type, type_args = cain.types.retrieve_type(args[type_index])
         return current_type._decode(value, *type_args)
+
+    @classmethod
+    def _skip(cls, value: bytes, *args):
+        types_length = len(args)
+        if types_length == 1:
+            arg_type, type_args = cain.types.retrieve_type(args[0])
+            return arg_type._skip(value, *type_args)
+        int_encoder = numbers.recommended_size(types_length)
+        type_index, value = int_encoder._decode(value, *args)
+        current_type, type_args = cain.types.retrieve_type(args[type_index])
+        return current_type._skip(value, *type_args)
+
+    @classmethod
+    def _validate(cls, value: bytes, *args):
+        types_length = len(args)
+        if types_length == 1:
+            arg_type, type_args = cain.types.retrieve_type(args[0])
+            return arg_type._validate(value, *type_args)
+        int_encoder = numbers.recommended_size(types_length)
+        rest = int_encoder._validate(value, *args)
+        type_index, _ = int_encoder._decode(value, *args)
+        if type_index >= types_length:
+            raise errors.ValidationError(cls, f"The type index {type_index} is out of range ({types_length} types)", len(value))
+        current_type, type_args = cain.types.retrieve_type(args[type_index])
+        return current_type._validate(rest, *type_args)
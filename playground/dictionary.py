@@ -0,0 +1,74 @@
+"""
+Comparing the size and latency of small messages, with and without a preset dictionary
+"""
+
+import random
+import time
+import typing
+import zlib
+
+import cain
+from cain.types import Object, Optional
+
+random.seed(0)
+ROUNDS = 1000
+
+
+class Message(Object):
+    id: int
+    method: str
+    service: str
+    status: str
+    user: str
+    region: str
+    tags: typing.List[str]
+    latency: float
+    error: Optional[str]
+
+
+def message(index: int) -> dict:
+    return {
+        "id": index,
+        "method": random.choice(("GetUser", "ListOrders", "CreateOrder", "DeleteSession")),
+        "service": random.choice(("accounts.v1.AccountService", "orders.v2.OrderService")),
+        "status": random.choice(("OK", "OK", "OK", "NOT_FOUND", "PERMISSION_DENIED")),
+        "user": f"user-{random.randrange(10 ** 6):06}@example.com",
+        "region": random.choice(("europe-west1", "us-central1", "asia-northeast1")),
+        "tags": random.sample(["mobile", "web", "beta", "internal", "premium", "trial"], 3),
+        "latency": random.random() * 100,
+        "error": random.choice((None, None, "The requested resource was not found on this server"))
+    }
+
+
+dictionary = cain.train_dictionary([message(index) for index in range(1000)], Message)
+print(f"Dictionary: {len(dictionary.data)} bytes (trained on 1000 samples)")
+
+messages = [message(index) for index in range(ROUNDS)]
+
+
+def benchmark(name: str, encode: typing.Callable[[dict], bytes], decode: typing.Callable[[bytes], typing.Any]):
+    start = time.perf_counter()
+    encoded = [encode(element) for element in messages]
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for element in encoded:
+        decode(element)
+    decode_time = time.perf_counter() - start
+
+    size = sum(len(element) for element in encoded) / ROUNDS
+    print(f"{name:<12} {size:>8.1f} B/message"
+          f" {encode_time / ROUNDS * 1e6:>8.1f}µs encode"
+          f" {decode_time / ROUNDS * 1e6:>8.1f}µs decode")
+
+
+print()
+benchmark("dumps",
+          lambda obj: cain.dumps(obj, Message),
+          lambda data: cain.loads(data, Message))
+benchmark("dumps+zlib",
+          lambda obj: zlib.compress(cain.dumps(obj, Message)),
+          lambda data: cain.loads(zlib.decompress(data), Message))
+benchmark("dictionary",
+          lambda obj: cain.dumps(obj, Message, dictionary=dictionary),
+          lambda data: cain.loads(data, Message, dictionary=dictionary))
@@ -0,0 +1,75 @@
+"""
+Comparing the throughput of a shared memory channel with a `multiprocessing.Queue` (pickle)
+"""
+
+import multiprocessing
+import time
+import typing
+
+from cain.shm import Channel
+from cain.types import Object
+
+
+class Record(Object):
+    id: int
+    name: str
+    scores: typing.List[int]
+    payload: bytes
+
+
+def records(payload_size: int) -> typing.List[dict]:
+    return [{"id": index, "name": f"record-{index}", "scores": [index % 7, index % 11, index % 13],
+             "payload": bytes([index % 256]) * payload_size} for index in range(100)]
+
+
+def consume_channel(channel: Channel, results) -> None:
+    count = sum(1 for _ in channel)
+    channel.close()
+    results.put(count)
+
+
+def consume_queue(queue, results) -> None:
+    count = 0
+    while queue.get() is not None:
+        count += 1
+    results.put(count)
+
+
+def channel_benchmark(values: typing.List[dict], rounds: int) -> float:
+    results = multiprocessing.Queue()
+    with Channel(None, 1 << 24, Record) as channel:
+        process = multiprocessing.Process(target=consume_channel, args=(channel, results))
+        process.start()
+        start = time.perf_counter()
+        for index in range(rounds):
+            channel.put(values[index % len(values)])
+        channel.close()
+        assert results.get() == rounds
+        elapsed = time.perf_counter() - start
+        process.join()
+    return elapsed
+
+
+def queue_benchmark(values: typing.List[dict], rounds: int) -> float:
+    results = multiprocessing.Queue()
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=consume_queue, args=(queue, results))
+    process.start()
+    start = time.perf_counter()
+    for index in range(rounds):
+        queue.put(values[index % len(values)])
+    queue.put(None)
+    assert results.get() == rounds
+    elapsed = time.perf_counter() - start
+    process.join()
+    return elapsed
+
+
+if __name__ == "__main__":
+    for payload_size, rounds in ((64, 50_000), (1 << 16, 20_000), (1 << 20, 2_000)):
+        print(f"Payload of {payload_size} bytes ({rounds} records)")
+        values = records(payload_size)
+        for name, benchmark in (("multiprocessing.Queue (pickle)", queue_benchmark),
+                                ("cain.shm.Channel", channel_benchmark)):
+            elapsed = benchmark(values, rounds)
+            print(f"    {name}: {elapsed:.2f}s ({rounds / elapsed:,.0f} records/s)")
@@ -0,0 +1,78 @@
+"""
+Tests for the asyncio API
+"""
+import asyncio
+import concurrent.futures
+
+import pytest
+
+import cain
+from cain import errors
+from cain.types import Object
+
+
+class Message(Object):
+    id: int
+    text: str
+
+
+MESSAGES = [{"id": index, "text": "Hello" * index} for index in range(100)]
+
+
+def test_async_dump_load():
+    """
+    Tests sending and receiving frames over asyncio streams
+    """
+    async def echo(reader, writer):
+        while True:
+            try:
+                message = await cain.async_load(reader, Message)
+            except EOFError:
+                break
+            await cain.async_dump(message, writer, Message)
+        writer.close()
+        await writer.wait_closed()
+
+    async def main():
+        server = await asyncio.start_server(echo, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+        for message in MESSAGES:
+            await cain.async_dump(message, writer, Message, drain=False)
+        await writer.drain()
+        results = []
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            for _ in MESSAGES:
+                message = await cain.async_load(reader, Message, offload_size=256, executor=executor)
+                results.append(message._cain_value)
+        writer.write_eof()
+        assert await reader.read() == b""
+        writer.close()
+        server.close()
+        return results
+
+    assert asyncio.run(main()) == MESSAGES
+
+
+def test_async_load_errors():
+    """
+    Tests reading frames from closed streams
+    """
+    async def read(data: bytes, schema=None, max_size=None):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await cain.async_load(reader, schema, max_size=max_size)
+
+    frame = cain.dumps("Hello", str, include_header=True)
+    assert asyncio.run(read(bytes((len(frame),)) + frame)) == "Hello"
+    with pytest.raises(EOFError):
+        asyncio.run(read(b""))
+    with pytest.raises(errors.TruncatedDataError):
+        asyncio.run(read(b"\x80"))
+    with pytest.raises(errors.TruncatedDataError):
+        asyncio.run(read(b"\x05abc", str))
+    with pytest.raises(errors.DecodingError):
+        asyncio.run(read(bytes((len(frame),)) + frame, max_size=len(frame) - 1))
+    with pytest.raises(errors.DecodingError):
+        asyncio.run(read(b"\xff" * 7 + b"\x7f", str, max_size=1 << 20))
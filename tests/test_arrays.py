@@ -1,7 +1,7 @@
 """
 Tests for the `Array` datatype
 """
-from cain.types import Array
+from cain.types import Array, Int, Set, Tuple
 
 
 def test_encode():
@@ -52,3 +52,18 @@ def test_repetitions():
     # 1 new 2 bytes integers
     assert (len(Array[str, str, str, str, str].encode(["Hello", "Hi", "Hello", "Hey", "Hello"]))
             == len(Array[str, str, str, str].encode(["Hello", "Hi", "Hello", "Hey"])) + (1 * 1))
+
+
+def test_auto_length():
+    """
+    Tests the variable length integers used with the `auto` argument
+    """
+    assert Array[int, "auto"].encode([1, 2, 3]) == b'\x03\x00\x00\x01\x00\x02\x00\x03'
+    assert Array[int, "auto"].decode(b'\x03\x00\x00\x01\x00\x02\x00\x03') == [1, 2, 3]
+    assert Array[str, "auto"].decode(Array[str, "auto"].encode(["Hello", "Hi", "Hello", "Hey"])) == ["Hello", "Hi", "Hello", "Hey"]
+
+    # would overflow the default 2 bytes length
+    large = list(range(70_000))
+    assert Array[Int["long"], "auto"].decode(Array[Int["long"], "auto"].encode(large)) == large
+    assert Set[str, "auto"].decode(Set[str, "auto"].encode({"Hello", "world"})) == {"Hello", "world"}
+    assert Tuple[str, "auto"].decode(Tuple[str, "auto"].encode(("Hello", "world"))) == ("Hello", "world")
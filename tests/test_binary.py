@@ -1,7 +1,11 @@
 """
 Tests for the `Binary` datatype
 """
-from cain.types import Binary
+import typing
+
+import cain
+from cain.types import Binary, Object
+from cain.types.binary import AUTO
 
 
 def test_encode():
@@ -19,3 +23,53 @@ def test_decode():
     """
     assert Binary.decode(b"\x00\x00\x00\x0bHello world") == b"Hello world"
     assert Binary.decode(b"\x00\x00\x00\x00\x0bHello world", "long") == b"Hello world"
+
+
+def test_zero_copy():
+    """
+    Tests the `Binary` datatype zero-copy decoding
+    """
+    class Thumbnail(Object):
+        name: str
+        data: bytes
+        flags: typing.List[bool]
+
+    buffer = bytearray(cain.dumps({"name": "cat", "data": b"\x89PNG" * 10, "flags": [True, False]}, Thumbnail))
+
+    decoded = cain.loads(buffer, Thumbnail)
+    assert isinstance(decoded["data"], bytes)
+
+    decoded = cain.loads(buffer, Thumbnail, zero_copy=True)
+    assert isinstance(decoded["data"], memoryview)
+    assert decoded["data"] == b"\x89PNG" * 10
+    assert decoded["name"] == "cat"
+    assert decoded["flags"] == [True, False]
+
+    # the view is reflecting the changes made to the source buffer
+    buffer[buffer.index(b"\x89PNG")] = 0
+    assert decoded["data"][0] == 0
+
+    # headers are supported
+    data = cain.dumps(b"Hello world", bytes, include_header=True)
+    assert cain.loads(memoryview(data), zero_copy=True) == b"Hello world"
+
+
+def test_auto_length():
+    """
+    Tests the variable length blob size used with the `auto` argument
+    """
+    assert Binary.encode(b"Hello world", "auto") == b'\x0bHello world'
+    assert Binary[AUTO].decode(b'\x0bHello world') == b'Hello world'
+    assert Binary[AUTO].decode(Binary[AUTO].encode(b"a" * 1000)) == b"a" * 1000
+
+    class Message(Object):
+        name: str
+        data: bytes
+        values: typing.List[int]
+
+    message = {"name": "Hello", "data": b"world", "values": [1, 2, 3]}
+    encoded = cain.dumps(message, Message, auto_length=True)
+    assert len(encoded) < len(cain.dumps(message, Message))
+    assert cain.loads(encoded, Message, auto_length=True)._cain_value == message
+    encoded = cain.dumps(message, Message, include_header=True, auto_length=True)
+    assert cain.loads(encoded, auto_length=True)._cain_value == message
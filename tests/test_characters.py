@@ -1,6 +1,9 @@
 """
 Tests for the `Character` datatype
 """
+import pytest
+
+from cain import errors
 from cain.types import Character
 
 
@@ -19,3 +22,17 @@ def test_decode():
     """
     assert Character.decode(b"a") == 'a'
     assert Character.decode(b'\xe5\xa4\x8f') == '夏'
+
+
+def test_validate():
+    """
+    Tests checking the characters without decoding them
+    """
+    assert Character._validate(b'\xe5\xa4\x8frest') == b"rest"
+    assert Character._skip(b'\xe5\xa4\x8frest') == b"rest"
+    for truncated in (b"", b'\xe5\xa4'):
+        with pytest.raises(errors.TruncatedDataError):
+            Character._validate(truncated)
+    for invalid in (b'\xa4\x8f', b'\xe5\xa4a'):
+        with pytest.raises(errors.ValidationError):
+            Character._validate(invalid)
@@ -0,0 +1,74 @@
+"""
+Tests for the `Compressed` datatype
+"""
+import typing
+import zlib
+
+import pytest
+
+import cain
+from cain import errors
+from cain.types import Compressed, Object, compressed
+
+
+def test_encode():
+    """
+    Tests the `Compressed` datatype encoding logic
+    """
+    for codec in ("zlib", "lzma", "bz2"):
+        encoded = Compressed[str, codec].encode("Hello world" * 100)
+        assert len(encoded) < len(cain.dumps("Hello world" * 100, str))
+    assert len(Compressed[str, "zlib", 9].encode("Hello world" * 100)) <= len(Compressed[str, "zlib", 1].encode("Hello world" * 100))
+    assert Compressed[str, "long"].encode("Hello")[:4] == b"\x00\x00\x00\x00"
+
+
+def test_decode():
+    """
+    Tests the `Compressed` datatype decoding logic
+    """
+    for codec in ("zlib", "lzma", "bz2"):
+        assert Compressed[str, codec].decode(Compressed[str, codec].encode("Hello world" * 100)) == "Hello world" * 100
+    data = Compressed[typing.List[str], "bz2", 3].encode(["Hello", "world"]) + b"rest"
+    assert Compressed._decode(data, typing.List[str], "bz2", 3) == (["Hello", "world"], b"rest")
+
+
+def test_header():
+    """
+    Tests that `Compressed` fields can be carried in schema headers
+    """
+    class Article(Object):
+        title: str
+        content: Compressed[str, "lzma"]
+        tags: Compressed[typing.List[str], "bz2", 3]
+
+    article = {"title": "Hello", "content": "Hello world" * 100, "tags": ["a", "b"] * 10}
+    encoded = cain.dumps(article, Article, include_header=True)
+    assert cain.loads(encoded)._cain_value == article
+
+
+def test_skip(monkeypatch):
+    """
+    Tests moving past the `Compressed` values without decompressing them
+    """
+    class Article(Object):
+        title: str
+        content: Compressed[str, "long"]
+
+    article = {"title": "Hello", "content": "Hello world" * 100}
+    data = cain.dumps(article, Article)
+
+    def decompress(data: bytes) -> bytes:
+        raise AssertionError("The skipped values should not be decompressed")
+
+    monkeypatch.setitem(compressed.CODECS, "zlib", (compressed.CODECS["zlib"][0], decompress))
+    value = Compressed[str, "long"].encode("Hello world") + b"rest"
+    assert Compressed._skip(value, str, "long") == b"rest"
+    assert Compressed._validate(value, str, "long") == b"rest"
+    cain.validate(data, Article)
+    assert cain.loads(data, Article, fields=["title"])._cain_value == {"title": "Hello"}
+    assert cain.loads(data, Article, lazy=True)["title"] == "Hello"
+    with pytest.raises(errors.TruncatedDataError):
+        cain.validate(data[:-1], Article)
+
+    monkeypatch.setitem(compressed.CODECS, "zlib", (compressed.CODECS["zlib"][0], zlib.decompress))
+    assert cain.loads(data, Article, lazy=True)["content"] == "Hello world" * 100
@@ -0,0 +1,96 @@
+"""
+Tests for the preset dictionaries
+"""
+import io
+
+import pytest
+
+import cain
+from cain import errors
+from cain.types import Object
+
+
+class Event(Object):
+    kind: str
+    user: str
+    status: str
+    count: int
+
+
+SAMPLES = [{"kind": ("click", "view", "scroll")[i % 3],
+            "user": f"user{i}",
+            "status": "delivered",
+            "count": i % 50} for i in range(200)]
+
+
+def test_train():
+    """
+    Tests the dictionary training logic
+    """
+    dictionary = cain.train_dictionary(SAMPLES, Event)
+    assert 0 < len(dictionary.data) <= 32768
+    assert b"delivered" in dictionary.data
+    assert dictionary.id == cain.Dictionary(dictionary.data).id
+    assert len(cain.train_dictionary(SAMPLES, Event, size=16).data) <= 16
+    assert cain.train_dictionary(SAMPLES, Event, max_length=1024).max_length == 1024
+
+    # nothing shared between the samples
+    assert cain.train_dictionary(["a", "b"], str).data == b"a\x00b\x00"
+
+
+def test_roundtrip():
+    """
+    Tests encoding and decoding using a preset dictionary
+    """
+    dictionary = cain.train_dictionary(SAMPLES, Event)
+    message = {"kind": "view", "user": "user1234", "status": "delivered", "count": 12}
+    encoded = cain.dumps(message, Event, dictionary=dictionary)
+    assert encoded[:4] == dictionary.id.to_bytes(4, "big")
+    assert len(encoded) < len(cain.dumps(message, Event))
+    assert cain.loads(encoded, Event, dictionary=dictionary)._cain_value == message
+    assert cain.loads(encoded, Event, dictionary={dictionary.id: dictionary})._cain_value == message
+    assert cain.loads(encoded, Event, dictionary=[cain.Dictionary(b"other"), dictionary])._cain_value == message
+
+    encoded = cain.dumps(message, Event, include_header=True, dictionary=dictionary)
+    assert cain.loads(encoded, dictionary=dictionary)._cain_value == message
+
+    handler = io.BytesIO()
+    cain.dump(message, handler, Event, dictionary=dictionary)
+    assert handler.getvalue() == cain.dumps(message, Event, dictionary=dictionary)
+    handler.seek(0)
+    assert cain.load(handler, Event, dictionary=dictionary)._cain_value == message
+
+
+def test_unknown():
+    """
+    Tests decoding with a missing or wrong dictionary
+    """
+    dictionary = cain.train_dictionary(SAMPLES, Event)
+    encoded = cain.dumps(SAMPLES[0], Event, dictionary=dictionary)
+    with pytest.raises(errors.DecodingError):
+        cain.loads(encoded, Event, dictionary=cain.Dictionary(b"other"))
+    with pytest.raises(errors.DecodingError):
+        cain.loads(encoded[:4] + b"\xff" * 8, Event, dictionary=dictionary)
+
+
+def test_limits():
+    """
+    Tests decompressing truncated or too large data
+    """
+    dictionary = cain.Dictionary(b"Hello world")
+    data = dictionary.compress(b"Hello world" * 100)
+    assert dictionary.decompress(data) == b"Hello world" * 100
+    with pytest.raises(errors.DecodingError, match="truncated"):
+        dictionary.decompress(data[:-1])
+
+    dictionary.max_length = 1100
+    assert dictionary.decompress(data) == b"Hello world" * 100
+    dictionary.max_length = 1099
+    with pytest.raises(errors.DecodingError, match="maximum size"):
+        dictionary.decompress(data)
+
+    limited = cain.Dictionary(b"delivered", max_length=8)
+    encoded = cain.dumps("delivered", str, dictionary=limited)
+    with pytest.raises(errors.DecodingError):
+        cain.loads(encoded, str, dictionary=limited)
+    assert cain.loads(encoded, str, dictionary=cain.Dictionary(b"delivered")) == "delivered"
@@ -0,0 +1,147 @@
+"""
+Tests for the record files
+"""
+import io
+import typing
+
+import pytest
+
+import cain
+from cain import errors
+from cain.files import MAGIC, RecordFile
+from cain.types import Object
+
+
+class User(Object):
+    username: str
+    age: int
+    tags: typing.List[str]
+
+
+USERS = [{"username": f"user{index}", "age": index, "tags": ["a", "b"] if index % 2 else []} for index in range(500)]
+
+
+def test_record_file(tmp_path):
+    """
+    Tests writing and reading record files
+    """
+    path = tmp_path / "users.cain"
+    with RecordFile(path, "w", User, buffer_size=128) as records:
+        records.write(USERS[0])
+        records.extend(USERS[1:100])
+    assert path.read_bytes().startswith(MAGIC)
+    # the schema is only written once
+    assert path.read_bytes().count(b"username") == 1
+
+    # appending
+    with RecordFile(path, "a", User) as records:
+        records.extend(USERS[100:])
+    with RecordFile(path, "a") as records:
+        assert records.schema is not None
+    with pytest.raises(errors.EncodingError):
+        RecordFile(path, "a", Object[{"username": str}])
+
+    with RecordFile(path, schema=User, buffer_size=64) as records:
+        assert [user._cain_value for user in records] == USERS
+        assert records.count == len(USERS)
+    with RecordFile(path) as records:
+        assert [user["username"] for user in records.records(fields=["username"])] == [user["username"] for user in USERS]
+    with RecordFile(path) as records:
+        assert records[3]._cain_value == USERS[3]
+        assert records[-2]._cain_value == USERS[-2]
+        with pytest.raises(IndexError):
+            records[len(USERS)]
+        with pytest.raises(IndexError):
+            records[-len(USERS) - 1]
+
+    # file-like objects and options
+    fp = io.BytesIO()
+    with RecordFile(fp, "w", list[str], auto_length=True) as records:
+        records.extend([["Hello"], ["Hello", "world"]])
+    fp.seek(0)
+    records = RecordFile(fp)
+    assert records.auto_length
+    first, second = records.records(intern=True)
+    assert first == ["Hello"] and second == ["Hello", "world"]
+    assert first[0] is second[0]
+
+    # adding records to a file-like object (the header is read through a small buffer)
+    fp = io.BytesIO()
+    with RecordFile(fp, "w", User, buffer_size=64) as records:
+        records.extend(USERS[:50])
+    with RecordFile(fp, "a", buffer_size=64) as records:
+        records.write(USERS[50])
+    fp.seek(0)
+    assert [user._cain_value for user in RecordFile(fp)] == USERS[:51]
+
+    # a new file in append mode
+    with RecordFile(tmp_path / "new.cain", "a", str) as records:
+        records.write("Hello")
+    with RecordFile(tmp_path / "new.cain") as records:
+        assert list(records) == ["Hello"]
+
+    data = path.read_bytes()
+    with pytest.raises(errors.TruncatedDataError):
+        list(RecordFile(io.BytesIO(data[:-2]), schema=User))
+    with pytest.raises(errors.DecodingError):
+        RecordFile(io.BytesIO(b"JSON" + data[4:]))
+    with pytest.raises(errors.EncodingError):
+        RecordFile(io.BytesIO(), "w")
+
+
+def test_index(tmp_path):
+    """
+    Tests the index of the blocks of the record files
+    """
+    path = tmp_path / "users.cain"
+    with RecordFile(path, "w", User, block_size=64, buffer_size=256) as records:
+        records.extend(USERS[:300])
+    with RecordFile(path, "a") as records:
+        records.extend(USERS[300:])
+
+    with RecordFile(path, schema=User) as records:
+        assert records.block_size == 64
+        assert len(records) == len(USERS)
+        assert [records_count for _, records_count in records.blocks] == [64] * 7 + [52]
+        assert records[0]._cain_value == USERS[0]
+        assert records[200]._cain_value == USERS[200]
+        assert records[-1]._cain_value == USERS[-1]
+        with pytest.raises(IndexError):
+            records[len(USERS)]
+
+        ranges = records.split(3)
+        assert len(ranges) == 3
+        assert ranges[0][1] == ranges[1][0] and ranges[1][1] == ranges[2][0]
+        parts = [[user._cain_value for user in records.records(byte_range=byte_range)] for byte_range in ranges]
+        assert [user for part in parts for user in part] == USERS
+        # the ranges are made of whole blocks
+        assert all(abs(len(part) - len(USERS) / 3) <= 64 for part in parts)
+        assert [user._cain_value for user in records] == USERS
+
+    # without any index
+    with RecordFile(path, "w", User) as records:
+        records.extend(USERS[:10])
+    with RecordFile(path, schema=User) as records:
+        assert records.blocks is None
+        assert len(records) == 10
+        assert records[7]._cain_value == USERS[7]
+        assert len(records.split(4)) == 1
+
+    # the index is written when closing the file
+    fp = io.BytesIO()
+    records = RecordFile(fp, "w", User, block_size=2)
+    records.extend(USERS[:3])
+    records.flush()
+    with pytest.raises(errors.DecodingError):
+        RecordFile(io.BytesIO(fp.getvalue()))
+
+    # adding records to an indexed file-like object
+    fp = io.BytesIO()
+    with RecordFile(fp, "w", User, block_size=2) as records:
+        records.extend(USERS[:3])
+    with RecordFile(fp, "a") as records:
+        records.write(USERS[3])
+    fp.seek(0)
+    with RecordFile(fp) as records:
+        assert [user._cain_value for user in records] == USERS[:4]
+        assert [records_count for _, records_count in records.blocks] == [2, 2]
@@ -0,0 +1,64 @@
+"""
+Tests for the decode-side interning of repeated values
+"""
+import decimal
+import typing
+
+import cain
+from cain.interning import Interner
+from cain.types import Object
+
+
+class Record(Object):
+    name: str
+    country: str
+    score: int
+    position: typing.Tuple[int, int]
+    price: cain.types.Decimal
+
+
+def test_interning():
+    """
+    Tests that repeated values are shared when decoding with `intern`
+    """
+    records = [{"name": f"user{index % 3}", "country": "Japan", "score": 1000 + index % 2,
+                "position": (1, 2), "price": decimal.Decimal("1.50")}
+               for index in range(20)]
+    data = cain.dumps(records, typing.List[Record])
+
+    decoded = cain.loads(data, typing.List[Record])
+    assert decoded[0]["country"] is not decoded[1]["country"]
+
+    interner = Interner()
+    decoded = cain.loads(data, typing.List[Record], intern=interner)
+    assert [element._cain_value for element in decoded] == records
+    assert decoded[0]["country"] is decoded[1]["country"]
+    assert decoded[0]["name"] is decoded[3]["name"]
+    assert decoded[0]["score"] is decoded[2]["score"]
+    assert decoded[0]["position"] is decoded[1]["position"]
+    assert decoded[0]["price"] is decoded[1]["price"]
+    assert interner.hits > 0
+    assert interner.saved > 0
+
+
+def test_keys():
+    """
+    Tests that values comparing equal with different types are not shared
+    """
+    interner = Interner()
+    assert interner((1,)) == (1,)
+    assert interner((True,)) == (True,)
+    assert interner((True,))[0] is True
+    assert str(interner(decimal.Decimal("1.00"))) == "1.00"
+    assert str(interner(decimal.Decimal("1.0"))) == "1.0"
+    assert interner([1, 2]) == [1, 2]
+
+
+def test_bounded():
+    """
+    Tests that the interning table does not grow over its maximum size
+    """
+    interner = Interner(max_size=2)
+    for index in range(10):
+        interner(str(index) * 3)
+    assert len(interner.table) == 2
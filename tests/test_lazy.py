@@ -0,0 +1,130 @@
+"""
+Tests for the lazy decoding views
+"""
+import typing
+
+import pytest
+
+import cain
+from cain.lazy import LazyArray, LazyObject
+from cain.types import Array, Binary, Object, Optional
+from cain.types.objects import BITMAP, DEFAULTS
+
+
+class Member(Object):
+    name: str
+    scores: typing.List[int]
+
+
+class Team(Object[BITMAP, DEFAULTS]):
+    name: str
+    motto: Optional[str]
+    region: str = "EU"
+    logo: bytes
+    members: typing.List[Member]
+
+
+TEAM = {
+    "name": "Anise",
+    "motto": None,
+    "region": "EU",
+    "logo": b"\x00\x01\x02",
+    "members": [{"name": "Ichika", "scores": [1, 2]},
+                {"name": "Nino", "scores": [3]},
+                {"name": "Ichika", "scores": [1, 2]}]
+}
+
+
+def test_skip():
+    """
+    Tests moving past encoded values without decoding them
+    """
+    schemas = [(int, 2), (float, 1.5), (str, "Hello"), (bytes, b"world"), (bool, True), (None, None),
+               (Optional[str], None), (Optional[str], "Hi"), (typing.Union[int, str], "Hey"),
+               (typing.List[str], ["a", "b", "a"]), (typing.Tuple[int, str], (1, "a")), (Team, TEAM)]
+    for schema, value in schemas:
+        datatype, type_args = cain.types.retrieve_type(schema)
+        data = datatype._encode(value, *type_args) + b"rest"
+        assert datatype._skip(data, *type_args) == b"rest"
+        assert datatype._skip(memoryview(data), *type_args) == b"rest"
+
+
+def test_lazy():
+    """
+    Tests the lazy views
+    """
+    team = cain.loads(cain.dumps(TEAM, Team), Team, lazy=True)
+    assert isinstance(team, LazyObject)
+    assert team.decoded == 0
+    assert team["name"] == "Anise"
+    assert team.decoded == 1
+    # default values and absent optional fields
+    assert team["region"] == "EU"
+    assert team.motto is None
+    assert bytes(team["logo"]) == b"\x00\x01\x02"
+    assert set(team) == set(TEAM)
+    assert len(team) == len(TEAM)
+
+    members = team["members"]
+    assert isinstance(members, LazyArray)
+    assert len(members) == 3
+    assert isinstance(members[-1], LazyObject)
+    assert members[2]["scores"][1] == 2
+    assert members[1:] == [{"name": "Nino", "scores": [3]}, {"name": "Ichika", "scores": [1, 2]}]
+    # the values are cached
+    assert members[0] is members[0]
+    with pytest.raises(IndexError):
+        members[3]
+    with pytest.raises(KeyError):
+        team["unknown"]
+
+    assert team == TEAM
+    assert cain.dumps(team.materialize(), Team) == cain.dumps(TEAM, Team)
+
+    array = cain.loads(cain.dumps(["Hello", "world"], Array[str], auto_length=True), Array[str],
+                       lazy=True, auto_length=True)
+    assert array == ["Hello", "world"]
+    assert array.materialize() == ["Hello", "world"]
+    # not a container
+    assert cain.loads(cain.dumps(b"Hello", Binary), Binary, lazy=True) == b"Hello"
+    # with a header
+    member = TEAM["members"][0]
+    assert cain.loads(cain.dumps(member, Member, include_header=True), lazy=True)["scores"][1] == 2
+    # the objects can't be decoded into another class
+    with pytest.raises(ValueError):
+        cain.loads(cain.dumps(member, Member), Member, lazy=True, into=dict)
+    with pytest.raises(TypeError):
+        cain.lazy.LazyView(Member, memoryview(b""))
+
+
+class Roster(Object):
+    captain: Member
+    coach: Optional[Member]
+    members: typing.List[Member]
+    mascot: typing.Union[Member, str]
+
+
+def test_lazy_fields():
+    """
+    Tests the lazy views with the selected fields
+    """
+    roster = {"captain": TEAM["members"][0], "coach": TEAM["members"][1],
+              "members": TEAM["members"], "mascot": TEAM["members"][1]}
+    data = cain.dumps(roster, Roster)
+    result = cain.loads(data, Roster, fields=["captain.name", "coach.name", "members.scores", "mascot.name"], lazy=True)
+    # the nested values only decode their own fields (lazy or not)
+    assert isinstance(result["captain"], LazyObject)
+    assert dict(result["captain"]) == {"name": "Ichika"}
+    assert result["coach"]._cain_value == {"name": "Nino"}
+    assert [dict(member) for member in result["members"]] == [{"scores": [1, 2]}, {"scores": [3]}, {"scores": [1, 2]}]
+    assert result["mascot"]._cain_value == {"name": "Nino"}
+    assert repr(result.materialize()) == repr(cain.loads(data, Roster, fields=["captain.name", "coach.name",
+                                                                              "members.scores", "mascot.name"]))
+
+    result = cain.loads(data, Roster, fields=["coach"], lazy=True)
+    assert list(result) == ["coach"]
+    assert dict(result.coach) == TEAM["members"][1]
+    with pytest.raises(KeyError):
+        result["captain"]
+    with pytest.raises(cain.errors.DecodingError):
+        cain.loads(data, Roster, fields=["unknown"], lazy=True)
@@ -1,8 +1,14 @@
 import cain
 from cain.types import Optional, Object
 from pathlib import Path
+import io
 import typing
 
+import pytest
+
+from cain.__main__ import entry
+
+
 def test_dumps():
     assert cain.dumps({"a": 2}, Object[{"a": int}]) == b'\x00\x00\x02'
 
@@ -45,3 +51,150 @@ def test_load():
 
     # Cleanup
     Path("test.cain").unlink()
+
+
+def test_streaming():
+    schema = Object[{"name": str, "weights": bytes}]
+    weights = bytes(range(256)) * 1024
+    Path("test.bin").write_bytes(weights)
+
+    with open('test.cain', 'w+b') as fp, open('test.bin', 'rb') as source:
+        cain.dump({"name": "model", "weights": source}, fp, schema, include_header=True)
+    assert Path("test.cain").read_bytes() == cain.dumps({"name": "model", "weights": weights}, schema, include_header=True)
+
+    with open('test.cain', 'w+b') as fp:
+        cain.dump({"name": "model", "weights": (6, iter([b"abc", b"def"]))}, fp, schema)
+    assert Path("test.cain").read_bytes() == cain.dumps({"name": "model", "weights": b"abcdef"}, schema)
+
+    with open('test.cain', 'w+b') as fp, open('test.bin', 'rb') as source:
+        cain.dump({"name": "model", "weights": source}, fp, schema)
+
+    def sink(size, chunks):
+        with open("test.bin", "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
+        return size
+
+    Path("test.bin").unlink()
+    with open('test.cain', 'r+b') as fp:
+        loaded = cain.load(fp, schema, sink=sink)
+    assert loaded["weights"] == len(weights)
+    assert Path("test.bin").read_bytes() == weights
+
+    # Cleanup
+    Path("test.cain").unlink()
+    Path("test.bin").unlink()
+
+
+def test_validate():
+    class Member(Object):
+        name: str
+        admin: bool
+        nickname: Optional[str]
+
+    schema = Object[{"team": str, "members": typing.List[Member], "logo": bytes}]
+    value = {"team": "Anise", "logo": b"\x00\x01",
+             "members": [{"name": "Ichika", "admin": True, "nickname": None},
+                         {"name": "Nino", "admin": False, "nickname": "N"}]}
+    data = cain.dumps(value, schema)
+    cain.validate(data, schema)
+    cain.validate(bytearray(data), schema)
+    cain.validate(cain.dumps(value, schema, include_header=True))
+    cain.validate(cain.dumps(value, schema, auto_length=True), schema, auto_length=True)
+
+    def error(data):
+        try:
+            cain.validate(data, schema)
+        except cain.errors.ValidationError as err:
+            return err.offset, err.location
+        raise AssertionError("The data should not be valid")
+
+    # truncated data
+    assert error(data[:-1]) == (len(data) - 6, "team")
+    position = data.index(b"Nino")
+    # invalid UTF-8
+    assert error(data[:position] + b"\xff" + data[position + 1:]) == (position, "members[1].name")
+    # invalid boolean (the fields are sorted)
+    assert error(data[:position - 1] + b"\x02" + data[position:]) == (position - 1, "members[1].admin")
+    # invalid optional marker
+    assert error(data[:position + 5] + b"\x03" + data[position + 6:]) == (position + 5, "members[1].nickname")
+    # invalid redundancy table
+    assert error(b"\x01\x00" + data[1:])[1] == ""
+    # a length much larger than the data
+    with pytest.raises(cain.errors.TruncatedDataError):
+        cain.validate(b"\xff\xff\xff\xff\x0f", typing.List[int], auto_length=True)
+    assert cain.Decoder(typing.List[int], auto_length=True).feed(b"\xff\xff\xff\xff\x0f") == []
+    # the elements which don't need any byte
+    cain.validate(b"\x00\x05\x00", typing.List[None])
+    # the error doesn't keep views over the data
+    buffer = bytearray(data[:-1])
+    with pytest.raises(cain.errors.ValidationError) as err:
+        cain.validate(buffer, schema)
+    buffer.extend(data[-1:])
+    cain.validate(buffer, schema)
+    buffer[:] = b"\x01"
+    with pytest.raises(cain.errors.ValidationError) as err:
+        cain.validate(buffer)
+    assert isinstance(err.value.__cause__, IndexError)
+    buffer.clear()
+
+
+def test_mmap(tmp_path):
+    class Entry(Object):
+        key: str
+        blob: bytes
+        values: typing.List[int]
+
+    schema = list[Entry]
+    entries = [{"key": f"key{index}", "blob": bytes([index]) * 100, "values": [index, index + 1]} for index in range(50)]
+    path = tmp_path / "entries.cain"
+    path.write_bytes(cain.dumps(entries, schema))
+
+    loaded = cain.load(path, schema, mmap=True)
+    assert [entry._cain_value for entry in loaded] == [Entry(entry)._cain_value for entry in entries]
+    assert all(type(entry["blob"]) is bytes for entry in loaded)
+    assert [entry._cain_value for entry in cain.load(str(path), schema)] == [entry._cain_value for entry in loaded]
+
+    # views into the map
+    loaded = cain.load(path, schema, mmap=True, zero_copy=True)
+    assert isinstance(loaded[3]["blob"], memoryview)
+    assert loaded[3]["blob"] == bytes([3]) * 100
+    lazy = cain.load(path, schema, mmap=True, lazy=True)
+    assert lazy[49]["key"] == "key49"
+
+    # file descriptors are left open
+    with open(path, "rb") as fp:
+        assert cain.load(fp.fileno(), schema, mmap=True, fields=["key"])[1]["key"] == "key1"
+        assert not fp.closed
+        fp.seek(0)
+        assert len(cain.load(fp, schema, mmap=True)) == 50
+
+    # not a regular file
+    assert len(cain.load(io.BytesIO(path.read_bytes()), schema, mmap=True)) == 50
+    path.write_bytes(cain.dumps(entries, schema, include_header=True))
+    assert cain.load(path, mmap=True)[0]["key"] == "key0"
+
+
+def test_cli_validate(tmp_path, monkeypatch, capsys):
+    """
+    Tests the `validate` command of the CLI
+    """
+    def validate(data: bytes):
+        path = tmp_path / "data.cain"
+        path.write_bytes(data)
+        monkeypatch.setattr("sys.argv", ["cain", "validate", str(path), "--schema", "list[int]", "--schema-eval"])
+        entry()
+
+    data = cain.dumps([1, 2], typing.List[int])
+    validate(data)
+    assert capsys.readouterr().out == "The data is valid\n"
+    # an empty file can't be memory-mapped
+    with pytest.raises(SystemExit) as exit_info:
+        validate(b"")
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().err.startswith("Invalid data:")
+
+    with pytest.raises(SystemExit) as exit_info:
+        validate(data[:-1])
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().err.startswith("Invalid data: The number is truncated (1 bytes out of 2) (at byte 6")
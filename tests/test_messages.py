@@ -0,0 +1,127 @@
+"""
+Tests for the message streams
+"""
+import io
+import os
+import socket
+import threading
+
+import pytest
+
+import cain
+from cain import errors
+from cain.messages import MessageStream
+from cain.types import Object
+from cain.types.numbers import UnsignedVarInt
+
+
+class Job(Object):
+    id: int
+    name: str
+    payload: bytes
+
+
+JOBS = [{"id": index, "name": f"job{index}", "payload": bytes([index]) * (index * 1000)} for index in range(50)]
+
+
+def frame(value) -> bytes:
+    """Returns the frame of the given job"""
+    data = cain.dumps(value, Job)
+    return UnsignedVarInt._encode(len(data)) + data
+
+
+def test_message_stream():
+    """
+    Tests sending and receiving messages over sockets
+    """
+    left, right = socket.socketpair()
+    with left, right:
+        sender = MessageStream(left, send_schema=Job, scatter_size=1024)
+        receiver = MessageStream(right, recv_schema=Job, buffer_size=256)
+        thread = threading.Thread(target=lambda: [sender.send(job) for job in JOBS])
+        thread.start()
+        assert [receiver.recv()._cain_value for _ in JOBS] == JOBS
+        thread.join()
+        # the buffer is shrunk back after the large messages
+        assert receiver.pending == 0 and len(receiver._buffer) == 256
+
+        # the frames are the same with and without scatter-gather
+        assert sender.send(JOBS[3]) == len(frame(JOBS[3]))
+        assert right.recv(len(frame(JOBS[3])), socket.MSG_WAITALL) == frame(JOBS[3])
+
+        # the repeated blobs are sent once, as when they are not written separately
+        blob = bytes(range(256)) * 8
+        repeated = [blob, bytes(blob), b"x"]
+        list_sender = MessageStream(left, send_schema=list[bytes], scatter_size=1024)
+        size = len(cain.dumps(repeated, list[bytes]))
+        assert list_sender.send(repeated) == size + len(UnsignedVarInt._encode(size))
+        assert MessageStream(right, recv_schema=list[bytes]).recv() == repeated
+
+        # streamed sources
+        sender.send({"id": 1, "name": "file", "payload": io.BytesIO(b"a" * 3000)})
+        assert receiver.recv().payload == b"a" * 3000
+
+        # many messages received at once
+        left.sendall(b"".join(frame(job) for job in JOBS[:5]))
+        left.close()
+        assert [job._cain_value for job in receiver] == JOBS[:5]
+        with pytest.raises(EOFError):
+            receiver.recv()
+
+        with pytest.raises(errors.EncodingError):
+            receiver.send(JOBS[0])
+        with pytest.raises(errors.DecodingError):
+            sender.recv()
+
+
+def test_message_stream_pipes(monkeypatch):
+    """
+    Tests sending and receiving messages over pipes and file-like objects
+    """
+    read_fd, write_fd = os.pipe()
+    try:
+        MessageStream(write_fd, send_schema=Job).send(JOBS[2])
+        os.close(write_fd)
+        assert [job._cain_value for job in MessageStream(read_fd, recv_schema=Job, buffer_size=16)] == [JOBS[2]]
+    finally:
+        os.close(read_fd)
+
+    # systems without `os.readv`
+    read_fd, write_fd = os.pipe()
+    try:
+        MessageStream(write_fd, send_schema=Job).send(JOBS[2])
+        os.close(write_fd)
+        monkeypatch.delattr(os, "readv", raising=False)
+        assert [job._cain_value for job in MessageStream(read_fd, recv_schema=Job, buffer_size=16)] == [JOBS[2]]
+    finally:
+        os.close(read_fd)
+
+    fp = io.BytesIO()
+    stream = MessageStream(fp, send_schema=list[str], auto_length=True)
+    stream.send(["Hello", "world"])
+    stream.send(["Hello"])
+    fp.seek(0)
+    first, second = MessageStream(fp, recv_schema=list[str], auto_length=True, intern=True)
+    assert first == ["Hello", "world"] and second == ["Hello"]
+    assert first[0] is second[0]
+
+    data = frame(JOBS[10])
+    with pytest.raises(errors.TruncatedDataError):
+        MessageStream(io.BytesIO(data[:-1]), recv_schema=Job).recv()
+    with pytest.raises(errors.TruncatedDataError):
+        MessageStream(io.BytesIO(data[:1]), recv_schema=Job).recv()
+
+    # the size given by the frame is not allocated at once
+    with pytest.raises(errors.TruncatedDataError):
+        MessageStream(io.BytesIO(b"\xff" * 7 + b"\x7f"), recv_schema=str).recv()
+    with pytest.raises(errors.DecodingError):
+        MessageStream(io.BytesIO(data), recv_schema=Job, max_size=len(data) - 3).recv()
+    assert MessageStream(io.BytesIO(data), recv_schema=Job, max_size=len(data)).recv()._cain_value == JOBS[10]
+
+    # a message which can't be decoded is skipped
+    fp = io.BytesIO(b"\x02\x01\x02" + UnsignedVarInt._encode(6) + b"Hello\x00")
+    stream = MessageStream(fp, recv_schema=str)
+    with pytest.raises(errors.DecodingError) as err:
+        stream.recv()
+    assert not isinstance(err.value, errors.TruncatedDataError)
+    assert stream.recv() == "Hello"
@@ -2,12 +2,17 @@
 Tests for the `Number` datatype
 """
 import decimal
+
+import pytest
+
+from cain import errors
 from cain.types.numbers import (Number,
                                 Float, Double, Decimal,
                                 Complex, DoubleComplex,
                                 Int, SignedInt,  UnsignedInt,
                                 Int8, Int16, Int32, Int64,
                                 UInt8, UInt16, UInt32, UInt64,
+                                VarInt, UnsignedVarInt,
                                 recommended_size,
                                 long, short, signed, unsigned)
 
@@ -116,3 +121,26 @@ def test_recommended_size():
     assert recommended_size(-(2**16)//2) == Int16
     assert recommended_size(-(2**32)//2) == Int32
     assert recommended_size(-(2**64)//2) == Int64
+
+
+def test_varint():
+    """
+    Tests the variable length integers
+    """
+    assert UnsignedVarInt.encode(0) == b'\x00'
+    assert UnsignedVarInt.encode(127) == b'\x7f'
+    assert UnsignedVarInt.encode(300) == b'\xac\x02'
+    assert VarInt.encode(-1) == b'\x01'
+    assert VarInt.encode(-3) == b'\x05'
+    assert VarInt.encode(63) == b'\x7e'
+    for number in (0, 1, 127, 128, 16_383, 16_384, 2 ** 64, 2 ** 100):
+        assert UnsignedVarInt.decode(UnsignedVarInt.encode(number)) == number
+        assert VarInt.decode(VarInt.encode(number)) == number
+        assert VarInt.decode(VarInt.encode(-number)) == -number
+    assert UnsignedVarInt._decode(b'\xac\x02rest') == (300, b'rest')
+    assert UnsignedVarInt._decode(memoryview(b'\xac\x02rest'))[0] == 300
+
+    with pytest.raises(errors.EncodingError):
+        UnsignedVarInt.encode(-1)
+    with pytest.raises(errors.DecodingError):
+        UnsignedVarInt.decode(b'\xac')
@@ -1,7 +1,15 @@
 """
 Tests for the `Array` datatype
 """
-from cain.types import Array
+import dataclasses
+import typing
+
+import pytest
+
+import cain
+from cain import errors
+from cain.types import Array, Object, Optional
+from cain.types.objects import BITMAP, DEFAULTS
 
 
 def test_encode():
@@ -52,3 +60,136 @@ def test_repetitions():
     # 1 new 2 bytes integers
     assert (len(Array[str, str, str, str, str].encode(["Hello", "Hi", "Hello", "Hey", "Hello"]))
             == len(Array[str, str, str, str].encode(["Hello", "Hi", "Hello", "Hey"])) + (1 * 1))
+
+
+class User(Object):
+    username: str
+    favorite_number: int
+
+
+@dataclasses.dataclass
+class UserData:
+    username: str
+    favorite_number: int
+
+
+class UserSlots:
+    __slots__ = ("username", "favorite_number")
+
+    def __init__(self, username, favorite_number):
+        self.username = username
+        self.favorite_number = favorite_number
+
+
+class UserHook:
+    def __init__(self, username, favorite_number):
+        self.data = (username, favorite_number)
+
+    def __cain__(self):
+        return {"username": self.data[0], "favorite_number": self.data[1]}
+
+
+def test_attributes():
+    """
+    Tests the `Object` datatype encoding from objects which are not dictionaries
+    """
+    encoded = User.encode({"username": "Anise", "favorite_number": 2})
+    assert User.encode(UserData("Anise", 2)) == encoded
+    assert User.encode(UserSlots("Anise", 2)) == encoded
+    assert User.encode(UserHook("Anise", 2)) == encoded
+    assert User.encode(User(username="Anise", favorite_number=2)) == encoded
+    assert Object[{"username": str}].encode(UserData("Anise", 2)) == Object[{"username": str}].encode({"username": "Anise"})
+    assert Object.encode(UserData("Anise", 2)) == Object.encode({})
+
+
+class Settings(Object[DEFAULTS]):
+    theme: str = "light"
+    volume: int = 50
+    language: Optional[str] = None
+    username: str
+
+
+class SparseSettings(Object[DEFAULTS, BITMAP]):
+    theme: str = "light"
+    volume: int = 50
+    language: Optional[str] = None
+    nickname: Optional[str]
+
+
+def test_defaults():
+    """
+    Tests the `Object` datatype default values elision
+    """
+    full = {"theme": "light", "volume": 50, "language": None, "username": "Anise"}
+    encoded = Settings.encode(full)
+    # only the username is written
+    assert encoded == b'\x07\x00Anise\x00'
+    assert Settings.decode(encoded)._cain_value == full
+    # the missing keys use their default value
+    assert Settings.encode({"username": "Anise"}) == encoded
+    assert Settings.encode(UserSlots("Anise", 2)) == encoded
+
+    current = {"theme": "dark", "volume": 50, "language": "fr", "username": "Anise"}
+    assert Settings.decode(Settings.encode(current))._cain_value == current
+    for current in ({"theme": "light", "volume": 50, "language": None, "nickname": None},
+                    {"theme": "dark", "volume": 50, "language": "fr", "nickname": "Ani"},
+                    {"theme": "light", "volume": 10, "language": None, "nickname": "Ani"}):
+        assert SparseSettings.decode(SparseSettings.encode(current))._cain_value == current
+
+    # the mutable default values are not shared with the decoded objects
+    data = TaggedSettings.encode({"name": "Anise"})
+    first, second = TaggedSettings.decode(data), TaggedSettings.decode(data)
+    first["tags"].append("x")
+    assert second["tags"] == [] and TaggedSettings.tags == []
+    assert TaggedSettings.decode(data)["tags"] == []
+    assert TaggedSettings.encode({"name": "Anise"}) == data
+    assert cain.loads(data, TaggedSettings, lazy=True)["tags"] is not TaggedSettings.tags
+    assert cain.loads(data, TaggedSettings, fields=["tags"])["tags"] is not TaggedSettings.tags
+
+
+class TaggedSettings(Object[DEFAULTS]):
+    name: str
+    tags: typing.List[str] = []
+
+
+class Profile(Object):
+    email: str
+    age: int
+    tags: typing.List[str]
+
+
+class Account(Object[DEFAULTS]):
+    name: str
+    owner: Profile
+    backup: Optional[Profile]
+    members: typing.List[Profile]
+    plan: str = "free"
+
+
+def test_fields():
+    """
+    Tests the `Object` datatype field projection
+    """
+    profile = {"email": "anise@example.com", "age": 2, "tags": ["a", "b"]}
+    account = {"name": "Anise", "owner": profile, "backup": profile, "members": [profile, profile], "plan": "free"}
+    data = cain.dumps(account, Account)
+
+    result = cain.loads(data, Account, fields=["name", "owner.email", "owner.age", "plan"])
+    assert result._cain_value.keys() == {"name", "owner", "plan"}
+    assert result.name == "Anise"
+    assert result.plan == "free"
+    assert result.owner._cain_value == {"email": "anise@example.com", "age": 2}
+
+    # the fields apply to the objects inside the containers
+    result = cain.loads(data, Account, fields=["backup.tags", "members.age"])
+    assert result.backup._cain_value == {"tags": ["a", "b"]}
+    assert [member._cain_value for member in result.members] == [{"age": 2}, {"age": 2}]
+    assert [member._cain_value for member in cain.loads(cain.dumps([profile], typing.List[Profile]),
+                                                         typing.List[Profile], fields=["email"])] == [{"email": "anise@example.com"}]
+
+    # selecting a whole field
+    result = cain.loads(data, Account, fields=["owner", "owner.age"])
+    assert result.owner._cain_value == profile
+
+    with pytest.raises(errors.DecodingError):
+        cain.loads(data, Account, fields=["owner.unknown"])
@@ -1,7 +1,9 @@
 """
 Tests for the `Optional` datatype
 """
-from cain.types import Optional
+import cain
+from cain.types import Object, Optional
+from cain.types.objects import BITMAP
 
 
 def test_encode():
@@ -18,3 +20,33 @@ def test_decode():
     """
     assert Optional.decode(b'\x01Hello world\x00', str) == 'Hello world'
     assert Optional.decode(b'\x00', str) is None
+
+
+def test_bitmap():
+    """
+    Tests the presence bitmap of the `Optional` fields inside `Object`
+    """
+    class Sparse(Object[BITMAP]):
+        a: Optional[int]
+        b: Optional[int]
+        c: Optional[int]
+        name: str
+
+    class Plain(Object):
+        a: Optional[int]
+        b: Optional[int]
+        c: Optional[int]
+        name: str
+
+    value = {"a": None, "b": 2, "c": None, "name": "Anise"}
+    assert Sparse.encode(value) == b'\x02\x00\x00\x02Anise\x00'
+    assert len(Sparse.encode(value)) == len(Plain.encode(value)) - 2
+    for current in (value,
+                    {"a": 1, "b": 1, "c": 1, "name": "Anise"},
+                    {"a": None, "b": None, "c": None, "name": "Anise"}):
+        assert Sparse.decode(Sparse.encode(current))._cain_value == current
+
+    many = Object[BITMAP, {f"field{index}": Optional[str] for index in range(20)}]
+    current = {f"field{index}": ("Hello" if index % 3 == 0 else None) for index in range(20)}
+    assert many.decode(many.encode(current))._cain_value == current
+    assert cain.loads(cain.dumps(value, Sparse, include_header=True))._cain_value == value
@@ -0,0 +1,89 @@
+"""
+Tests for the in-place patching of encoded objects
+"""
+import pytest
+
+import cain
+from cain import errors
+from cain.patching import IN_PLACE, SPLICED
+from cain.types import Object, Optional
+from cain.types.objects import BITMAP, DEFAULTS
+
+
+class Settings(Object):
+    theme: str
+    volume: int
+
+
+class Profile(Object):
+    name: str
+    verified: bool
+    settings: Settings
+    bio: Optional[str]
+    nickname: str
+
+
+class Account(Object[BITMAP, DEFAULTS]):
+    name: str
+    email: Optional[str]
+    plan: str = "free"
+
+
+PROFILE = {
+    "name": "Anise",
+    "verified": True,
+    "settings": {"theme": "dark", "volume": 3},
+    "bio": "Hello",
+    "nickname": "Anise"
+}
+
+
+def check(data, schema, expected):
+    """Checks that the patched data is the same as `expected` once decoded"""
+    assert cain.dumps(cain.loads(bytes(data), schema), schema) == cain.dumps(expected, schema)
+
+
+def test_patch():
+    """
+    Tests patching encoded objects
+    """
+    data = cain.dumps(PROFILE, Profile)
+
+    # fixed size fields are written over the old values
+    buffer = bytearray(data)
+    result, strategies = cain.patch(buffer, Profile, {"settings.volume": 7, "verified": False})
+    assert result is buffer
+    assert len(result) == len(data)
+    assert strategies == {"settings.volume": IN_PLACE, "verified": IN_PLACE}
+    check(result, Profile, {**PROFILE, "verified": False, "settings": {"theme": "dark", "volume": 7}})
+
+    # a value with another size is spliced in
+    result, strategies = cain.patch(data, Profile, {"settings.theme": "light", "bio": "Hi"})
+    assert strategies == {"settings.theme": SPLICED, "bio": SPLICED}
+    check(result, Profile, {**PROFILE, "bio": "Hi", "settings": {"theme": "light", "volume": 3}})
+
+    # `name` and `nickname` share the same data: the object is encoded again
+    result, strategies = cain.patch(data, Profile, {"nickname": "Ani", "settings.volume": 1})
+    assert strategies == {"nickname": SPLICED, "settings.volume": SPLICED}
+    check(result, Profile, {**PROFILE, "nickname": "Ani", "settings": {"theme": "dark", "volume": 1}})
+
+    # changing the presence of an optional field or a default value changes the bitmaps
+    account = {"name": "Anise", "email": "anise@example.com", "plan": "free"}
+    data = cain.dumps(account, Account)
+    result, strategies = cain.patch(data, Account, {"email": None, "plan": "pro"})
+    assert strategies == {"email": SPLICED, "plan": SPLICED}
+    check(result, Account, {"name": "Anise", "email": None, "plan": "pro"})
+    result, strategies = cain.patch(data, Account, {"email": "anise@example.org"})
+    assert strategies == {"email": IN_PLACE}
+    check(result, Account, {**account, "email": "anise@example.org"})
+
+    # with a header
+    data = cain.dumps(PROFILE, Profile, include_header=True)
+    result, strategies = cain.patch(data, None, {"verified": False})
+    assert strategies == {"verified": IN_PLACE}
+    assert cain.loads(bytes(result))["verified"] is False
+
+    with pytest.raises(errors.EncodingError):
+        cain.patch(data, None, {"unknown": 1})
+    with pytest.raises(errors.EncodingError):
+        cain.patch(cain.dumps(PROFILE, Profile), Profile, {"settings": {}, "settings.volume": 1})
@@ -1,6 +1,9 @@
 """
 Tests for the `Range` datatype
 """
+import pytest
+
+from cain import errors
 from cain.types import Range
 
 
@@ -18,3 +21,15 @@ def test_decode():
     Tests the `Range` datatype decoding logic
     """
     assert Range.decode(b'\x00\x04\x02') == range(0, 4, 2)
+
+
+def test_validate():
+    """
+    Tests checking the ranges without decoding them
+    """
+    assert Range._validate(b'\x00\x04\x02rest') == b"rest"
+    assert Range._skip(b'\x00\x04\x02rest') == b"rest"
+    with pytest.raises(errors.TruncatedDataError):
+        Range._validate(b'\x00\x04')
+    with pytest.raises(errors.ValidationError):
+        Range._validate(b'\x00\x04\x00')
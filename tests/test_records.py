@@ -0,0 +1,168 @@
+"""
+Tests for the records generated for `Object` schemas
+"""
+import dataclasses
+import typing
+
+import pytest
+
+import cain
+from cain import errors, records
+from cain.records import Record, make_record
+from cain.types import Object, Optional
+from cain.types.objects import RECORD
+
+
+class User(Object[RECORD]):
+    username: str
+    favorite_number: int
+
+
+class Group(Object[RECORD]):
+    name: str
+    members: typing.List[User]
+
+
+def test_make_record():
+    """
+    Tests the record classes generation
+    """
+    Point = make_record("Point", ["x", "y"])
+    point = Point(1, 2)
+    assert isinstance(point, Record)
+    assert (point.x, point.y) == (1, 2)
+    assert point["y"] == 2
+    assert point == Point(1, 2)
+    assert point == {"x": 1, "y": 2}
+    assert point != Point(1, 3)
+    assert point._asdict() == {"x": 1, "y": 2}
+    assert repr(point) == "Point(x=1, y=2)"
+    assert not hasattr(point, "__dict__")
+    with pytest.raises(AttributeError):
+        point.z = 3
+    with pytest.raises(KeyError):
+        point["z"]
+
+    for key in ("not valid", "class", "_asdict", "__private"):
+        with pytest.raises(errors.DatatypeError):
+            make_record("Invalid", [key])
+
+
+def test_decode():
+    """
+    Tests decoding into records
+    """
+    user = {"username": "Anise", "favorite_number": 2}
+    decoded = User.decode(User.encode(user))
+    assert isinstance(decoded, User.record_class())
+    assert User.record_class() is User.record_class()
+    assert User.record_class().__slots__ == ("favorite_number", "username")
+    assert decoded.username == "Anise"
+    assert decoded == user
+    # records can be encoded back
+    assert User.encode(decoded) == User.encode(user)
+
+    group = {"name": "Friends", "members": [user, {"username": "Hina", "favorite_number": 3}]}
+    decoded = cain.loads(cain.dumps(group, Group), Group)
+    assert decoded.members[1].username == "Hina"
+    assert decoded == Group.record_class()([User.record_class()(2, "Anise"), User.record_class()(3, "Hina")], "Friends")
+
+    # the argument is carried by the schema headers
+    decoded = cain.loads(cain.dumps(group, Group, include_header=True))
+    assert isinstance(decoded, Record)
+    assert decoded.members[0] == user
+
+
+class Member(Object):
+    name: str
+    age: int
+
+
+class Team(Object):
+    title: str
+    members: typing.List[Member]
+    leader: Optional[Member]
+
+
+@dataclasses.dataclass
+class MemberData:
+    name: str
+    age: int
+
+
+@dataclasses.dataclass
+class TeamData:
+    title: str
+    members: typing.List[MemberData]
+    leader: typing.Optional[MemberData] = None
+
+
+class MemberTuple(typing.NamedTuple):
+    name: str
+    age: int
+
+
+class MemberSlots:
+    __slots__ = ("name", "age")
+
+
+@dataclasses.dataclass
+class Profile:
+    name: str
+    email: str
+
+
+def test_into():
+    """
+    Tests decoding straight into user defined classes
+    """
+    members = [{"name": "Anise", "age": 17}, {"name": "Hina", "age": 16}]
+    team = {"title": "Friends", "members": members, "leader": members[0]}
+
+    decoded = cain.loads(cain.dumps(team, Team), Team, into=TeamData)
+    assert decoded == TeamData("Friends", [MemberData("Anise", 17), MemberData("Hina", 16)], MemberData("Anise", 17))
+    decoded = cain.loads(cain.dumps(team, Team, include_header=True), into=TeamData)
+    assert decoded.members[1] == MemberData("Hina", 16)
+
+    encoded = cain.dumps(members, typing.List[Member])
+    assert cain.loads(encoded, typing.List[Member], into=MemberTuple) == [MemberTuple("Anise", 17), MemberTuple("Hina", 16)]
+    decoded = cain.loads(encoded, typing.List[Member], into=typing.List[MemberSlots])
+    assert [(member.name, member.age) for member in decoded] == [("Anise", 17), ("Hina", 16)]
+
+    # the generated constructors are reused
+    assert records.make_constructor(Member, MemberTuple) is records.make_constructor(Member, MemberTuple)
+
+    with pytest.raises(errors.DecodingError):
+        cain.loads(cain.dumps(members[0], Member), Member, into=Profile)
+
+
+def test_into_attrs():
+    """
+    Tests decoding straight into `attrs` classes
+    """
+    attr = pytest.importorskip("attr")
+
+    @attr.s(auto_attribs=True)
+    class MemberAttrs:
+        name: str
+        _age: int
+        nicknames: typing.List[str] = attr.Factory(list)
+
+    class Unset:
+        def __repr__(self) -> str:
+            return "NOTHING"
+
+    @attr.s(auto_attribs=True)
+    class ProfileAttrs:
+        name: str
+        website: str
+        # only `attrs.NOTHING` itself marks the attributes without default values
+        email: typing.Any = Unset()
+
+    assert records.required_fields(MemberAttrs) == {"name", "age"}
+    assert records.required_fields(ProfileAttrs) == {"name", "website"}
+
+    decoded = cain.loads(cain.dumps({"name": "Anise", "age": 17}, Member), Member, into=MemberAttrs)
+    assert decoded == MemberAttrs("Anise", 17)
+    with pytest.raises(errors.DecodingError):
+        cain.loads(cain.dumps({"name": "Anise", "age": 17}, Member), Member, into=ProfileAttrs)
@@ -0,0 +1,117 @@
+"""
+Tests for the shared memory channels
+"""
+import io
+import multiprocessing
+import pickle
+import queue
+
+import pytest
+
+import cain
+from cain import errors
+from cain.shm import Channel
+from cain.types import Object
+
+
+class Job(Object):
+    id: int
+    name: str
+    payload: bytes
+
+
+JOBS = [{"id": index, "name": "job" * (index % 10), "payload": bytes(index % 40)} for index in range(1000)]
+
+
+def consume(channel: Channel, results) -> None:
+    """Reads every job of the channel in another process"""
+    results.put([job._cain_value for job in channel])
+    channel.close()
+
+
+def test_channel():
+    """
+    Tests writing and reading records through a channel
+    """
+    with Channel(None, 256, Job) as producer:
+        consumer = pickle.loads(pickle.dumps(producer))
+        assert consumer.name == producer.name and consumer.capacity == 256
+        # the records wrap around the ring
+        for job in JOBS:
+            producer.put(job)
+            assert consumer.get()._cain_value == job
+        assert len(producer) == 0
+
+        with pytest.raises(queue.Empty):
+            consumer.get(timeout=0.01)
+        consumer.close()
+
+    # the large blobs are copied right into the shared memory
+    with Channel(None, 1024, Job, scatter_size=100) as producer:
+        consumer = Channel(producer.name, schema=Job)
+        large = {"id": 1, "name": "large", "payload": bytes(range(200))}
+        producer.put(large)
+        producer.put({"id": 2, "name": "file", "payload": io.BytesIO(b"a" * 200)})
+        assert consumer.get()._cain_value == large
+        assert consumer.get().payload == b"a" * 200
+        # the repeated blobs are written once, as when they are not copied separately
+        repeated = [bytes(range(200)), bytes(range(200)), b"x"]
+        with Channel(None, 1024, list[bytes], scatter_size=100) as list_producer:
+            list_consumer = Channel(list_producer.name, schema=list[bytes])
+            list_producer.put(repeated)
+            assert len(list_producer) == 4 + len(cain.dumps(repeated, list[bytes]))
+            assert list_consumer.get() == repeated
+            list_consumer.close()
+        consumer.close()
+
+    with Channel(None, 256, Job) as producer:
+        consumer = Channel(producer.name, schema=Job)
+        large = {"id": 1, "name": "large", "payload": bytes(150)}
+        producer.put(large)
+        with pytest.raises(queue.Full):
+            producer.put(large, timeout=0.01)
+        with pytest.raises(errors.EncodingError):
+            producer.put({"id": 1, "name": "", "payload": bytes(300)})
+
+        producer.close()
+        assert consumer.closed
+        assert [job._cain_value for job in consumer] == [large]
+        with pytest.raises(EOFError):
+            consumer.get()
+        with pytest.raises(BrokenPipeError):
+            producer.put(JOBS[0])
+        consumer.close()
+
+    # a record which can't be decoded is skipped
+    with Channel(None, 256, str) as producer:
+        consumer = Channel(producer.name, schema=str)
+        producer.put("Hi")
+        producer.put("Hello")
+        # removing the end of the string
+        consumer._data[6] = ord("!")
+        with pytest.raises(errors.DecodingError) as err:
+            consumer.get()
+        assert not isinstance(err.value, errors.TruncatedDataError)
+        assert consumer.get() == "Hello"
+        consumer.close()
+
+    with pytest.raises(FileNotFoundError):
+        Channel(producer.name, schema=Job)
+    with pytest.raises(errors.DecodingError):
+        Channel()
+
+
+def test_channel_processes():
+    """
+    Tests a channel between two processes
+    """
+    with Channel(None, 1024, Job) as channel:
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=consume, args=(channel, results))
+        process.start()
+        for job in JOBS:
+            channel.put(job)
+        channel.close()
+        assert results.get(timeout=30) == JOBS
+        process.join()
+    assert process.exitcode == 0
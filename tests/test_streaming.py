@@ -0,0 +1,213 @@
+"""
+Tests for the streaming tools
+"""
+import decimal
+import io
+import typing
+
+import pytest
+
+import cain
+from cain import errors
+from cain.streaming import ArrayWriter, padded_varint
+from cain.types import Character, Complex, Compressed, Decimal, Double, Enum, Object, Optional, Range, Table, VarInt
+from cain.types.types import Type
+from cain.types.numbers import UnsignedVarInt
+
+
+class Row(Object):
+    username: str
+    age: int
+
+
+class Pipe(io.RawIOBase):
+    """A handler which can't be seeked"""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.data += data
+        return len(data)
+
+
+ROWS = [{"username": f"user{index}", "age": index % 90} for index in range(1000)]
+
+
+def test_array_writer():
+    """
+    Tests writing arrays element by element
+    """
+    # the length is written back when closing the writer
+    fp = io.BytesIO()
+    with ArrayWriter(fp, int) as writer:
+        writer.extend([1, 2, 3])
+    assert fp.getvalue() == cain.dumps([1, 2, 3], list[int])
+
+    fp = io.BytesIO(b"prefix")
+    fp.seek(0, io.SEEK_END)
+    with ArrayWriter(fp, Row, "long", "long", buffer_size=256) as writer:
+        for row in ROWS:
+            writer.append(row)
+    assert writer.count == len(ROWS)
+    assert fp.getvalue().startswith(b"prefix")
+    assert fp.getvalue()[6:] == cain.dumps(ROWS, list[Row, "long", "long"])
+
+    # variable length integers
+    fp = io.BytesIO()
+    with ArrayWriter(fp, list[str], "auto", auto_length=True) as writer:
+        writer.extend([["a", "b"], ["c"]] * 100)
+    assert cain.loads(fp.getvalue(), list[list[str], "auto"], auto_length=True) == [["a", "b"], ["c"]] * 100
+
+    # the length is known beforehand
+    pipe = Pipe()
+    with ArrayWriter(pipe, Row, "auto", length=len(ROWS), buffer_size=128) as writer:
+        writer.extend(ROWS)
+    assert bytes(pipe.data) == cain.dumps(ROWS, list[Row, "auto"])
+
+    with pytest.raises(errors.EncodingError):
+        ArrayWriter(Pipe(), Row)
+    with pytest.raises(errors.EncodingError):
+        with ArrayWriter(Pipe(), int, length=2) as writer:
+            writer.append(1)
+    with pytest.raises(errors.EncodingError):
+        with ArrayWriter(io.BytesIO(), int, "short") as writer:
+            writer.extend(range(256))
+    with pytest.raises(errors.EncodingError):
+        writer.append(1)
+
+    assert UnsignedVarInt.decode(padded_varint(300, 4)) == 300
+    with pytest.raises(errors.EncodingError):
+        padded_varint(300, 1)
+
+
+def test_iterload():
+    """
+    Tests reading arrays element by element
+    """
+    data = cain.dumps(ROWS, list[Row, "long"])
+    rows = cain.iterload(io.BytesIO(data), list[Row, "long"], buffer_size=64)
+    assert next(rows)._cain_value == ROWS[0]
+    assert [row._cain_value for row in rows] == ROWS[1:]
+
+    # repeated elements
+    values = ["Hello", "Hi", "Hello", "Hey", "Hello"]
+    data = cain.dumps(values, list[str])
+    assert list(cain.iterload(io.BytesIO(data), list[str], buffer_size=1)) == values
+    assert list(cain.iterload(io.BytesIO(cain.dumps(("Hello", 1, None), tuple[str, int, Optional[str]])),
+                              tuple[str, int, Optional[str]], buffer_size=1)) == ["Hello", 1, None]
+    assert set(cain.iterload(io.BytesIO(cain.dumps({"a", "b"}, set[str])), set[str])) == {"a", "b"}
+
+    # characters split between the reads
+    characters = list("a夏é🍣b" * 10)
+    data = cain.dumps(characters, typing.List[Character])
+    assert list(cain.iterload(io.BytesIO(data), typing.List[Character], buffer_size=5)) == characters
+
+    # options
+    data = cain.dumps([[b"ab", b"c"], [b"ab", b"c"]], list[list[bytes]], auto_length=True)
+    assert list(cain.iterload(io.BytesIO(data), list[list[bytes]], auto_length=True, buffer_size=2)) == [[b"ab", b"c"]] * 2
+    first, second = cain.iterload(io.BytesIO(cain.dumps(["Hello", "Hello!"[:5]], list[str, str])), list[str, str],
+                                  intern=True)
+    assert first is second
+
+    # what is written by `ArrayWriter`
+    fp = io.BytesIO()
+    with ArrayWriter(fp, Row, "auto") as writer:
+        writer.extend(ROWS)
+    fp.seek(0)
+    assert [row.age for row in cain.iterload(fp, list[Row, "auto"], buffer_size=100)] == [row["age"] for row in ROWS]
+
+    data = cain.dumps(ROWS, list[Row])
+    with pytest.raises(errors.TruncatedDataError):
+        list(cain.iterload(io.BytesIO(data[:-3]), list[Row]))
+    # a huge length is not used to build anything before the elements are read
+    with pytest.raises(errors.TruncatedDataError):
+        list(cain.iterload(io.BytesIO(b"\xff\xff\xff\xff\x0f"), typing.List[int], auto_length=True))
+    with pytest.raises(errors.DecodingError):
+        list(cain.iterload(io.BytesIO(b"\x00\x01\x00\x01\x00\x01\x00\x05\x00\x00\x00\x01"), list[int]))
+    with pytest.raises(errors.DecodingError):
+        cain.iterload(io.BytesIO(data), Row)
+
+
+def test_decoder():
+    """
+    Tests decoding streams given in chunks
+    """
+    values = [{"username": "Anise", "age": 20}, {"username": "Ichika", "age": 300}, {"username": "", "age": -1}]
+    data = b"".join(cain.dumps(value, Row) for value in values)
+
+    for size in (1, 2, 3, 7, len(data)):
+        decoder = cain.Decoder(Row)
+        results = []
+        for start in range(0, len(data), size):
+            results.extend(decoder.feed(data[start:start + size]))
+        decoder.close()
+        assert [result._cain_value for result in results] == values
+        assert decoder.pending == 0
+
+    # a length prefix split between chunks
+    decoder = cain.Decoder(bytes, auto_length=True)
+    blob = cain.dumps(b"a" * 300, bytes, auto_length=True)
+    assert decoder.feed(blob[:1]) == []
+    assert decoder.feed(blob[1:2]) == []
+    assert decoder.feed(blob[2:] + blob[:5]) == [b"a" * 300]
+    assert decoder.pending == 5
+    with pytest.raises(errors.TruncatedDataError):
+        decoder.close()
+
+    decoder = cain.Decoder(bool)
+    with pytest.raises(errors.ValidationError):
+        decoder.feed(b"\x01\x02")
+
+    # a large value received in small chunks is not validated again from its start
+    value = [f"string number {index}" for index in range(35000)]
+    data = cain.dumps(value, list[str, "long"])
+    decoder = cain.Decoder(list[str, "long"])
+    results = []
+    for start in range(0, len(data), 2048):
+        results.extend(decoder.feed(data[start:start + 2048]))
+    assert results == [value]
+
+    # nested values, repeated values and objects
+    values = [[ROWS[:50], ROWS[:50]], [], [ROWS[3:5]]]
+    data = b"".join(cain.dumps(value, list[list[Row]]) for value in values)
+    decoder = cain.Decoder(list[list[Row]])
+    results = []
+    for start in range(0, len(data), 5):
+        results.extend(decoder.feed(data[start:start + 5]))
+    decoder.close()
+    assert [[[row._cain_value for row in rows] for rows in value] for value in results] == values
+
+    decoder = cain.Decoder(list[list[bool]])
+    assert decoder.feed(b"\x00\x01\x00\x00\x00\x01\x00") == []
+    with pytest.raises(errors.ValidationError) as err:
+        decoder.feed(b"\x00\x02")
+    assert err.value.path == [0, 0]
+
+
+# A value of every datatype (the empty values can't be streamed)
+VALUES = [(int, -300), (float, 1.5), (Double, 2.5), (Decimal, decimal.Decimal("3.14")), (Complex, 1 + 2j),
+          (UnsignedVarInt, 300), (VarInt, -300), (str, "夏 Hello"), (bytes, b"blob"), (bool, True),
+          (Character, "夏"), (Character, "🍣"), (Range, range(-5, 100, 7)), (Enum["hello", "world"], "world"),
+          (Enum[tuple(f"value{index}" for index in range(300))], "value42"),
+          (Optional[str], "Hi"), (typing.Union[int, str], "Hey"), (typing.List[str], ["a", "b", "a"]),
+          (typing.Tuple[int, str], (1, "a")), (typing.Set[str], {"a"}), (Row, {"username": "夏", "age": 1}),
+          (Table[Row], [{"username": "a", "age": 1}, {"username": "a", "age": 2}]), (Type, str),
+          (Compressed[str, "lzma"], "Hello world" * 10)]
+
+
+def test_decoder_datatypes():
+    """
+    Tests decoding values of every datatype given byte by byte
+    """
+    for schema, value in VALUES:
+        data = cain.dumps(value, schema)
+        decoder = cain.Decoder(schema)
+        results = []
+        for index in range(2 * len(data)):
+            results.extend(decoder.feed(data[index % len(data):index % len(data) + 1]))
+        decoder.close()
+        assert [cain.dumps(result, schema) for result in results] == [data, data], schema
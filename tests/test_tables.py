@@ -0,0 +1,122 @@
+"""
+Tests for the `Table` datatype
+"""
+import dataclasses
+import typing
+
+import pytest
+
+import cain
+from cain import errors
+from cain.types import Array, Object, Optional, Table
+from cain.types.objects import RECORD
+from cain.types.tables import pack_bits, unpack_bits
+
+
+class User(Object):
+    username: str
+    age: int
+
+
+class Row(Object[RECORD]):
+    id: int
+    country: str
+    score: int
+    note: Optional[str]
+    tags: typing.List[str]
+
+
+ROWS = [{"id": 1000 + index, "country": ["FR", "JP", "US"][index % 3], "score": (index * 37) % 101,
+         "note": None if index % 4 else f"note {index}", "tags": ["a", "b"][:index % 3]}
+        for index in range(500)]
+
+
+def test_encode():
+    """
+    Tests the `Table` datatype encoding logic
+    """
+    assert (Table[User].encode([{"username": "Anise", "age": 20}, {"username": "Anise", "age": 21}])
+            == b'\x02\x02(\x02\x01\x01Anise\x00')
+    # columnar form
+    assert (Table[User].encode({"username": ["Anise", "Anise"], "age": [20, 21]})
+            == b'\x02\x02(\x02\x01\x01Anise\x00')
+    assert Table[User].encode([]) == b'\x00\x00\x00'
+    # the repeated values make tables smaller than arrays
+    assert len(cain.dumps(ROWS, Table[Row])) * 3 < len(cain.dumps(ROWS, Array[Row], "long"))
+
+
+def test_decode():
+    """
+    Tests the `Table` datatype decoding logic
+    """
+    assert ([user._cain_value for user in Table[User].decode(b'\x02\x02(\x02\x01\x01Anise\x00')]
+            == [{"username": "Anise", "age": 20}, {"username": "Anise", "age": 21}])
+    assert Table[User, "columns"].decode(b'\x02\x02(\x02\x01\x01Anise\x00') == {"age": [20, 21],
+                                                                                "username": ["Anise", "Anise"]}
+    data = cain.dumps(ROWS, Table[Row])
+    rows = cain.loads(data, Table[Row])
+    assert rows == ROWS
+    # the mutable values are not shared
+    assert rows[1].tags is not rows[4].tags
+    assert Table._skip(data + b"rest", Row) == b"rest"
+
+    @dataclasses.dataclass
+    class UserData:
+        username: str
+        age: int
+
+    assert cain.loads(cain.dumps([{"username": "Anise", "age": 20}], Table[User]),
+                      Table[User], into=UserData) == [UserData("Anise", 20)]
+
+
+def test_fields():
+    """
+    Tests decoding only some of the columns
+    """
+    class Team(Object):
+        name: str
+        leader: User
+
+    teams = [{"name": "Friends", "leader": {"username": "Anise", "age": 20}},
+             {"name": "Family", "leader": {"username": "Ichika", "age": 21}}]
+    data = cain.dumps(teams, Table[Team])
+    assert [team._cain_value for team in cain.loads(data, Table[Team], fields=["name"])] == [{"name": "Friends"},
+                                                                                           {"name": "Family"}]
+    assert ([team.leader._cain_value for team in cain.loads(data, Table[Team], fields=["leader.age"])]
+            == [{"age": 20}, {"age": 21}])
+    assert cain.loads(data, Table[Team, "columns"], fields=["name"]) == {"name": ["Friends", "Family"]}
+    # the rows are not decoded into the records with a projection, as with `Object`
+    assert cain.loads(cain.dumps(ROWS, Table[Row]), Table[Row], fields=["id"])[3]._cain_value == {"id": 1003}
+    with pytest.raises(errors.DecodingError):
+        cain.loads(data, Table[Team], fields=["unknown"])
+
+
+def test_validate():
+    """
+    Tests checking the tables without decoding them
+    """
+    data = cain.dumps(ROWS, Table[Row])
+    assert Table._validate(data + b"rest", Row) == b"rest"
+    with pytest.raises(errors.TruncatedDataError):
+        cain.validate(data[:-1], Table[Row])
+
+    for malformed in (b"", b"\x02", b"\x02\x02(\x02\x01\x00", b"\x02\x03\x00", b"\x02\x09"):
+        with pytest.raises(errors.ValidationError):
+            cain.validate(malformed, Table[User])
+        with pytest.raises(errors.DecodingError):
+            cain.loads(malformed, Table[User])
+    with pytest.raises(errors.ValidationError) as err:
+        # the index 3 of the last row is out of range
+        cain.validate(b"\x04\x03\x00\x00\x01\x03a\x00b\x00c\x00\xe4\x00", Table[User])
+    assert err.value.path == ["username"]
+
+
+def test_bits():
+    """
+    Tests the bit-packing of the columns
+    """
+    for bits in (0, 1, 3, 8, 13):
+        values = [index % (1 << bits) for index in range(21)]
+        packed = pack_bits(values, bits)
+        assert len(packed) == 3 * bits
+        assert unpack_bits(packed, 21, bits) == values